@@ -0,0 +1,72 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Summarise the deferred cleanup sweeps of a finished tempest run.
+
+With ``[dell_driver] deferred_cleanup`` enabled, test cleanups only
+request deletions and each worker confirms them at exit, after its
+tests have already passed.  Run this after ``tempest run`` with the
+``deferred_cleanup_dir`` of the run::
+
+    dell-tempest-deferred-report /var/tmp/dell-cleanup
+
+It prints what every worker swept and every resource left behind, and
+exits with status 1 when there are leftovers so CI still fails on
+them.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+
+def load_reports(report_dir):
+    """Return the parsed ``leftovers-<pid>.json`` files in *report_dir*."""
+    reports = []
+    for path in sorted(glob.glob(os.path.join(report_dir,
+                                              'leftovers-*.json'))):
+        with open(path) as f:
+            reports.append(json.load(f))
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Report resources the deferred cleanup sweeps of a '
+                    'tempest run could not delete.')
+    parser.add_argument('report_dir',
+                        help='The [dell_driver] deferred_cleanup_dir '
+                             'of the run')
+    args = parser.parse_args(argv)
+
+    reports = load_reports(args.report_dir)
+    swept = sum(r.get('swept', 0) for r in reports)
+    leftovers = []
+    for report in reports:
+        for leftover in report.get('leftovers', []):
+            leftovers.append((report.get('pid'), leftover))
+
+    print("%d worker(s) swept %d resource(s), %d left behind"
+          % (len(reports), swept, len(leftovers)))
+    for pid, leftover in leftovers:
+        print("  worker %s: %s %s" % (pid, leftover['kind'], leftover['id']))
+    return 1 if leftovers else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
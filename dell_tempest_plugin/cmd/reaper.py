@@ -0,0 +1,500 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Delete resources left behind by aborted runs of this plugin.
+
+A killed worker never runs its cleanups, so volumes, snapshots, shares,
+share/volume types, QoS types and raw PowerStore file systems (from
+``_ps_create_filesystem``) pile up, slow down every later run's list
+calls and use up array capacity.
+
+The reaper finds plugin-owned resources by naming convention: every
+helper names them ``data_utils.rand_name('ps-...')`` /
+``'pflex-...'`` / ``'powerflex_...'``, i.e. the ``resource_name_prefix``
+(``tempest`` by default), a plugin prefix and a random numeric suffix.
+A name without the prefix is never owned, whatever ``--pattern`` says.
+Snapshots and volumes/shares are also owned when their parent volume,
+share or type is.  Only resources known to be older than
+``--older-than`` minutes are taken, so a run in progress is left alone;
+a resource without a creation time is skipped.
+
+Volumes, snapshots and shares are listed in the admin project only,
+or in the ``--project`` projects (e.g. those of the static test
+accounts); ``--all-tenants`` lists every project.  Types and QoS specs
+are global, so for them the name and age are all that is checked.
+
+Everything found is registered with a ``CleanupExecutor``, which
+deletes it in dependency order (snapshots -> volumes/shares -> types ->
+QoS) with ``--workers`` parallel requests; all API calls are spaced by
+a shared ``--rate`` limit so the reaper does not swamp the control
+plane.  Without ``--yes`` the reaper only prints the deletion plan.
+
+Run it from the tempest workspace, with admin credentials configured::
+
+    dell-tempest-reaper
+    dell-tempest-reaper --older-than 120 --rate 2 --yes
+"""
+
+import argparse
+import configparser
+import datetime
+import json
+import logging as std_logging
+import re
+import sys
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+import requests
+from tempest import clients
+from tempest.common import credentials_factory
+from tempest import config
+from tempest.lib import exceptions as lib_exc
+from tempest.lib.services.volume.v3 import qos_client
+from tempest.lib.services.volume.v3 import snapshots_client
+from tempest.lib.services.volume.v3 import types_client
+from tempest.lib.services.volume.v3 import volumes_client
+
+from dell_tempest_plugin.common import async_waiters
+from dell_tempest_plugin.common import backend_config as dell_backends
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin.services import powerstore_client
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+# Name stems of the resources created by the plugin's helpers.
+OWNED_STEMS = ('ps', 'pflex', 'powerstore', 'powerflex')
+
+QOS_TYPE_API_VERSION = '2.94'
+
+VOLUME_DELETABLE = ('available', 'error', 'error_restoring',
+                    'error_extending', 'error_managing')
+SHARE_DELETABLE = ('available', 'error', 'inactive', 'manage_error',
+                   'unmanage_error', 'extending_error', 'shrinking_error')
+SNAPSHOT_DELETABLE = ('available', 'error', 'error_managing',
+                      'manage_error')
+
+
+def name_prefix():
+    """Return the prefix ``data_utils.rand_name`` puts on every name."""
+    try:
+        return CONF.resource_name_prefix
+    except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+        # Releases without the option always use rand_name's default
+        return 'tempest'
+
+
+def default_patterns(prefix):
+    """Return the regex matching names from ``data_utils.rand_name``."""
+    return [r'^%s-(%s)[-_].*-\d+$'
+            % (re.escape(prefix), '|'.join(OWNED_STEMS))]
+
+
+def _items(body, key):
+    """Return the list under *key*, tolerating unwrapped list bodies."""
+    if isinstance(body, dict):
+        return body.get(key) or []
+    return body or []
+
+
+def _created(resource):
+    """Parse the resource's creation time; ``None`` when absent."""
+    value = (resource.get('created_at') or
+             resource.get('creation_timestamp'))
+    if not value:
+        return None
+    try:
+        return datetime.datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S')
+    except ValueError:
+        return None
+
+
+class RateLimiter(object):
+    """Space calls at least ``1 / rate`` seconds apart across threads.
+
+    :param rate: Calls per second; ``0`` disables the limit.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+    def wrap(self, fn):
+        """Return *fn* with every call going through the limit."""
+        def _limited(*args, **kwargs):
+            self.acquire()
+            return fn(*args, **kwargs)
+        return _limited
+
+
+class PowerStoreFiles(object):
+    """Minimal PowerStore REST access for raw file systems.
+
+    Credentials come from the PowerStore backend section of
+    ``manila.conf``, like the manage/unmanage tests read them.
+    """
+
+    def __init__(self, manila_conf):
+        backend = dell_backends.get_index(manila_conf).find('powerstore')
+        if backend is None:
+            raise ValueError("No PowerStore backend section found in %s"
+                             % manila_conf)
+        self.client = powerstore_client.get_client(
+            backend.host, backend.user, backend.password)
+
+    def list_file_systems(self, page=1000):
+        """Return every primary file system (ID, name, creation time)."""
+        found = self.client.list_all(
+            'file_system',
+            params={'select': 'id,name,filesystem_type,creation_timestamp'},
+            page=page)
+        return [fs for fs in found
+                if fs.get('filesystem_type', 'Primary') == 'Primary']
+
+    def delete_file_system(self, fs_id):
+        if not self.client.delete_file_system(fs_id):
+            raise lib_exc.NotFound(fs_id)
+
+
+class Reaper(object):
+    """Collect owned resources and delete them through one executor.
+
+    :param prefix: ``resource_name_prefix``; owned names start with it.
+    :param patterns: Regexes; a name matching any of them is owned.
+    :param older_than: Minutes a resource must have existed.
+    :param limiter: ``RateLimiter`` applied to every API call.
+    :param workers: Parallel delete requests.
+    :param projects: IDs of the projects whose volumes, snapshots and
+        shares are listed; ``None`` lists the admin project only.
+    :param all_tenants: List volumes, snapshots and shares of every
+        project instead.
+    """
+
+    def __init__(self, prefix, patterns, older_than, limiter, workers=None,
+                 projects=None, all_tenants=False):
+        if not prefix:
+            raise ValueError("resource_name_prefix is empty; plugin "
+                             "resources cannot be told apart")
+        self.prefix = prefix + '-'
+        self.patterns = [re.compile(p) for p in patterns]
+        self.cutoff = (datetime.datetime.utcnow() -
+                       datetime.timedelta(minutes=older_than))
+        self.limit = limiter.wrap
+        self.executor = dell_cleanup.CleanupExecutor(
+            max_workers=workers, deferred=False)
+        self.projects = projects
+        self.all_tenants = all_tenants
+        self.names = {}
+        self.skipped = []
+
+    def owned(self, resource):
+        """Whether *resource* has a plugin-owned name and is old enough."""
+        name = resource.get('name') or ''
+        if not name.startswith(self.prefix):
+            return False
+        if not any(p.match(name) for p in self.patterns):
+            return False
+        created = _created(resource)
+        if created is None:
+            LOG.info("Skipping %s %s: creation time unknown", name,
+                     resource.get('id'))
+            return False
+        return created < self.cutoff
+
+    def _list_params(self):
+        """Return the list filters of the projects to reap, one each."""
+        if self.all_tenants:
+            return [{'all_tenants': 1}]
+        if self.projects:
+            return [{'all_tenants': 1, 'project_id': project}
+                    for project in self.projects]
+        return [{}]
+
+    def _list(self, list_fn, key, **kwargs):
+        """Call *list_fn* for every project filter and join the lists."""
+        found = {}
+        for params in self._list_params():
+            for item in _items(list_fn(params=params, **kwargs), key):
+                found.setdefault(item['id'], item)
+        return list(found.values())
+
+    def _add(self, kind, resource, delete, waiter=None, depends_on=(),
+             deletable=None):
+        status = (resource.get('status') or '').lower()
+        if deletable is not None and status not in deletable:
+            LOG.warning("Skipping %s %s in status %s",
+                        kind.replace('_', ' '), resource['id'], status)
+            self.skipped.append((kind, resource['id']))
+            return None
+        key = self.executor.add(kind, resource['id'], self.limit(delete),
+                                waiter=waiter, depends_on=depends_on)
+        self.names[key] = resource.get('name') or ''
+        return key
+
+    def collect_cinder(self, volumes, snapshots, vol_types, qos):
+        list_volumes = self.limit(volumes.list_volumes)
+        list_snapshots = self.limit(snapshots.list_snapshots)
+        show_volume = self.limit(volumes.show_volume)
+        show_snapshot = self.limit(snapshots.show_snapshot)
+
+        types = _items(self.limit(vol_types.list_volume_types)(),
+                       'volume_types')
+        owned_types = dict((t['id'], t) for t in types if self.owned(t))
+        type_names = dict((t['name'], t['id'])
+                          for t in owned_types.values())
+        for vol_type in owned_types.values():
+            self._add('volume_type', vol_type,
+                      vol_types.delete_volume_type)
+
+        all_volumes = self._list(list_volumes, 'volumes', detail=True)
+        owned_volumes = {}
+        for vol in all_volumes:
+            vtype = vol.get('volume_type_id') or vol.get('volume_type')
+            type_id = vtype if vtype in owned_types else type_names.get(vtype)
+            if type_id or self.owned(vol):
+                owned_volumes[vol['id']] = (vol, type_id)
+
+        for snap in self._list(list_snapshots, 'snapshots', detail=True):
+            if snap.get('volume_id') in owned_volumes or self.owned(snap):
+                self._add(
+                    'volume_snapshot', snap, snapshots.delete_snapshot,
+                    waiter=lambda sid: dell_waiters.deletion_waiter(
+                        show_snapshot, sid, kind='volume_snapshot',
+                        response_key='snapshot',
+                        error_states=('error_deleting',)),
+                    depends_on=[('volume', snap.get('volume_id'))],
+                    deletable=SNAPSHOT_DELETABLE)
+
+        for vol, type_id in owned_volumes.values():
+            self._add(
+                'volume', vol, volumes.delete_volume,
+                waiter=lambda vid: dell_waiters.deletion_waiter(
+                    show_volume, vid, kind='volume', response_key='volume',
+                    error_states=('error_deleting',)),
+                depends_on=[('volume', vol.get('source_volid')),
+                            ('volume_snapshot', vol.get('snapshot_id')),
+                            ('volume_type', type_id)],
+                deletable=VOLUME_DELETABLE)
+
+        for spec in _items(self.limit(qos.list_qos)(), 'qos_specs'):
+            if self.owned(spec):
+                self._add('volume_qos', spec,
+                          lambda qid: qos.delete_qos(qid, force=True))
+
+    def collect_manila(self, shares):
+        list_shares = self.limit(shares.list_shares_with_detail)
+        list_snapshots = self.limit(shares.list_snapshots_with_detail)
+        get_share = self.limit(shares.get_share)
+        get_snapshot = self.limit(shares.get_snapshot)
+
+        owned_types = dict(
+            (t['id'], t) for t in _items(
+                self.limit(shares.list_share_types)(), 'share_types')
+            if self.owned(t))
+        for share_type in owned_types.values():
+            self._add('share_type', share_type, shares.delete_share_type)
+
+        owned_shares = dict(
+            (s['id'], s) for s in self._list(list_shares, 'shares')
+            if s.get('share_type') in owned_types or self.owned(s))
+
+        for snap in self._list(list_snapshots, 'snapshots'):
+            if snap.get('share_id') in owned_shares or self.owned(snap):
+                self._add(
+                    'share_snapshot', snap, shares.delete_snapshot,
+                    waiter=lambda sid: dell_waiters.deletion_waiter(
+                        get_snapshot, sid, kind='share_snapshot',
+                        response_key='snapshot',
+                        error_states=('error_deleting',)),
+                    depends_on=[('share', snap.get('share_id'))],
+                    deletable=SNAPSHOT_DELETABLE)
+
+        for share in owned_shares.values():
+            self._add(
+                'share', share, shares.delete_share,
+                waiter=lambda sid: dell_waiters.deletion_waiter(
+                    get_share, sid, kind='share', response_key='share',
+                    error_states=('error_deleting',)),
+                depends_on=[('share_snapshot', share.get('snapshot_id')),
+                            ('share_type', share.get('share_type'))],
+                deletable=SHARE_DELETABLE)
+
+        try:
+            _, body = self.limit(shares.get)(
+                'qos-types', version=QOS_TYPE_API_VERSION)
+        except lib_exc.TempestException as e:
+            LOG.info("Manila QoS types not available: %s", e)
+            return
+        for qos_type in _items(json.loads(body) if body else {},
+                               'qos_types'):
+            if self.owned(qos_type):
+                self._add('qos_type', qos_type,
+                          lambda qid: shares.delete(
+                              'qos-types/%s' % qid,
+                              version=QOS_TYPE_API_VERSION))
+
+    def collect_powerstore(self, files):
+        for fs in self.limit(files.list_file_systems)():
+            if self.owned(fs):
+                self._add('file_system', fs, files.delete_file_system)
+
+    def plan(self):
+        """Return the deletion levels as lists of printable lines."""
+        return [['%s %s (%s)' % (e.kind.replace('_', ' '), e.resource_id,
+                                 self.names.get(e.key, ''))
+                 for e in level]
+                for level in self.executor.levels()]
+
+    def run(self):
+        """Delete everything collected; return the entries left behind."""
+        self.executor.run()
+        return self.executor.failed
+
+
+def _cinder_clients(manager):
+    params = {
+        'auth_provider': manager.auth_provider,
+        'service': CONF.volume.catalog_type,
+        'region': CONF.volume.region or CONF.identity.region,
+        'endpoint_type': CONF.volume.endpoint_type,
+    }
+    return (volumes_client.VolumesClient(**params),
+            snapshots_client.SnapshotsClient(**params),
+            types_client.TypesClient(**params),
+            qos_client.QosSpecsClient(**params))
+
+
+def _manila_client(manager):
+    try:
+        from manila_tempest_tests.services.share.v2.json import (
+            shares_client as manila_shares_client)
+    except ImportError:
+        return None
+    share_conf = getattr(CONF, 'share', None)
+    return manila_shares_client.SharesV2Client(
+        auth_provider=manager.auth_provider,
+        service=(getattr(share_conf, 'catalog_type', None) or
+                 'shared-file-system'),
+        region=(getattr(share_conf, 'region', None) or
+                CONF.identity.region),
+        endpoint_type=getattr(share_conf, 'endpoint_type', 'public'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Delete resources left behind by aborted runs of the '
+                    'Dell tempest plugin.')
+    parser.add_argument('--yes', action='store_true',
+                        help='Delete the resources; without it only the '
+                             'deletion plan is printed')
+    parser.add_argument('--older-than', type=float, default=60,
+                        metavar='MINUTES',
+                        help='Only reap resources at least this old '
+                             '(default: %(default)s)')
+    parser.add_argument('--pattern', action='append', dest='patterns',
+                        metavar='REGEX',
+                        help='Owned-name regex; may be repeated.  Names '
+                             'must start with resource_name_prefix either '
+                             'way (default: rand_name names with a ps/'
+                             'pflex/powerstore/powerflex stem)')
+    parser.add_argument('--project', action='append', dest='projects',
+                        metavar='PROJECT_ID',
+                        help='Reap volumes, snapshots and shares of this '
+                             'project; may be repeated (default: the '
+                             'admin project)')
+    parser.add_argument('--all-tenants', action='store_true',
+                        help='Reap volumes, snapshots and shares of every '
+                             'project')
+    parser.add_argument('--workers', type=int,
+                        help='Parallel delete requests (default: '
+                             '[dell_driver] waiter_workers)')
+    parser.add_argument('--rate', type=float, default=5,
+                        help='Maximum API calls per second, 0 for no '
+                             'limit (default: %(default)s)')
+    parser.add_argument('--skip', action='append', default=[],
+                        choices=('cinder', 'manila', 'powerstore'),
+                        help='Service not to reap; may be repeated')
+    parser.add_argument('--manila-conf', default='/etc/manila/manila.conf',
+                        help='manila.conf holding the PowerStore '
+                             'credentials (default: %(default)s)')
+    args = parser.parse_args(argv)
+    std_logging.basicConfig(level=std_logging.INFO,
+                            format='%(levelname)s %(message)s')
+
+    if args.projects and args.all_tenants:
+        parser.error('--project and --all-tenants are mutually exclusive')
+    prefix = name_prefix()
+    try:
+        reaper = Reaper(prefix, args.patterns or default_patterns(prefix),
+                        args.older_than, RateLimiter(args.rate),
+                        args.workers or async_waiters.get_workers(),
+                        projects=args.projects,
+                        all_tenants=args.all_tenants)
+    except ValueError as e:
+        parser.error(str(e))
+    manager = clients.Manager(
+        credentials=credentials_factory.get_configured_admin_credentials())
+    if 'cinder' not in args.skip:
+        reaper.collect_cinder(*_cinder_clients(manager))
+    if 'manila' not in args.skip:
+        shares = _manila_client(manager)
+        if shares is None:
+            LOG.warning("manila_tempest_tests is not installed; "
+                        "skipping Manila")
+        else:
+            reaper.collect_manila(shares)
+    if 'powerstore' not in args.skip:
+        try:
+            reaper.collect_powerstore(PowerStoreFiles(args.manila_conf))
+        except (ValueError, configparser.Error,
+                requests.RequestException, lib_exc.TempestException) as e:
+            LOG.warning("Skipping PowerStore file systems: %s", e)
+
+    plan = reaper.plan()
+    for n, level in enumerate(plan, 1):
+        print("Level %d:" % n)
+        for line in level:
+            print("  %s" % line)
+    total = sum(len(level) for level in plan)
+    if not args.yes:
+        print("Dry run: %d resource(s) would be deleted, %d skipped; "
+              "pass --yes to delete them" % (total, len(reaper.skipped)))
+        return 0
+    failed = reaper.run()
+    print("Deleted %d of %d resource(s), %d skipped"
+          % (total - len(failed), total, len(reaper.skipped)))
+    for entry in failed:
+        print("  left behind: %s" % entry)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
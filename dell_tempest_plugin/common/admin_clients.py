@@ -0,0 +1,115 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Clients on the configured admin credentials, shared by the worker.
+
+Classes with ``credentials = ['primary', 'admin']`` get dynamic
+credentials that ``clear_credentials`` deletes when the class is torn
+down.  State that outlives one class -- the shared types of
+``type_registry``, the volumes and shares of ``warm_pool`` -- must not
+call the API through them, so it uses the clients returned here: one
+``clients.Manager`` on ``get_configured_admin_credentials()`` per
+process, built on first use.
+
+Every helper returns ``None`` when the client cannot be built (no admin
+credentials configured, or the service's tempest client missing).
+"""
+
+import threading
+
+from oslo_log import log as logging
+from tempest import clients
+from tempest.common import credentials_factory
+from tempest.lib import exceptions as lib_exc
+
+from dell_tempest_plugin.common import manila_clients as dell_manila
+
+LOG = logging.getLogger(__name__)
+
+_manager = []
+_lock = threading.Lock()
+
+
+def manager():
+    """Return the worker's static admin manager, or ``None``."""
+    with _lock:
+        if not _manager:
+            try:
+                creds = credentials_factory.get_configured_admin_credentials()
+                _manager.append(clients.Manager(credentials=creds))
+            except lib_exc.TempestException as e:
+                LOG.warning("No static admin credentials: %s", e)
+                return None
+        return _manager[0]
+
+
+def project_id():
+    """Return the project of the static admin credentials, or ``None``."""
+    mgr = manager()
+    if mgr is None:
+        return None
+    return getattr(mgr.credentials, 'project_id', None)
+
+
+def _first(*names):
+    mgr = manager()
+    if mgr is None:
+        return None
+    for name in names:
+        client = getattr(mgr, name, None)
+        if client is not None:
+            return client
+    return None
+
+
+def volumes_client():
+    """Return the admin Cinder volumes client, or ``None``."""
+    return _first('volumes_client_latest', 'volumes_v3_client',
+                  'volumes_client')
+
+
+def snapshots_client():
+    """Return the admin Cinder snapshots client, or ``None``."""
+    return _first('snapshots_client_latest', 'snapshots_v3_client',
+                  'snapshots_client')
+
+
+def volume_types_client():
+    """Return the admin Cinder volume types client, or ``None``."""
+    return _first('volume_types_client_latest', 'volume_types_v3_client',
+                  'volume_types_client')
+
+
+def _manila(get_client):
+    mgr = manager()
+    if mgr is None:
+        return None
+    return get_client(mgr)
+
+
+def shares_client():
+    """Return the admin Manila shares client, or ``None``."""
+    return _manila(dell_manila.shares_client)
+
+
+def share_types_client():
+    """Return the admin Manila share types client, or ``None``."""
+    return _manila(dell_manila.share_types_client)
+
+
+def qos_types_client():
+    """Return the admin Manila QoS types client, or ``None``."""
+    return _manila(dell_manila.qos_types_client)
@@ -0,0 +1,179 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Asyncio runtime that runs independent waits of one test concurrently.
+
+The waiters in ``dell_tempest_plugin.common.waiters`` block the test
+thread, so a test that creates a share, a snapshot and an access rule
+waits for each in turn.  ``WaiterRuntime`` drives the same waiters from
+an event loop instead: each waiter's ``steps()`` generator is advanced
+on a small thread pool (the tempest service clients are blocking), and
+the sleeps between polls are ``asyncio.sleep`` calls, so any number of
+waits share the wall-clock time of the slowest one.
+
+Polling, backoff, budgets and error reporting are the waiters' own, so
+a wait behaves exactly as with ``waiter.wait()``.
+
+Mixins use the synchronous facade::
+
+    share, snapshot = async_waiters.wait_all([
+        dell_waiters.status_waiter(
+            self.shares_v2_client.get_share, share_id, 'available',
+            kind='share', response_key='share'),
+        dell_waiters.status_waiter(
+            self.shares_v2_client.get_snapshot, snapshot_id, 'available',
+            kind='share_snapshot', response_key='snapshot'),
+    ], test=self)
+
+The first failure cancels the remaining waits and is re-raised.  With
+*test* given, the event loop and thread pool are created once per test
+and closed by a cleanup.
+"""
+
+import asyncio
+from concurrent import futures
+import functools
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from dell_tempest_plugin import config
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+
+_RUNTIME_ATTR = '_dell_waiter_runtime'
+
+
+def get_workers():
+    """Return the configured number of waiter threads."""
+    try:
+        return config.CONF.dell_driver.waiter_workers
+    except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+        return DEFAULT_WORKERS
+
+
+def _advance(steps):
+    """Run one poll; StopIteration cannot cross a future boundary."""
+    try:
+        return False, next(steps)
+    except StopIteration as e:
+        return True, e.value
+
+
+class WaiterRuntime(object):
+    """Event loop plus the thread pool its client calls are offloaded to.
+
+    :param max_workers: Number of client calls that may run at once;
+        defaults to ``[dell_driver] waiter_workers``.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or get_workers()
+        self.loop = asyncio.new_event_loop()
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='dell-waiter')
+
+    def offload(self, fn, *args, **kwargs):
+        """Run a blocking client call on the pool; return an awaitable."""
+        return self.loop.run_in_executor(
+            self.executor, functools.partial(fn, *args, **kwargs))
+
+    async def run(self, waiter):
+        """Drive *waiter* to completion and return its result."""
+        steps = waiter.steps()
+        while True:
+            done, value = await self.offload(_advance, steps)
+            if done:
+                return value
+            if value > 0:
+                await asyncio.sleep(value)
+
+    async def _run_all(self, waiters, return_exceptions=False):
+        tasks = [self.loop.create_task(self.run(w)) for w in waiters]
+        if return_exceptions:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            finished, pending = await asyncio.wait(
+                tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            for task in tasks:
+                if task in finished and task.exception() is not None:
+                    raise task.exception()
+            return [task.result() for task in tasks]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def wait_all(self, waiters, return_exceptions=False):
+        """Run *waiters* concurrently; return their results in order.
+
+        :param return_exceptions: Let every wait finish and return the
+            exception of a failed one in place of its result.
+        """
+        waiters = list(waiters)
+        if not waiters:
+            return []
+        return self.loop.run_until_complete(
+            self._run_all(waiters, return_exceptions=return_exceptions))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.loop.close()
+
+
+def get_runtime(test):
+    """Return *test*'s runtime, creating it and its cleanup on first use."""
+    runtime = getattr(test, _RUNTIME_ATTR, None)
+    if runtime is None:
+        runtime = WaiterRuntime()
+        setattr(test, _RUNTIME_ATTR, runtime)
+        test.addCleanup(_close_runtime, test)
+    return runtime
+
+
+def _close_runtime(test):
+    runtime = getattr(test, _RUNTIME_ATTR, None)
+    if runtime is not None:
+        delattr(test, _RUNTIME_ATTR)
+        runtime.close()
+
+
+def wait_all(waiters, test=None, return_exceptions=False):
+    """Wait for all *waiters* concurrently and return their results.
+
+    :param waiters: Waiter objects, e.g. from ``waiters.status_waiter``
+        or ``waiters.deletion_waiter``.
+    :param test: Test case owning the event loop; without it a
+        throw-away runtime is used for this call.
+    :param return_exceptions: See ``WaiterRuntime.wait_all``.
+    :returns: List of the waiters' results, in the order given.
+    :raises WaitError: the first failure; the other waits are cancelled.
+    """
+    if test is not None:
+        return get_runtime(test).wait_all(
+            waiters, return_exceptions=return_exceptions)
+    runtime = WaiterRuntime()
+    try:
+        return runtime.wait_all(waiters,
+                                return_exceptions=return_exceptions)
+    finally:
+        runtime.close()
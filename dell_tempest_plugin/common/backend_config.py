@@ -0,0 +1,197 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Backend sections of cinder.conf and manila.conf, parsed once per process.
+
+Tests that talk to an array directly need its address and credentials,
+which only the service configuration files hold.  Each test module used
+to re-parse the file, sometimes on every lookup, and search its own
+hard-coded list of section names.  ``cinder()`` and ``manila()`` return
+a ``ConfigIndex`` of the file, built on first use and shared by every
+test of the process, which finds a backend by product, section name or
+``volume_backend_name``::
+
+    backend = backend_config.cinder().find('powerstore',
+                                           names=['powerstore1'])
+    if backend is not None:
+        client = powerstore_client.get_client(
+            backend.host, backend.user, backend.password)
+
+A ``Backend`` exposes the options the tests need under one name
+whatever the driver calls them (``san_ip``, ``dell_nas_backend_host``,
+``emc_nas_server``, ...).  Options missing from a Cinder backend
+section are taken from ``[backend_defaults]``, as Cinder does.
+"""
+
+import configparser
+import threading
+
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+CINDER_CONF = '/etc/cinder/cinder.conf'
+MANILA_CONF = '/etc/manila/manila.conf'
+
+DEFAULTS_SECTION = 'backend_defaults'
+
+# Names of the same setting across the Dell drivers, in lookup order.
+HOST_OPTS = ('san_ip', 'dell_nas_backend_host', 'emc_nas_server')
+USER_OPTS = ('san_login', 'dell_nas_login', 'emc_nas_login')
+PASSWORD_OPTS = ('san_password', 'dell_nas_password', 'emc_nas_password')
+PORT_OPTS = ('powerflex_rest_server_port', 'sio_rest_server_port',
+             'emc_nas_server_port')
+POOL_OPTS = ('powerflex_storage_pools', 'sio_storage_pools',
+             'powerstore_appliances', 'emc_nas_pool_names')
+
+# product: stems of the driver class path or emc_share_backend value
+PRODUCTS = {
+    'powerstore': ('powerstore',),
+    'powerflex': ('powerflex', 'scaleio', 'vxflex'),
+    'powerscale': ('powerscale', 'isilon'),
+    'powermax': ('powermax', 'vmax'),
+    'unity': ('unity',),
+}
+
+
+class Backend(object):
+    """One backend section, with its options under driver-neutral names.
+
+    :param section: Section name.
+    :param options: ``{option: value}`` of the section, defaults
+        included.
+    """
+
+    def __init__(self, section, options):
+        self.section = section
+        self.options = options
+        self.driver = (options.get('volume_driver') or
+                       options.get('share_driver') or '')
+        self.backend_name = (options.get('volume_backend_name') or
+                             options.get('share_backend_name') or section)
+        self.product = self._product()
+        self.host = self._first(HOST_OPTS)
+        self.user = self._first(USER_OPTS)
+        self.password = self._first(PASSWORD_OPTS)
+        port = self._first(PORT_OPTS)
+        self.port = int(port) if port else None
+        self.nas_server = options.get('dell_nas_server')
+        pools = self._first(POOL_OPTS) or ''
+        self.pools = [pool.strip() for pool in pools.split(',')
+                      if pool.strip()]
+
+    def _first(self, names):
+        for name in names:
+            if self.options.get(name):
+                return self.options[name]
+        return None
+
+    def _product(self):
+        hints = (self.options.get('emc_share_backend', '') + ' ' +
+                 self.driver).lower()
+        for product, stems in sorted(PRODUCTS.items()):
+            if any(stem in hints for stem in stems):
+                return product
+        if 'dell_nas_backend_host' in self.options:
+            return 'powerstore'
+        return None
+
+    def get(self, option, default=None):
+        """Return any other option of the section."""
+        return self.options.get(option, default)
+
+    def __repr__(self):
+        return '<Backend %s (%s) %s>' % (self.section, self.product,
+                                         self.host)
+
+
+class ConfigIndex(object):
+    """Backend sections of one service configuration file.
+
+    :param path: File to parse; a missing file gives an empty index.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        conf = configparser.ConfigParser(interpolation=None, strict=False)
+        try:
+            conf.read(path)
+        except configparser.Error as e:
+            LOG.warning("Cannot parse %s: %s", path, e)
+        defaults = (dict(conf.items(DEFAULTS_SECTION))
+                    if conf.has_section(DEFAULTS_SECTION) else {})
+        self.backends = []
+        for section in conf.sections():
+            if section == DEFAULTS_SECTION:
+                continue
+            options = dict(defaults)
+            options.update(conf.items(section))
+            backend = Backend(section, options)
+            if backend.driver or backend.host:
+                self.backends.append(backend)
+        self.by_section = dict((b.section, b) for b in self.backends)
+        self.by_backend_name = dict((b.backend_name, b)
+                                    for b in self.backends)
+        self.by_driver = {}
+        for backend in self.backends:
+            self.by_driver.setdefault(backend.driver, []).append(backend)
+        LOG.debug("Indexed %d backend(s) of %s: %s", len(self.backends),
+                  path, self.backends)
+
+    def find(self, product=None, names=None):
+        """Return a backend with an address, or ``None``.
+
+        :param product: Product it must be (see ``PRODUCTS``).
+        :param names: Section or backend names to prefer, in order; the
+            first backend of *product* is used when none of them is.
+        """
+        candidates = [b for b in self.backends if b.host and
+                      (product is None or b.product == product)]
+        for name in names or ():
+            backend = (self.by_section.get(name) or
+                       self.by_backend_name.get(name))
+            if backend in candidates:
+                return backend
+        return candidates[0] if candidates else None
+
+    def find_all(self, product=None):
+        """Return every backend of *product*."""
+        return [b for b in self.backends
+                if product is None or b.product == product]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(path):
+    """Return the process's ``ConfigIndex`` of *path*, parsing it once."""
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = ConfigIndex(path)
+            _indexes[path] = index
+    return index
+
+
+def cinder():
+    """Return the index of ``/etc/cinder/cinder.conf``."""
+    return get_index(CINDER_CONF)
+
+
+def manila():
+    """Return the index of ``/etc/manila/manila.conf``."""
+    return get_index(MANILA_CONF)
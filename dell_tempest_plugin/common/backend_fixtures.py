@@ -0,0 +1,143 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Class-level builder for backend objects created through array REST APIs.
+
+The manage/unmanage suites create their starting point directly on the
+array (a filesystem, then its NFS export or SMB share), one REST call
+after the other, inside every test.  A ``FixtureBuilder`` takes that
+latency off the tests: once a class has asked for a second fixture it
+keeps the next ones building in the background while the current test
+runs, hands one to each later test, and deletes every object it built
+in one parallel sweep when the class is torn down::
+
+    builder = backend_fixtures.FixtureBuilder(
+        build=lambda: self._build_backend_share('NFS', ...),
+        destroy=lambda fixture: self._ps_cleanup_filesystem(fixture[0]),
+        prefetch=1)
+    fixture = builder.take()    # None: build it yourself
+
+Nothing is built ahead for the first request, so a run that selects a
+single test of the class builds nothing extra, and no count has to be
+kept in step with the class's tests: at most ``prefetch`` fixtures are
+built and never used, and those are deleted with the rest.
+
+Handed-out fixtures belong to the test, which may consume them (manage
+and delete, unmanage, ...); ``destroy`` must therefore tolerate objects
+that are already gone.  A build that fails is only logged: ``take``
+returns ``None`` and the caller builds its object itself, failing the
+test the usual way if the array really is broken.
+"""
+
+import collections
+from concurrent import futures
+import threading
+
+from oslo_log import log as logging
+
+from dell_tempest_plugin.common import bulk as dell_bulk
+
+LOG = logging.getLogger(__name__)
+
+
+class FixtureBuilder(object):
+    """Backend fixtures of one kind, built ahead and torn down together.
+
+    :param build: Callable returning one new fixture; called on a
+        background thread, so it must not register test cleanups.
+    :param destroy: Callable taking a fixture and deleting it.
+    :param prefetch: Fixtures kept building ahead of the next request,
+        from the second request on.
+    :param max_workers: Pool size of the teardown sweep; see
+        ``bulk.submit_all``.
+    """
+
+    def __init__(self, build, destroy, prefetch=1, max_workers=None):
+        self.build = build
+        self.destroy = destroy
+        self.prefetch = prefetch
+        self.max_workers = max_workers
+        self.requested = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._queued = collections.deque()
+        self._built = []
+        self._closed = False
+
+    def take(self):
+        """Return a fixture built ahead, and start building the next.
+
+        Waits for a build already in progress rather than starting a
+        new one.
+
+        :returns: The fixture, or ``None`` when none was built ahead
+            (first requests, or a failed build).
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            self.requested += 1
+            future = self._queued.popleft() if self._queued else None
+            if self.requested > 1:
+                self._fill()
+        return self._result(future) if future is not None else None
+
+    def _fill(self):
+        if self._executor is None:
+            self._executor = futures.ThreadPoolExecutor(
+                max_workers=max(self.prefetch, 1),
+                thread_name_prefix='dell-fixture')
+        while len(self._queued) < self.prefetch:
+            self._queued.append(self._executor.submit(self._build))
+
+    def _build(self):
+        fixture = self.build()
+        with self._lock:
+            self._built.append(fixture)
+        return fixture
+
+    @staticmethod
+    def _result(future):
+        error = future.exception()
+        if error is not None:
+            LOG.warning("Could not build backend fixture: %s", error)
+            return None
+        return future.result()
+
+    def teardown(self):
+        """Destroy every fixture built, in parallel; log failures.
+
+        Builds still running are waited for first, so their objects are
+        destroyed too.
+        """
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+            self._queued.clear()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            built, self._built = self._built, []
+        LOG.info("Built %d backend fixture(s) ahead for %d request(s)",
+                 len(built), self.requested)
+        outcomes = dell_bulk.submit_all(
+            [lambda fixture=fixture: self.destroy(fixture)
+             for fixture in built],
+            max_workers=self.max_workers)
+        for fixture, (_, error) in zip(built, outcomes):
+            if error is not None:
+                LOG.warning("Could not destroy backend fixture %s: %s",
+                            fixture, error)
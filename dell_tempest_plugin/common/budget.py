@@ -0,0 +1,214 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Wall-clock deadline budgets shared by every wait in a test.
+
+Each helper used to apply its own independent timeout (600 s share
+build, 300 s volume type delete, 1800 s migration), so one sick test
+could chain several full timeouts and hold a worker for an hour.
+
+A ``DeadlineBudget`` is opened per test (``start_test_budget`` from the
+helper mixin's ``setUp``) under a per-class parent budget.  Waiters,
+cleanup retry loops and backend REST helpers cap their own timeouts
+with ``cap()``; once the budget is spent, the waiters in
+``dell_tempest_plugin.common.waiters`` fail fast with ``BudgetExhausted``
+and a combined report of the waits that consumed it.
+
+Both budgets are configured in the ``[dell_driver]`` group:
+``test_budget`` and ``class_budget`` (seconds, 0 disables).  Unless set,
+``test_budget`` is ``BUILD_TIMEOUT_FACTOR`` times the larger of the
+``[volume]`` and ``[share]`` ``build_timeout`` -- 900 s with the tempest
+defaults -- so a test may use up one or two full waits, but a chain of
+them is cut off instead of holding the worker for an hour.
+"""
+
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from dell_tempest_plugin import config
+
+LOG = logging.getLogger(__name__)
+
+# Floor applied to socket timeouts so they never become zero.
+MIN_TIMEOUT = 1
+
+# Default per-request timeout of the backend REST helpers.
+REST_TIMEOUT = 30
+
+# Default test budget, in multiples of the service build timeout.
+BUILD_TIMEOUT_FACTOR = 3
+
+# tempest's own [volume] build_timeout default.
+DEFAULT_BUILD_TIMEOUT = 300
+
+_local = threading.local()
+
+
+class DeadlineBudget(object):
+    """Wall-clock allowance shared by all waits of a test or class.
+
+    :param seconds: Size of the budget; ``0`` or ``None`` means
+        unlimited (only the parent, if any, applies).
+    :param name: Label used in reports (test or class id).
+    :param parent: Enclosing budget that is always honoured too.
+    """
+
+    def __init__(self, seconds, name=None, parent=None):
+        self.seconds = seconds or None
+        self.name = name or 'budget'
+        self.parent = parent
+        self.start = time.time()
+        self.deadline = (self.start + self.seconds
+                         if self.seconds else None)
+        self.events = []
+
+    def remaining(self):
+        """Seconds left, or ``None`` when no budget applies."""
+        own = (self.deadline - time.time()
+               if self.deadline is not None else None)
+        inherited = self.parent.remaining() if self.parent else None
+        if own is None:
+            return inherited
+        if inherited is None:
+            return own
+        return min(own, inherited)
+
+    @property
+    def exhausted(self):
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def cap(self, timeout):
+        """Return *timeout* limited to what is left of the budget."""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return min(timeout, max(remaining, 0))
+
+    def record(self, label, elapsed, outcome):
+        """Note a wait that consumed part of the budget."""
+        self.events.append((label, elapsed, outcome))
+        if self.parent is not None:
+            self.parent.record(label, elapsed, outcome)
+
+    def report(self):
+        """Return a multi-line summary of the recorded waits."""
+        lines = ["%s: %.0fs used of %s"
+                 % (self.name, time.time() - self.start,
+                    '%ss' % self.seconds if self.seconds else 'unlimited')]
+        for label, elapsed, outcome in self.events:
+            lines.append("  %s: %.1fs, %s" % (label, elapsed, outcome))
+        return '\n'.join(lines)
+
+
+def _get_opt(name):
+    try:
+        return getattr(config.CONF.dell_driver, name)
+    except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+        return 0
+
+
+def _build_timeout():
+    """Return the larger of ``[volume]`` and ``[share] build_timeout``."""
+    timeouts = []
+    for group in ('volume', 'share'):
+        try:
+            timeouts.append(getattr(config.CONF, group).build_timeout)
+        except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+            continue
+    return max(timeouts) if timeouts else DEFAULT_BUILD_TIMEOUT
+
+
+def get_test_budget():
+    """Return the configured or build-timeout-derived test budget."""
+    seconds = _get_opt('test_budget')
+    if seconds is None:
+        return BUILD_TIMEOUT_FACTOR * _build_timeout()
+    return seconds
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def current():
+    """Return the innermost active budget, or ``None``."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def activate(budget):
+    """Make *budget* the current one for this thread."""
+    _stack().append(budget)
+
+
+def deactivate(budget):
+    """Remove *budget* from this thread's active budgets."""
+    stack = _stack()
+    if budget in stack:
+        stack.remove(budget)
+
+
+def class_budget(test_class):
+    """Return the per-class budget, creating it on first use."""
+    budget = test_class.__dict__.get('_dell_class_budget')
+    if budget is None:
+        budget = DeadlineBudget(_get_opt('class_budget'),
+                                name=test_class.__name__)
+        test_class._dell_class_budget = budget
+    return budget
+
+
+def start_test_budget(test):
+    """Open a per-test budget that stays active until cleanups finish.
+
+    Call from ``setUp``.  The deactivation is registered as a cleanup
+    right away, so it runs after every cleanup the test adds later and
+    those cleanups draw from the same budget.
+    """
+    budget = DeadlineBudget(get_test_budget(), name=test.id(),
+                            parent=class_budget(type(test)))
+    activate(budget)
+    test.addCleanup(deactivate, budget)
+    return budget
+
+
+def remaining():
+    """Seconds left in the current budget, or ``None``."""
+    budget = current()
+    return budget.remaining() if budget else None
+
+
+def cap(timeout, minimum=0):
+    """Limit *timeout* to the current budget.
+
+    :param minimum: Floor for the result; pass ``MIN_TIMEOUT`` for
+        socket timeouts that must stay positive.
+    """
+    budget = current()
+    if budget is None:
+        return timeout
+    return max(budget.cap(timeout), minimum)
+
+
+def rest_timeout(timeout=REST_TIMEOUT):
+    """Per-request timeout for backend REST helpers, capped to budget."""
+    return cap(timeout, MIN_TIMEOUT)
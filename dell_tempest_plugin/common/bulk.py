@@ -0,0 +1,150 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Concurrent bulk creation of volumes and shares.
+
+Fan-out tests used to issue their create requests one after the other,
+so the API round trips added up before the batched wait even started,
+and the driver never saw more than one request at a time.  The helpers
+here submit every create request at once on a bounded thread pool
+(``[dell_driver] waiter_workers`` threads), then await the new
+resources as one batch::
+
+    clones = dell_bulk.clone_volumes_bulk(
+        vols_client, [source['id']] * 5,
+        [{'name': data_utils.rand_name('pflex-vtree-clone')}
+         for _ in range(5)],
+        register=lambda vol: self.addCleanup(
+            self._safe_delete_volume, vol['id']),
+        wait=lambda ids: self._wait_for_volumes_status(ids, 'available'))
+
+``register`` runs on the calling thread, in order, for every request
+that succeeded, even when another one failed, so cleanups are never
+lost; the first failure is raised afterwards.  Results come back in
+the order of the requests.
+"""
+
+from concurrent import futures
+
+from oslo_log import log as logging
+
+from dell_tempest_plugin.common import async_waiters
+
+LOG = logging.getLogger(__name__)
+
+
+def submit_all(calls, max_workers=None):
+    """Run *calls* concurrently and return their outcomes in order.
+
+    :param calls: Callables taking no arguments.
+    :param max_workers: Pool size; defaults to ``waiter_workers``.
+    :returns: List of ``(result, exception)`` pairs, one per call.
+    """
+    calls = list(calls)
+    if not calls:
+        return []
+    workers = min(max_workers or async_waiters.get_workers(), len(calls))
+    with futures.ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix='dell-bulk') as pool:
+        pending = [pool.submit(call) for call in calls]
+    outcomes = []
+    for future in pending:
+        error = future.exception()
+        outcomes.append((None if error else future.result(), error))
+    return outcomes
+
+
+def create_all(create, params_list, register=None, wait=None,
+               max_workers=None):
+    """Create one resource per *params_list* entry, concurrently.
+
+    :param create: Callable taking the entry as keyword arguments and
+        returning the new resource dict.
+    :param params_list: Keyword arguments of each create request.
+    :param register: Callable taking each created resource, e.g. to add
+        its cleanup; run on the calling thread.
+    :param wait: Callable taking the list of IDs and returning a dict
+        mapping each ID to its final resource dict.
+    :param max_workers: See ``submit_all``.
+    :returns: The created (or, with *wait*, final) resources, in order.
+    :raises: The first create failure, once the others are registered.
+    """
+    outcomes = submit_all(
+        [lambda params=params: create(**params) for params in params_list],
+        max_workers=max_workers)
+    resources = []
+    first_error = None
+    for resource, error in outcomes:
+        if error is not None:
+            first_error = first_error or error
+            continue
+        if register is not None:
+            register(resource)
+        resources.append(resource)
+    if first_error is not None:
+        LOG.warning("%d of %d bulk create request(s) failed",
+                    sum(1 for _, e in outcomes if e is not None),
+                    len(outcomes))
+        raise first_error
+    if wait is None:
+        return resources
+    found = wait([resource['id'] for resource in resources])
+    return [found[resource['id']] for resource in resources]
+
+
+def create_volumes_bulk(volumes_client, params_list, register=None,
+                        wait=None, max_workers=None):
+    """Create volumes concurrently; see ``create_all``.
+
+    :param volumes_client: Cinder volumes client.
+    :param params_list: ``create_volume`` keyword arguments per volume.
+    """
+    return create_all(
+        lambda **params: volumes_client.create_volume(**params)['volume'],
+        params_list, register=register, wait=wait, max_workers=max_workers)
+
+
+def clone_volumes_bulk(volumes_client, source_volume_ids, params_list,
+                       register=None, wait=None, max_workers=None):
+    """Clone volumes concurrently; see ``create_all``.
+
+    :param source_volume_ids: Source of each clone; an ID may repeat to
+        fan out several clones from one volume.
+    :param params_list: Further ``create_volume`` keyword arguments per
+        clone, such as its name.
+    """
+    params_list = [dict(params, source_volid=source_volume_id)
+                   for source_volume_id, params
+                   in zip(source_volume_ids, params_list)]
+    return create_volumes_bulk(volumes_client, params_list,
+                               register=register, wait=wait,
+                               max_workers=max_workers)
+
+
+def create_shares_bulk(shares_client, params_list, register=None,
+                       wait=None, max_workers=None):
+    """Create shares concurrently; see ``create_all``.
+
+    :param shares_client: Manila shares v2 client.
+    :param params_list: ``create_share`` keyword arguments per share.
+    """
+    def _create(**params):
+        body = shares_client.create_share(**params)
+        return body.get('share', body)
+
+    return create_all(_create, params_list, register=register, wait=wait,
+                      max_workers=max_workers)
@@ -0,0 +1,504 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Parallel, dependency-ordered cleanup of test resources.
+
+Serial ``addCleanup`` callbacks such as ``_delete_share_safe`` each
+block on their own deletion poll, so a test with five shares pays five
+sequential deletion waits.  ``CleanupExecutor`` instead records every
+resource with what it depends on (snapshot -> share -> share type ->
+QoS type; clone -> parent volume -> volume type) and deletes it level
+by level:
+
+  - all delete requests of a level are issued concurrently on a thread
+    pool
+  - their deletions are awaited together, in one batch, through
+    ``async_waiters``
+  - only then is the next level (the resources they depended on)
+    deleted
+
+Besides explicit ``depends_on`` keys, resource kinds carry an implicit
+order (``KIND_ORDER``): every share is gone before any share type is
+deleted, even when the type was passed by name and its key is unknown.
+
+With ``[dell_driver] deferred_cleanup`` enabled, a test's cleanup only
+fires the deletes of its first level and returns; ``DeferredSweep``
+finishes the remaining levels and confirms every deletion.  The end
+state is the same while tests no longer wait for resources to
+disappear.  The delete callables hold the test class's clients, which
+may use dynamic credentials that ``clear_credentials`` deletes when the
+class is torn down, so a class's levels are flushed by a class resource
+cleanup (run before the credentials are cleared); only work without a
+test class, and types shared by the whole worker, waits for worker exit.
+
+Errors are logged and never raised, like the ``_delete_*_safe`` helpers
+this replaces; a resource that could not be deleted is reported at the
+end.  Mixins register resources with ``get_executor(self).add(...)``;
+the executor runs as one cleanup of the test.
+"""
+
+import atexit
+from concurrent import futures
+import heapq
+import json
+import os
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from tempest.lib import exceptions as lib_exc
+
+from dell_tempest_plugin.common import async_waiters
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin import config
+
+LOG = logging.getLogger(__name__)
+
+# Implicit deletion order per resource kind; lower goes first.
+KIND_ORDER = {
+    'access_rule': 0,
+    'share_snapshot': 1,
+    'volume_snapshot': 1,
+    'share': 2,
+    'volume': 2,
+    'share_type': 3,
+    'volume_type': 3,
+    'file_system': 3,
+    'qos_type': 4,
+    'volume_qos': 4,
+}
+
+_EXECUTOR_ATTR = '_dell_cleanup_executor'
+_FLUSH_ATTR = '_dell_cleanup_flush'
+
+
+class _Entry(object):
+    """A resource registered with a ``CleanupExecutor``."""
+
+    def __init__(self, kind, resource_id, delete, waiter, depends_on):
+        self.kind = kind
+        self.resource_id = resource_id
+        self.delete = delete
+        self.waiter = waiter
+        self.depends_on = [key for key in depends_on or ()
+                           if key and key[1] is not None]
+        self.requested = False
+
+    @property
+    def key(self):
+        return (self.kind, self.resource_id)
+
+    def __str__(self):
+        return '%s %s' % (self.kind.replace('_', ' '), self.resource_id)
+
+
+class CleanupExecutor(object):
+    """Delete registered resources in dependency order, level by level.
+
+    :param test: Test case whose waiter runtime is used for the batched
+        deletion waits; ``None`` uses a throw-away runtime.
+    :param max_workers: Size of the thread pool issuing delete calls;
+        defaults to ``[dell_driver] waiter_workers``.
+    :param deferred: Only fire the first level's deletes and leave the
+        rest to the process-exit sweep; defaults to
+        ``[dell_driver] deferred_cleanup``.
+    """
+
+    def __init__(self, test=None, max_workers=None, deferred=None):
+        self.test = test
+        self.max_workers = max_workers or async_waiters.get_workers()
+        self.deferred = is_deferred() if deferred is None else deferred
+        self.entries = []
+        self.failed = []
+
+    def add(self, kind, resource_id, delete, waiter=None, depends_on=(),
+            requested=False):
+        """Register a resource for deletion.
+
+        :param kind: Resource kind, e.g. ``'share'`` or ``'volume_type'``.
+        :param resource_id: ID passed to *delete* and *waiter*.
+        :param delete: Callable taking *resource_id* that issues the
+            delete; ``NotFound`` means the resource is already gone.
+        :param waiter: Optional callable taking *resource_id* and
+            returning a waiter (e.g. ``waiters.deletion_waiter``) that
+            ends when the deletion is complete.
+        :param depends_on: ``(kind, resource_id)`` keys of resources
+            this one needs; they are deleted after it.
+        :param requested: The delete was already issued elsewhere; only
+            wait for it.
+        :returns: The ``(kind, resource_id)`` key of the resource.
+        """
+        entry = _Entry(kind, resource_id, delete, waiter, depends_on)
+        entry.requested = requested
+        self.entries.append(entry)
+        return entry.key
+
+    def discard(self, kind, resource_id):
+        """Forget a resource the test already deleted or unmanaged."""
+        self.entries = [e for e in self.entries
+                        if e.key != (kind, resource_id)]
+
+    def _requires(self, by_key):
+        """Map each key to every key it depends on, transitively."""
+        requires = {}
+
+        def _walk(key, path):
+            if key not in requires:
+                if key in path:
+                    raise ValueError("Cleanup dependency cycle at %s %s"
+                                     % key)
+                found = set()
+                for dep in by_key[key].depends_on:
+                    if dep in by_key:
+                        found.add(dep)
+                        found |= _walk(dep, path + (key,))
+                requires[key] = found
+            return requires[key]
+
+        for key in by_key:
+            _walk(key, ())
+        return requires
+
+    def levels(self):
+        """Return the entries grouped into deletion levels, first first.
+
+        An entry is deleted after everything that depends on it and
+        after every entry of a lower ``KIND_ORDER`` that it does not
+        itself depend on (a share cloned from a snapshot still goes
+        before that snapshot).
+        """
+        by_key = dict((e.key, e) for e in self.entries)
+        requires = self._requires(by_key)
+        level = {}
+
+        def _level(entry, path):
+            if entry.key in level:
+                return level[entry.key]
+            if entry.key in path:
+                raise ValueError("Cleanup dependency cycle at %s" % entry)
+            path = path + (entry.key,)
+            order = KIND_ORDER.get(entry.kind, 0)
+            before = [e for e in self.entries
+                      if entry.key in requires[e.key] or
+                      (KIND_ORDER.get(e.kind, 0) < order and
+                       e.key not in requires[entry.key])]
+            level[entry.key] = max(
+                [_level(e, path) + 1 for e in before] or [0])
+            return level[entry.key]
+
+        groups = {}
+        for entry in self.entries:
+            groups.setdefault(_level(entry, ()), []).append(entry)
+        return [groups[n] for n in sorted(groups)]
+
+    def _delete(self, entry, budget):
+        # Worker threads do not inherit the test's thread-local budget.
+        if budget is not None:
+            dell_budget.activate(budget)
+        try:
+            entry.delete(entry.resource_id)
+            LOG.info("Requested deletion of %s", entry)
+            return True
+        except lib_exc.NotFound:
+            LOG.debug("%s already gone", entry)
+        except Exception as e:
+            LOG.warning("Failed to delete %s: %s", entry, e)
+            self.failed.append(entry)
+        finally:
+            if budget is not None:
+                dell_budget.deactivate(budget)
+        return False
+
+    def _request(self, entries, pool, budget):
+        """Issue the deletes of *entries* not requested yet, in parallel."""
+        pending = [e for e in entries if not e.requested]
+        for entry, ok in zip(pending, pool.map(
+                lambda e: self._delete(e, budget), pending)):
+            entry.requested = ok
+        return [e for e in entries if e.requested]
+
+    def _wait(self, waiters):
+        return async_waiters.wait_all(waiters, test=self.test,
+                                      return_exceptions=True)
+
+    def _run_level(self, entries, pool, budget):
+        waiting = [e for e in self._request(entries, pool, budget)
+                   if e.waiter is not None]
+        results = self._wait([e.waiter(e.resource_id) for e in waiting])
+        for entry, result in zip(waiting, results):
+            if isinstance(result, Exception):
+                LOG.warning("Deletion of %s did not complete: %s",
+                            entry, result)
+                self.failed.append(entry)
+            else:
+                LOG.info("%s deletion confirmed", str(entry).capitalize())
+
+    def _take_levels(self):
+        """Return the deletion levels and forget the registered entries."""
+        if not self.entries:
+            return []
+        try:
+            levels = self.levels()
+        except ValueError as e:
+            LOG.warning("%s; deleting in reverse registration order", e)
+            levels = [[entry] for entry in reversed(self.entries)]
+        self.entries = []
+        return levels
+
+    def _pool(self):
+        return futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                          thread_name_prefix='dell-cleanup')
+
+    def run(self):
+        """Delete every registered resource; never raises."""
+        levels = self._take_levels()
+        if not levels:
+            return
+        budget = dell_budget.current()
+        if self.deferred:
+            with self._pool() as pool:
+                levels[0] = self._request(levels[0], pool, budget)
+            get_sweep().defer(levels, self.failed,
+                              owner=_flush_owner(self.test))
+            return
+        with self._pool() as pool:
+            for entries in levels:
+                self._run_level(entries, pool, budget)
+        if self.failed:
+            LOG.warning("Cleanup left %d resource(s) behind: %s",
+                        len(self.failed),
+                        ', '.join(str(e) for e in self.failed))
+
+
+class DeferredSweep(CleanupExecutor):
+    """Sweep that finishes deferred cleanups.
+
+    Each deferred executor hands over its levels with the first one's
+    deletes already fired.  The levels of a test class are run by
+    ``flush`` from the class's resource cleanup, while its credentials
+    still exist.  At exit the sweep runs whatever is left, merged (level
+    *n* of every test together), waits for every deletion and reports
+    what is left as errors.  With ``[dell_driver]
+    deferred_cleanup_dir`` set it also writes ``leftovers-<pid>.json``
+    there for the ``dell-tempest-deferred-report`` command, which fails
+    the run when any worker left resources behind.
+
+    Thread pools no longer accept work once atexit callbacks run, so the
+    sweep issues its deletes in turn and interleaves the deletion polls
+    on the exiting thread.
+    """
+
+    def __init__(self):
+        super(DeferredSweep, self).__init__(deferred=False)
+        self._lock = threading.Lock()
+        self._levels = []
+        self._owned = {}
+        self._trailing = []
+
+    @staticmethod
+    def _merge(into, levels):
+        for n, entries in enumerate(levels):
+            if n == len(into):
+                into.append([])
+            into[n].extend(entries)
+
+    def defer(self, levels, failed=(), trailing=False, owner=None):
+        """Take over *levels* and report *failed* deletes as leftovers.
+
+        :param trailing: Run *levels* after every level deferred so far
+            instead of merging them level by level, for resources that
+            everything else may still use (e.g. shared types).
+        :param owner: Test class whose ``flush`` runs *levels*; without
+            one they wait for the exit sweep.
+        """
+        with self._lock:
+            self.failed.extend(failed)
+            if trailing:
+                self._trailing.extend(list(entries) for entries in levels)
+            elif owner is not None:
+                self._merge(self._owned.setdefault(owner, []), levels)
+            else:
+                self._merge(self._levels, levels)
+
+    def flush(self, owner):
+        """Finish the deferred levels of the test class *owner*.
+
+        Called from the class's resource cleanup; the deletes and waits
+        run on a thread pool like a non-deferred cleanup.
+        """
+        with self._lock:
+            levels = self._owned.pop(owner, [])
+        if owner.__dict__.get(_FLUSH_ATTR):
+            delattr(owner, _FLUSH_ATTR)
+        if not levels:
+            return
+        LOG.info("Finishing deferred cleanup of %s (%d resource(s))",
+                 owner.__name__, sum(len(entries) for entries in levels))
+        executor = CleanupExecutor(deferred=False)
+        with executor._pool() as pool:
+            for entries in levels:
+                executor._run_level(entries, pool, None)
+        with self._lock:
+            self.failed.extend(executor.failed)
+
+    def _take_levels(self):
+        with self._lock:
+            levels = []
+            for owned in self._owned.values():
+                self._merge(levels, owned)
+            self._merge(levels, self._levels)
+            levels += self._trailing
+            self._levels, self._owned, self._trailing = [], {}, []
+        return levels
+
+    def _pool(self):
+        return _InlinePool()
+
+    def _wait(self, waiters):
+        return _interleave(waiters)
+
+    def run(self):
+        levels = self._take_levels()
+        swept = sum(len(entries) for entries in levels)
+        if swept:
+            LOG.info("Deferred cleanup sweep of %d resource(s)", swept)
+            with self._pool() as pool:
+                for entries in levels:
+                    self._run_level(entries, pool, None)
+        for entry in self.failed:
+            LOG.error("Deferred cleanup leftover: %s", entry)
+        self._write_report(swept)
+
+    def _write_report(self, swept):
+        report_dir = _get_report_dir()
+        if not report_dir or not (swept or self.failed):
+            return
+        path = os.path.join(report_dir, 'leftovers-%d.json' % os.getpid())
+        report = {
+            'pid': os.getpid(),
+            'swept': swept,
+            'leftovers': [{'kind': e.kind, 'id': e.resource_id}
+                          for e in self.failed],
+        }
+        try:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=1)
+        except (IOError, OSError) as e:
+            LOG.error("Could not write deferred cleanup report %s: %s",
+                      path, e)
+
+
+class _InlinePool(object):
+    """Stand-in for a thread pool that runs every call in turn."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def map(self, fn, items):
+        return [fn(item) for item in items]
+
+
+def _interleave(waiters):
+    """Drive *waiters* on this thread, polling whichever is due next.
+
+    :returns: The waiters' results, or the exception each one raised.
+    """
+    results = [None] * len(waiters)
+    due = [(time.time(), n, waiter.steps())
+           for n, waiter in enumerate(waiters)]
+    heapq.heapify(due)
+    while due:
+        when, n, steps = heapq.heappop(due)
+        delay = when - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            heapq.heappush(due, (time.time() + next(steps), n, steps))
+        except StopIteration as e:
+            results[n] = e.value
+        except Exception as e:
+            results[n] = e
+    return results
+
+
+def is_deferred():
+    """Return whether test cleanups defer their waits to worker exit."""
+    try:
+        return config.CONF.dell_driver.deferred_cleanup
+    except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+        return False
+
+
+def _get_report_dir():
+    try:
+        return config.CONF.dell_driver.deferred_cleanup_dir
+    except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+        return None
+
+
+_sweep = None
+_sweep_lock = threading.Lock()
+
+
+def get_sweep():
+    """Return the process-wide sweep, registering it at exit on first use."""
+    global _sweep
+    with _sweep_lock:
+        if _sweep is None:
+            _sweep = DeferredSweep()
+            atexit.register(_sweep.run)
+        return _sweep
+
+
+def _flush_owner(test):
+    """Return *test*'s class once its deferred levels will be flushed.
+
+    A class resource cleanup calling ``DeferredSweep.flush`` is
+    registered on first use; ``None`` (left to the exit sweep) when
+    there is no test or it has no class resource cleanups.
+    """
+    if test is None:
+        return None
+    owner = type(test)
+    if owner.__dict__.get(_FLUSH_ATTR):
+        return owner
+    add_cleanup = getattr(owner, 'addClassResourceCleanup', None)
+    if add_cleanup is None:
+        return None
+    sweep = get_sweep()
+    with _sweep_lock:
+        if not owner.__dict__.get(_FLUSH_ATTR):
+            add_cleanup(sweep.flush, owner)
+            setattr(owner, _FLUSH_ATTR, True)
+    return owner
+
+
+def get_executor(test):
+    """Return *test*'s executor, registering it as a cleanup on first use.
+
+    Resources added later in the test are still deleted by the same
+    cleanup, which runs after every cleanup registered after it.
+    """
+    executor = getattr(test, _EXECUTOR_ATTR, None)
+    if executor is None:
+        executor = CleanupExecutor(test)
+        setattr(test, _EXECUTOR_ATTR, executor)
+        test.addCleanup(executor.run)
+    return executor
@@ -0,0 +1,218 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Before/after PowerStore inventory, to tell which test class leaked.
+
+A filesystem, volume, snapshot or QoS rule left on the array used to go
+unnoticed until the array filled up.  With ``[dell_driver] leak_check``
+enabled, every PowerStore test class records an inventory of the array
+when it is set up and again when it is torn down, and logs a warning
+naming the class and every object that appeared in between and is
+still there.
+
+An inventory is one paged ``GET`` per endpoint with ``select=`` limited
+to the ID, name and type columns.  Only objects whose name looks like
+ours (plugin ``rand_name`` stems, and the ``volume-``/``snapshot-``/
+``share-`` names the Cinder and Manila drivers give backend objects)
+are kept, as a set of IDs per kind, so the diff is a set difference
+and stays cheap on arrays with tens of thousands of objects.
+
+Objects created by classes running concurrently in other workers are
+reported too; the warning is a hint for where to look, not a failure.
+The check is skipped when objects legitimately outlive the class:
+
+  - with ``deferred_cleanup`` deletions are only confirmed when the
+    worker exits
+  - with ``warm_pool_size`` the pools create replacement volumes and
+    shares in the background, in between the two inventories
+  - with ``keep_warm`` the shared types, and their QoS rules, are kept
+    across runs
+"""
+
+import re
+
+from oslo_config import cfg
+from oslo_log import log as logging
+import requests
+
+from dell_tempest_plugin.common import backend_config as dell_backends
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import warm_pool as dell_pools
+from dell_tempest_plugin import config
+from dell_tempest_plugin.services import powerstore_client
+
+LOG = logging.getLogger(__name__)
+
+# kind: type column or None
+ENDPOINTS = {
+    'file_system': 'filesystem_type',
+    'volume': 'type',
+    'io_limit_rule': None,
+    'file_io_limit_rule': None,
+}
+
+UUID = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+
+DEFAULT_PATTERNS = (
+    r'^(tempest-)?(ps|powerstore)[-_]',
+    r'^(volume|snapshot|share|share-snapshot)-%s$' % UUID,
+)
+
+
+def is_enabled():
+    """Return whether PowerStore test classes check for leaks."""
+    try:
+        return config.CONF.dell_driver.leak_check
+    except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+        return False
+
+
+def skip_reason():
+    """Return why objects may outlive a class on purpose, or ``None``."""
+    if dell_cleanup.is_deferred():
+        return "deferred_cleanup is on"
+    if dell_pools.get_size():
+        return "warm pools are on"
+    if dell_types.is_keep_warm():
+        return "keep_warm is on"
+    return None
+
+
+class Inventory(object):
+    """IDs (and names) of the owned objects of one array, per kind."""
+
+    def __init__(self, ids, names):
+        self.ids = ids
+        self.names = names
+
+    def leaked_since(self, before):
+        """Return ``{kind: [(id, name), ...]}`` of objects new since *before*.
+
+        Kinds that could not be listed either time are skipped.
+        """
+        leaked = {}
+        for kind, ids in self.ids.items():
+            if kind not in before.ids:
+                continue
+            new = ids - before.ids[kind]
+            if new:
+                leaked[kind] = sorted((i, self.names.get(i)) for i in new)
+        return leaked
+
+
+class PowerStoreInventory(object):
+    """Takes ``Inventory`` snapshots of a PowerStore array.
+
+    :param client: ``PowerStoreRestClient`` of the array.
+    :param patterns: Regexes a name must match to be tracked.
+    """
+
+    def __init__(self, client, patterns=DEFAULT_PATTERNS):
+        self.client = client
+        self.owned = re.compile('|'.join('(?:%s)' % p for p in patterns))
+
+    @classmethod
+    def from_config(cls):
+        """Build from the PowerStore backend of manila.conf or cinder.conf.
+
+        :returns: The inventory, or ``None`` when no array is configured.
+        """
+        backend = (dell_backends.manila().find('powerstore') or
+                   dell_backends.cinder().find('powerstore'))
+        if backend is None:
+            return None
+        return cls(powerstore_client.get_client(
+            backend.host, backend.user, backend.password))
+
+    def _list(self, kind, type_column):
+        """Yield ``(id, name, type)`` of every object, page by page."""
+        select = 'id,name' + (',' + type_column if type_column else '')
+        for item in self.client.list_all(kind, params={'select': select}):
+            yield (item['id'], item.get('name') or '',
+                   item.get(type_column) if type_column else None)
+
+    def take(self):
+        """Return the current ``Inventory`` of owned objects."""
+        ids = {}
+        names = {}
+        for kind, type_column in ENDPOINTS.items():
+            found = {kind: set(), kind + '_snapshot': set()}
+            try:
+                for obj_id, name, obj_type in self._list(kind, type_column):
+                    if not self.owned.search(name):
+                        continue
+                    key = (kind + '_snapshot' if obj_type == 'Snapshot'
+                           else kind)
+                    found[key].add(obj_id)
+                    names[obj_id] = name
+            except (powerstore_client.PowerStoreRestError, ValueError,
+                    requests.RequestException) as e:
+                LOG.debug("Inventory of %s skipped: %s", kind, e)
+                continue
+            ids[kind] = frozenset(found[kind])
+            if type_column:
+                ids[kind + '_snapshot'] = frozenset(found[kind + '_snapshot'])
+        return Inventory(ids, names)
+
+
+class LeakCheckMixin(object):
+    """Test class mixin comparing the array before and after the class."""
+
+    @classmethod
+    def resource_setup(cls):
+        cls._dell_inventory = None
+        cls._dell_inventory_before = None
+        if is_enabled():
+            cls._start_leak_check()
+        super(LeakCheckMixin, cls).resource_setup()
+
+    @classmethod
+    def _start_leak_check(cls):
+        reason = skip_reason()
+        if reason is not None:
+            LOG.debug("Leak check of %s skipped: %s", cls.__name__, reason)
+            return
+        try:
+            cls._dell_inventory = PowerStoreInventory.from_config()
+            if cls._dell_inventory is not None:
+                cls._dell_inventory_before = cls._dell_inventory.take()
+        except Exception as e:
+            LOG.warning("Leak check of %s disabled: %s", cls.__name__, e)
+            cls._dell_inventory = None
+
+    @classmethod
+    def resource_cleanup(cls):
+        try:
+            super(LeakCheckMixin, cls).resource_cleanup()
+        finally:
+            inventory = getattr(cls, '_dell_inventory', None)
+            before = getattr(cls, '_dell_inventory_before', None)
+            if inventory is not None and before is not None:
+                cls._check_leaks(inventory, before)
+
+    @classmethod
+    def _check_leaks(cls, inventory, before):
+        try:
+            leaked = inventory.take().leaked_since(before)
+        except Exception as e:
+            LOG.warning("Leak check of %s failed: %s", cls.__name__, e)
+            return
+        for kind, objects in sorted(leaked.items()):
+            LOG.warning("%s left %d PowerStore %s(s) behind: %s",
+                        cls.__name__, len(objects), kind.replace('_', ' '),
+                        ', '.join('%s (%s)' % (name, obj_id)
+                                  for obj_id, name in objects))
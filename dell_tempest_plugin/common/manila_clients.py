@@ -0,0 +1,108 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Manila clients of a tempest manager, shared by the Manila test modules.
+
+``DellTempestPlugin.get_service_clients`` registers the clients of
+``services.manila_client`` under the ``dell_share`` name, so every
+``clients.Manager`` carries a factory for them.  The helpers below
+return the manager's instance of each client, creating it on first use
+(the factory keeps it under an alias), so a test class asks for its
+clients in one line::
+
+    cls.shares_v2_client = manila_clients.shares_client(cls.admin_manager)
+
+When the plugin's registration did not run (tests started with plain
+pytest) the clients are registered on the manager instead.  ``None`` is
+returned when ``manila_tempest_tests`` is not installed.
+"""
+
+import importlib.util
+import threading
+
+from oslo_log import log as logging
+from tempest import config
+from tempest.lib import exceptions as lib_exc
+
+LOG = logging.getLogger(__name__)
+
+SERVICE_NAME = 'dell_share'
+SERVICE_VERSION = 'share.dell'
+MODULE_PATH = 'dell_tempest_plugin.services.manila_client'
+CLIENT_NAMES = ['SharesV2Client', 'ShareTypesClient', 'QosTypesClient']
+
+_lock = threading.Lock()
+
+
+def service_clients():
+    """Return the ``get_service_clients`` entries of the Manila clients.
+
+    :returns: A list with one entry, or an empty list when
+        ``manila_tempest_tests`` or its ``[share]`` options are missing.
+    """
+    if importlib.util.find_spec('manila_tempest_tests') is None:
+        return []
+    try:
+        params = config.service_client_config('share')
+    except lib_exc.UnknownServiceClient:
+        LOG.debug("No [share] options; Manila clients not registered")
+        return []
+    params.update({
+        'name': SERVICE_NAME,
+        'service_version': SERVICE_VERSION,
+        'module_path': MODULE_PATH,
+        'client_names': CLIENT_NAMES,
+    })
+    return [params]
+
+
+def _factory(manager):
+    factory = getattr(manager, SERVICE_NAME, None)
+    if factory is not None:
+        return factory
+    with _lock:
+        if not hasattr(manager, SERVICE_NAME):
+            for params in service_clients():
+                try:
+                    manager.register_service_client_module(**params)
+                except ImportError as e:
+                    LOG.warning("Cannot load the Manila clients: %s", e)
+        return getattr(manager, SERVICE_NAME, None)
+
+
+def _client(manager, class_name, alias):
+    factory = _factory(manager)
+    if factory is None:
+        return None
+    client = getattr(factory, alias, None)
+    if client is None:
+        client = getattr(factory, class_name)(alias=alias)
+    return client
+
+
+def shares_client(manager):
+    """Return the manager's Manila shares client, or ``None``."""
+    return _client(manager, 'SharesV2Client', 'shares_v2_client')
+
+
+def share_types_client(manager):
+    """Return the manager's Manila share types client, or ``None``."""
+    return _client(manager, 'ShareTypesClient', 'share_types_client')
+
+
+def qos_types_client(manager):
+    """Return the manager's Manila QoS types client, or ``None``."""
+    return _client(manager, 'QosTypesClient', 'qos_types_client')
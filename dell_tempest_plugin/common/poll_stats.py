@@ -0,0 +1,143 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Poll-efficiency statistics for the shared waiters.
+
+Every wait run by ``dell_tempest_plugin.common.waiters`` adds one
+``WaitRecord`` when it ends:
+
+  - ``polls`` and ``api_calls`` issued
+  - ``elapsed`` wall time and ``to_target``, the time of the poll that
+    first saw the target state (``None`` if it was never reached)
+  - ``overshoot``, the gap between that poll and the previous one: an
+    upper bound on the time spent sleeping after the state was reached
+
+Records are attributed to the test whose deadline budget was active
+when the waiter was created.  At worker exit, totals per test and per
+resource kind are logged, and all records are written as JSON when
+``[dell_driver] poll_stats_file`` is set (``{pid}`` in the path is
+replaced by the worker's process id), so polling intervals can be tuned
+per backend from real data.
+"""
+
+import atexit
+import collections
+import json
+import os
+import threading
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from dell_tempest_plugin import config
+
+LOG = logging.getLogger(__name__)
+
+WaitRecord = collections.namedtuple(
+    'WaitRecord', ['test', 'kind', 'resource', 'outcome', 'polls',
+                   'api_calls', 'elapsed', 'to_target', 'overshoot'])
+
+_TOTAL_FIELDS = ('waits', 'polls', 'api_calls', 'elapsed', 'overshoot')
+
+
+class PollStats(object):
+    """Thread-safe collection of ``WaitRecord`` entries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = []
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def totals(self, field):
+        """Aggregate records by *field* (``'test'`` or ``'kind'``).
+
+        :returns: Dict mapping each value of *field* to a dict of
+            ``waits``, ``polls``, ``api_calls``, ``elapsed`` and
+            ``overshoot`` sums.
+        """
+        totals = collections.OrderedDict()
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            key = getattr(record, field)
+            entry = totals.setdefault(key, dict.fromkeys(_TOTAL_FIELDS, 0))
+            entry['waits'] += 1
+            entry['polls'] += record.polls
+            entry['api_calls'] += record.api_calls
+            entry['elapsed'] += record.elapsed
+            entry['overshoot'] += record.overshoot or 0
+        return totals
+
+    def report(self):
+        """Return a multi-line summary per resource kind and per test."""
+        lines = []
+        for field in ('kind', 'test'):
+            lines.append("Poll efficiency by %s:" % field)
+            for key, t in self.totals(field).items():
+                lines.append(
+                    "  %s: %d wait(s), %d poll(s), %d API call(s), "
+                    "%.1fs waiting, %.1fs overshoot"
+                    % (key, t['waits'], t['polls'], t['api_calls'],
+                       t['elapsed'], t['overshoot']))
+        return '\n'.join(lines)
+
+    def dump(self, path):
+        with self._lock:
+            records = [r._asdict() for r in self.records]
+        with open(path, 'w') as f:
+            json.dump(records, f, indent=1)
+
+
+_stats = PollStats()
+
+
+def get_stats():
+    """Return the worker-wide ``PollStats``."""
+    return _stats
+
+
+def record(test, kind, resource, outcome, polls, api_calls, elapsed,
+           to_target=None, overshoot=None):
+    """Add one finished wait to the worker-wide statistics."""
+    _stats.add(WaitRecord(test or 'unknown', kind, resource, outcome,
+                          polls, api_calls, elapsed, to_target, overshoot))
+
+
+def _get_path():
+    try:
+        return config.CONF.dell_driver.poll_stats_file
+    except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+        return None
+
+
+def _emit():
+    if not _stats.records:
+        return
+    LOG.info(_stats.report())
+    path = _get_path()
+    if path:
+        path = path.replace('{pid}', str(os.getpid()))
+        try:
+            _stats.dump(path)
+        except (IOError, OSError) as e:
+            LOG.warning("Could not write poll statistics to %s: %s",
+                        path, e)
+
+
+atexit.register(_emit)
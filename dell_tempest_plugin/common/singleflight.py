@@ -0,0 +1,168 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Single-flight coalescing of identical GET requests.
+
+Several waiters in one worker often watch the same resource at once: a
+test-level waiter overlapping an ``addCleanup`` deletion waiter, or a
+clone-chain test waiting on parents and children.  Each used to issue
+its own ``show_volume`` / ``get_share``.
+
+``call`` merges identical requests (same client, method and arguments):
+while one is in flight, other callers block on it and receive its
+result, and a completed result is served for a short freshness window
+afterwards.
+
+A caller only reuses a request that was *sent* after its
+``not_before`` time (the start of its wait, or the arrival of its
+previous response), so a waiter never observes a response older than
+what it would have fetched itself, nor the same response twice.  Test
+semantics are therefore the same as with one request per caller.
+Results are shared, not copied, and must be treated as read-only.
+
+The freshness window is ``[dell_driver] get_coalesce_window`` seconds;
+``0`` only merges requests that are in flight at the same time.
+"""
+
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from dell_tempest_plugin import config
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 0.5
+
+
+class _Flight(object):
+    """One outstanding or recently completed request."""
+
+    def __init__(self):
+        self.sent = time.time()
+        self.finished = None
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.shared = 0
+
+
+class SingleFlight(object):
+    """Merge concurrent identical calls and reuse fresh results.
+
+    :param window: Seconds a completed result stays reusable.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.issued = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def _usable(self, flight, now, not_before):
+        if not_before is not None and flight.sent <= not_before:
+            return False
+        if not flight.event.is_set():
+            return True
+        return now - flight.finished <= self.window
+
+    def _prune(self, now):
+        for key, flight in list(self._flights.items()):
+            if flight.event.is_set() and now - flight.finished > self.window:
+                del self._flights[key]
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` once per *key* and share the result.
+
+        :param not_before: Keyword-only; only reuse a request sent
+            after this ``time.time()`` value.
+        """
+        not_before = kwargs.pop('not_before', None)
+        now = time.time()
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None or not self._usable(flight, now,
+                                                        not_before)
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.issued += 1
+            else:
+                flight.shared += 1
+                self.coalesced += 1
+        if leader:
+            try:
+                flight.result = fn(*args, **kwargs)
+            except Exception as e:
+                flight.error = e
+            finally:
+                flight.finished = time.time()
+                flight.event.set()
+                with self._lock:
+                    self._prune(flight.finished)
+        else:
+            flight.event.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+
+def _key(fn, args, kwargs):
+    return (id(fn.__self__), fn.__name__, args,
+            tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+
+
+def _get_window():
+    try:
+        return config.CONF.dell_driver.get_coalesce_window
+    except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+        return DEFAULT_WINDOW
+
+
+_group = None
+_group_lock = threading.Lock()
+
+
+def get_group():
+    """Return the worker-wide ``SingleFlight`` group."""
+    global _group
+    with _group_lock:
+        if _group is None:
+            _group = SingleFlight(_get_window())
+        return _group
+
+
+def call(fn, *args, **kwargs):
+    """Call the client method *fn* through the worker-wide group.
+
+    Only bound methods (``client.show_volume``) are coalesced, keyed by
+    client instance, method name and arguments; any other callable is
+    invoked directly.
+
+    :param not_before: See ``SingleFlight.do``.
+    """
+    not_before = kwargs.pop('not_before', None)
+    if getattr(fn, '__self__', None) is None:
+        return fn(*args, **kwargs)
+    try:
+        key = _key(fn, args, kwargs)
+        hash(key)
+    except TypeError:
+        return fn(*args, **kwargs)
+    return get_group().do(key, fn, *args, not_before=not_before, **kwargs)
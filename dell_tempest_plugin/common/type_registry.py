@@ -0,0 +1,338 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Worker-wide reuse of volume, share and QoS types with identical specs.
+
+Almost every test used to create its own type and delete it again in a
+cleanup, which for volume types meant a retry loop until the backend
+released the type.  Types are configuration, not test data: two types
+with the same extra specs behave the same.
+
+``acquire`` hands out one type per distinct ``(kind, specs)`` pair,
+keyed by a hash of the canonical JSON form of the specs.  The first
+caller creates it; later callers in the same worker reuse it.  Each
+test holds a reference until its cleanups run.  The types themselves
+are only deleted at worker teardown, by the deferred cleanup sweep
+(see ``dell_tempest_plugin.common.cleanup``), after every resource of
+every test is gone.
+
+Helpers only go through the registry for auto-named types; a caller
+that asks for a specific name gets a private type as before.
+
+A type outlives the test class that created it, whose dynamic
+credentials are gone by the time the worker exits.  The registry
+therefore lists and deletes types with the clients of
+``admin_clients``, on the configured admin credentials, never with the
+caller's.
+
+With ``[dell_driver] keep_warm`` the types outlive the run, for quick
+edit-run loops against one lab array.  Such a type is named after its
+specs (``dell-keepwarm-<kind>-<hash>``, a label no run-specific name
+matches, so the reaper leaves it alone) and recorded in
+``keep_warm_state_file`` at worker exit instead of being deleted.  The
+next run validates the recorded types with one list call per kind and
+reuses the ones that still exist; a type missing from the state file is
+still found by its label.
+"""
+
+import atexit
+import fcntl
+import hashlib
+import json
+import os
+import threading
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from tempest.lib import exceptions as lib_exc
+
+from dell_tempest_plugin.common import admin_clients
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin import config
+
+LOG = logging.getLogger(__name__)
+
+KEEP_WARM_LABEL = 'dell-keepwarm'
+
+
+def spec_key(kind, specs):
+    """Return the registry key of a *kind* type with *specs*."""
+    canonical = json.dumps(
+        dict((str(k), str(v)) for k, v in (specs or {}).items()),
+        sort_keys=True)
+    return (kind, hashlib.sha1(canonical.encode('utf-8')).hexdigest())
+
+
+def keep_warm_name(key):
+    """Return the run-independent name of the kept type for *key*."""
+    kind, digest = key
+    return '%s-%s-%s' % (KEEP_WARM_LABEL, kind.replace('_', '-'),
+                         digest[:12])
+
+
+def _get_keep_warm():
+    """Return the state file path, or ``None`` when keep-warm is off."""
+    try:
+        if not config.CONF.dell_driver.keep_warm:
+            return None
+        return os.path.expanduser(
+            config.CONF.dell_driver.keep_warm_state_file)
+    except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+        return None
+
+
+def is_keep_warm():
+    """Return whether shared types are kept across runs."""
+    return _get_keep_warm() is not None
+
+
+def load_state(path):
+    """Return the ``{'<kind>:<hash>': entry}`` fixtures in *path*."""
+    try:
+        with open(path) as f:
+            return json.load(f).get('fixtures', {})
+    except (IOError, OSError, ValueError) as e:
+        if os.path.exists(path):
+            LOG.warning("Ignoring unreadable keep-warm state %s: %s",
+                        path, e)
+        return {}
+
+
+def save_state(path, fixtures):
+    """Merge *fixtures* into the state file at *path*.
+
+    Workers exit concurrently, so the read-merge-write is serialised
+    with a lock file and the state replaced atomically.
+    """
+    directory = os.path.dirname(path) or '.'
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path + '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        state = load_state(path)
+        state.update(fixtures)
+        tmp = '%s.%d' % (path, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump({'fixtures': state}, f, indent=2, sort_keys=True)
+        os.rename(tmp, path)
+
+
+def admin_calls(kind):
+    """Return the ``(delete, list_all)`` calls for *kind* types.
+
+    Both use the static admin clients; both are ``None`` when those
+    cannot be built.
+    """
+    if kind == 'volume_type':
+        client = admin_clients.volume_types_client()
+        if client is None:
+            return None, None
+        return client.delete_volume_type, client.list_volume_types
+    if kind == 'share_type':
+        client = admin_clients.share_types_client()
+        if client is None:
+            return None, None
+        return client.delete_share_type, client.list_share_types
+    if kind == 'qos_type':
+        client = admin_clients.qos_types_client()
+        if client is None:
+            return None, None
+        return (lambda qos_type_id: client.qos_type_request(
+                    'DELETE', url_suffix=str(qos_type_id)),
+                lambda: client.qos_type_request('GET')[1])
+    raise ValueError("Unknown type kind: %s" % kind)
+
+
+class _Shared(object):
+    """A type handed out by the registry."""
+
+    def __init__(self, kind, resource, delete, specs=None, kept=False):
+        self.kind = kind
+        self.resource = resource
+        self.delete = delete
+        self.specs = specs
+        self.kept = kept
+        self.refs = 0
+        self.users = 0
+
+
+class TypeRegistry(object):
+    """Shared types of one worker, keyed by ``spec_key``."""
+
+    def __init__(self, state_file=None):
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._types = {}
+        self._state = load_state(state_file) if state_file else {}
+        self._listings = {}
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def acquire(self, kind, specs, create):
+        """Return the shared type for *specs*, creating it on first use.
+
+        :param kind: ``'volume_type'``, ``'share_type'`` or ``'qos_type'``.
+        :param specs: Extra specs (or QoS specs) identifying the type.
+        :param create: Callable taking a name, or ``None`` to generate
+            one, and returning a new type dict; called once per distinct
+            *specs*.
+        :returns: The type dict; treat it as read-only.
+        """
+        key = spec_key(kind, specs)
+        with self._key_lock(key):
+            shared = self._types.get(key)
+            if shared is None:
+                delete, list_all = admin_calls(kind)
+                kept = bool(self.state_file and list_all)
+                resource = None
+                if kept:
+                    resource = self._find_kept(key, list_all)
+                if resource is None:
+                    resource = self._create(key, create, list_all, kept)
+                shared = _Shared(kind, resource, delete, specs, kept)
+                self._types[key] = shared
+                LOG.info("Registered shared %s %s for specs %s",
+                         kind.replace('_', ' '), shared.resource['id'],
+                         specs)
+        with self._lock:
+            shared.refs += 1
+            shared.users += 1
+        return shared.resource
+
+    def _listing(self, kind, list_all, refresh=False):
+        """Return every *kind* type, listed once per worker."""
+        with self._key_lock(('list', kind)):
+            if refresh or kind not in self._listings:
+                body = list_all()
+                if isinstance(body, dict):
+                    body = body.get(kind + 's') or []
+                self._listings[kind] = list(body)
+            return self._listings[kind]
+
+    def _find_kept(self, key, list_all, refresh=False):
+        """Return the kept type for *key* if it still exists."""
+        name = keep_warm_name(key)
+        entry = self._state.get('%s:%s' % key, {})
+        listing = self._listing(key[0], list_all, refresh)
+        for resource in listing:
+            if (resource.get('id') == entry.get('id') and
+                    resource.get('name') == name):
+                LOG.info("Reusing kept %s %s", key[0].replace('_', ' '),
+                         name)
+                return resource
+        for resource in listing:
+            if resource.get('name') == name:
+                LOG.info("Reusing unrecorded kept %s %s",
+                         key[0].replace('_', ' '), name)
+                return resource
+        return None
+
+    def _create(self, key, create, list_all, kept):
+        if not kept:
+            return create(None)
+        try:
+            return create(keep_warm_name(key))
+        except lib_exc.Conflict:
+            # Another worker created it since our listing.
+            resource = self._find_kept(key, list_all, refresh=True)
+            if resource is None:
+                raise
+            return resource
+
+    def release(self, kind, specs):
+        """Drop one reference; the type itself stays until teardown."""
+        with self._lock:
+            shared = self._types.get(spec_key(kind, specs))
+            if shared is not None:
+                shared.refs -= 1
+
+    def teardown(self):
+        """Hand every shared type to the deferred sweep for deletion.
+
+        Share types go before the QoS types they point at; the sweep
+        runs these levels after everything else it was given.  Kept
+        types are recorded in the state file instead.
+        """
+        with self._lock:
+            types, self._types = list(self._types.values()), {}
+        if not types:
+            return
+        executor = dell_cleanup.CleanupExecutor(deferred=False)
+        kept = {}
+        for shared in types:
+            if shared.refs:
+                LOG.warning("Shared %s %s still has %d reference(s) at "
+                            "teardown", shared.kind, shared.resource['id'],
+                            shared.refs)
+            LOG.info("Shared %s %s was used by %d test(s)",
+                     shared.kind, shared.resource['id'], shared.users)
+            if shared.kept:
+                key = spec_key(shared.kind, shared.specs)
+                kept['%s:%s' % key] = {
+                    'kind': shared.kind,
+                    'id': shared.resource['id'],
+                    'name': keep_warm_name(key),
+                    'specs': shared.specs,
+                }
+            elif shared.delete is None:
+                LOG.warning("No admin client to delete shared %s %s; "
+                            "leaving it", shared.kind,
+                            shared.resource['id'])
+            else:
+                executor.add(shared.kind, shared.resource['id'],
+                             shared.delete)
+        if kept:
+            try:
+                save_state(self.state_file, kept)
+            except (IOError, OSError) as e:
+                LOG.warning("Could not record kept types in %s: %s",
+                            self.state_file, e)
+        if executor.entries:
+            dell_cleanup.get_sweep().defer(executor.levels(),
+                                           trailing=True)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the worker-wide registry.
+
+    Its teardown is registered after the deferred sweep, so at exit it
+    runs first and the sweep deletes the types.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            dell_cleanup.get_sweep()
+            _registry = TypeRegistry(_get_keep_warm())
+            atexit.register(_registry.teardown)
+        return _registry
+
+
+def acquire(test, kind, specs, create):
+    """Return the shared type for *specs* and hold it for *test*.
+
+    See ``TypeRegistry.acquire``; the reference is released by a cleanup
+    of *test*.
+    """
+    resource = get_registry().acquire(kind, specs, create)
+    test.addCleanup(get_registry().release, kind, specs)
+    return resource
@@ -0,0 +1,240 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Warm pools of pre-created, available volumes and shares.
+
+Many tests only need "an available 1 GB volume of type X" or "an
+available NFS share of type Y" and used to pay the full create-and-wait
+latency for it.  A ``WarmPool`` keeps ``[dell_driver] warm_pool_size``
+such resources per ``(kind, type, size, protocol)`` key ready in the
+background and leases them to tests:
+
+  - a lease pops a ready resource and immediately starts provisioning
+    its replacement on a background thread
+  - a leased resource belongs to the test; at cleanup it is handed back
+    with ``recycle`` and deleted asynchronously, never reused
+  - when the pool is empty (first use, or tests outpacing the backend)
+    ``lease`` returns ``None`` and the helper creates the resource
+    itself, exactly as without pools
+
+At worker exit, idle resources and deletions still in progress are
+handed to the deferred cleanup sweep, which deletes and confirms them.
+Pools are off by default (``warm_pool_size = 0``).
+
+A pool outlives the test class that first asked for it, whose dynamic
+credentials are gone long before the refill and drain threads are.  Its
+callables therefore use the clients of ``admin_clients``, on the
+configured admin credentials, and its resources live in that project;
+pools are keyed by the project as well, so a lease never hands out a
+resource of another project.  Without admin credentials there are no
+pools.
+
+A helper uses it like::
+
+    vols = admin_clients.volumes_client()
+    pool = dell_pools.get_pool(
+        ('volume', vt_name, size), 'volume',
+        create=lambda: vols.create_volume(...)['volume'],
+        ready=lambda vid: dell_waiters.wait_for_status(...),
+        delete=vols.delete_volume,
+        waiter=lambda vid: dell_waiters.deletion_waiter(...))
+    vol = pool.lease() if pool else None
+    if vol is not None:
+        self.addCleanup(pool.recycle, vol['id'])
+        return vol
+"""
+
+import atexit
+import collections
+import threading
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from tempest.lib import exceptions as lib_exc
+
+from dell_tempest_plugin.common import admin_clients
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin import config
+
+LOG = logging.getLogger(__name__)
+
+
+def get_size():
+    """Return the configured number of ready resources per pool."""
+    try:
+        return config.CONF.dell_driver.warm_pool_size
+    except (cfg.NoSuchGroupError, cfg.NoSuchOptError):
+        return 0
+
+
+class WarmPool(object):
+    """Ready resources of one key, refilled in the background.
+
+    :param key: Pool key, used in log messages.
+    :param kind: Resource kind as used by ``CleanupExecutor``.
+    :param create: Callable issuing the create; returns the resource.
+    :param ready: Callable taking the ID, waiting until the resource is
+        usable and returning its current dict.
+    :param delete: Callable taking the ID that issues the delete.
+    :param waiter: Callable taking the ID and returning a deletion
+        waiter.
+    :param size: Number of resources to keep ready.
+    """
+
+    def __init__(self, key, kind, create, ready, delete, waiter, size):
+        self.key = key
+        self.kind = kind
+        self.create = create
+        self.ready = ready
+        self.delete = delete
+        self.waiter = waiter
+        self.size = size
+        self.leased = 0
+        self.missed = 0
+        self._lock = threading.Lock()
+        self._ready = collections.deque()
+        self._provisioning = 0
+        self._owned = set()
+        self._deleting = set()
+        self._closed = False
+
+    def fill(self):
+        """Start provisioning until ``size`` resources are on the way."""
+        with self._lock:
+            if self._closed:
+                return
+            missing = self.size - len(self._ready) - self._provisioning
+            self._provisioning += max(missing, 0)
+        for _ in range(missing):
+            threading.Thread(target=self._provision, daemon=True,
+                             name='dell-warm-pool').start()
+
+    def _provision(self):
+        resource = resource_id = None
+        try:
+            resource_id = self.create()['id']
+            with self._lock:
+                self._owned.add(resource_id)
+            resource = self.ready(resource_id)
+        except Exception as e:
+            LOG.warning("Warm pool %s could not provision a %s: %s",
+                        self.key, self.kind.replace('_', ' '), e)
+            if resource_id is not None:
+                self.recycle(resource_id)
+            resource = None
+        with self._lock:
+            self._provisioning -= 1
+            if resource is not None and resource_id in self._owned:
+                self._ready.append(resource)
+
+    def lease(self):
+        """Return a ready resource and start its replacement.
+
+        :returns: The resource dict, or ``None`` when none is ready.
+        """
+        with self._lock:
+            resource = self._ready.popleft() if self._ready else None
+            if resource is not None:
+                self._owned.discard(resource['id'])
+                self.leased += 1
+            else:
+                self.missed += 1
+        self.fill()
+        return resource
+
+    def recycle(self, resource_id):
+        """Delete a leased (or failed) resource in the background."""
+        with self._lock:
+            self._owned.discard(resource_id)
+            self._deleting.add(resource_id)
+        threading.Thread(target=self._delete, args=(resource_id,),
+                         daemon=True, name='dell-warm-pool').start()
+
+    def _delete(self, resource_id):
+        try:
+            self.delete(resource_id)
+            self.waiter(resource_id).wait()
+        except lib_exc.NotFound:
+            pass
+        except Exception as e:
+            LOG.warning("Warm pool %s could not delete %s %s: %s",
+                        self.key, self.kind.replace('_', ' '),
+                        resource_id, e)
+        with self._lock:
+            self._deleting.discard(resource_id)
+
+    def close(self, executor):
+        """Stop refilling and register leftovers with *executor*.
+
+        Idle resources are added for deletion; deletions still running
+        are added as already requested, so only their wait remains.
+        """
+        with self._lock:
+            self._closed = True
+            owned, self._owned = list(self._owned), set()
+            deleting, self._deleting = list(self._deleting), set()
+            self._ready.clear()
+        for resource_id in owned:
+            executor.add(self.kind, resource_id, self.delete,
+                         waiter=self.waiter)
+        for resource_id in deleting:
+            executor.add(self.kind, resource_id, self.delete,
+                         waiter=self.waiter, requested=True)
+        LOG.info("Warm pool %s: %d lease(s), %d miss(es)",
+                 self.key, self.leased, self.missed)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, kind, create, ready, delete, waiter):
+    """Return the worker's pool for *key*, creating and filling it.
+
+    The callables are only taken from the first caller of a key, and
+    run on background threads that outlive the test, so they must not
+    depend on per-test state: build them on the ``admin_clients``
+    clients, never on the test's.  *key* is qualified with the project
+    of those clients.
+
+    :returns: The ``WarmPool``, or ``None`` when pools are disabled or
+        there are no static admin credentials.
+    """
+    size = get_size()
+    if not size or admin_clients.manager() is None:
+        return None
+    key = (admin_clients.project_id(),) + tuple(key)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            if not _pools:
+                dell_cleanup.get_sweep()
+                atexit.register(_close_pools)
+            pool = WarmPool(key, kind, create, ready, delete, waiter, size)
+            _pools[key] = pool
+    pool.fill()
+    return pool
+
+
+def _close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    executor = dell_cleanup.CleanupExecutor(deferred=False)
+    for pool in pools:
+        pool.close(executor)
+    if executor.entries:
+        dell_cleanup.get_sweep().defer(executor.levels())
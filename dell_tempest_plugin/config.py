@@ -16,7 +16,51 @@
 from oslo_config import cfg
 
 dell_driver_opts = [
-    cfg.StrOpt('driver', default='all', help='Active Dell driver to test')
+    cfg.StrOpt('driver', default='all', help='Active Dell driver to test'),
+    cfg.IntOpt('test_budget', default=None,
+               help='Wall-clock seconds shared by all waits, cleanups and '
+                    'backend REST calls of a single test; 0 disables. '
+                    'Defaults to 3 times the larger of [volume] and '
+                    '[share] build_timeout (900 with the tempest '
+                    'defaults), so a test can chain at most a few full '
+                    'waits before the rest fail fast'),
+    cfg.IntOpt('class_budget', default=0,
+               help='Wall-clock seconds shared by all tests of a test '
+                    'class; 0 disables'),
+    cfg.FloatOpt('get_coalesce_window', default=0.5,
+                 help='Seconds a completed GET issued by a waiter is reused '
+                      'by other waiters of the same resource; 0 only '
+                      'merges requests in flight at the same time'),
+    cfg.IntOpt('waiter_workers', default=8,
+               help='Threads used to run client calls of concurrent '
+                    'waits started with async_waiters.wait_all'),
+    cfg.StrOpt('poll_stats_file',
+               help='JSON file the poll-efficiency record of every wait '
+                    'is written to when a worker exits; {pid} is replaced '
+                    'by the worker process id'),
+    cfg.BoolOpt('deferred_cleanup', default=False,
+                help='Only request deletion of the resources a test '
+                     'created and confirm it in one sweep when the worker '
+                     'exits, instead of waiting in each test cleanup'),
+    cfg.StrOpt('deferred_cleanup_dir',
+               help='Directory each worker writes its deferred cleanup '
+                    'leftovers to, for dell-tempest-deferred-report'),
+    cfg.IntOpt('warm_pool_size', default=0,
+               help='Available volumes/shares each warm pool keeps '
+                    'pre-created in the background per type, size and '
+                    'protocol; 0 disables the pools'),
+    cfg.BoolOpt('keep_warm', default=False,
+                help='Keep the shared volume, share and QoS types across '
+                     'runs: name them after their specs, record them in '
+                     'keep_warm_state_file and reuse them on the next run '
+                     'instead of deleting them'),
+    cfg.StrOpt('keep_warm_state_file',
+               default='~/.dell-tempest-keep-warm.json',
+               help='State file listing the fixtures kept by keep_warm'),
+    cfg.BoolOpt('leak_check', default=False,
+                help='Inventory the PowerStore array when each PowerStore '
+                     'test class is set up and torn down, and warn about '
+                     'plugin-owned objects the class left behind'),
 ]
 
 CONF = cfg.CONF
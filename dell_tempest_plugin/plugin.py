@@ -3,6 +3,7 @@ import logging
 from oslo_config import cfg
 from tempest.test_discover import plugins
 from dell_tempest_plugin import config
+from dell_tempest_plugin.common import manila_clients
 
 # Define plugin-specific config options
 volume_opts = [
@@ -46,7 +47,7 @@ class DellTempestPlugin(plugins.TempestPlugin):
                 'module_path': 'dell_tempest_plugin.services.failover_client',
                 'client_names': ['DellFailoverClient'],
             }
-        ]
+        ] + manila_clients.service_clients()
 
 
     def get_tests_dirs(self):
@@ -70,7 +71,8 @@ class DellTempestPlugin(plugins.TempestPlugin):
             return [tests_root]
         for entry in sorted(os.listdir(tests_root)):
             sub = os.path.join(tests_root, entry)
-            if os.path.isdir(sub) and not entry.startswith(('__', '.', 'base')):
+            if os.path.isdir(sub) and \
+                    not entry.startswith(('__', '.', 'base', 'unit')):
                 dirs.append(sub)
         return dirs if dirs else [tests_root]
 
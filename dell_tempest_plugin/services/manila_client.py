@@ -0,0 +1,168 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Manila service clients registered by ``DellTempestPlugin``.
+
+The clients extend ``manila_tempest_tests``' ``SharesV2Client``; tests
+get them from their manager through ``common.manila_clients`` rather
+than building them.  What every Manila test module used to work out on
+each class setup is resolved once per process and cached here:
+
+  - the catalog type of the share service: a configured ``share`` (or
+    none) is looked up in the Keystone catalog, where the service may be
+    registered as ``shared-file-system`` or ``share``
+  - the highest microversion the share service supports, which
+    ``QosTypesClient`` checks before its first QoS type request
+"""
+
+import json
+import threading
+
+from oslo_log import log as logging
+from tempest import config
+from tempest.lib import exceptions as lib_exc
+
+from manila_tempest_tests.services.share.v2.json import shares_client
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+CATALOG_TYPES = ('shared-file-system', 'share')
+DEFAULT_CATALOG_TYPE = 'shared-file-system'
+
+# Minimum Manila API microversion that supports QoS types
+QOS_TYPE_MIN_API_VERSION = '2.94'
+
+_catalog_types = {}
+_microversion = []
+_lock = threading.Lock()
+
+
+class UnsupportedMicroversion(lib_exc.TempestException):
+    message = ("Manila API microversion %(required)s is required; the share "
+               "service supports up to %(supported)s")
+
+
+def _version_tuple(version):
+    major, minor = str(version).split('.')
+    return int(major), int(minor)
+
+
+def resolve_catalog_type(auth_provider, configured=None):
+    """Return the catalog type of the share service, scanning once.
+
+    :param auth_provider: Used to read the Keystone catalog when
+        *configured* is not a definite type.
+    :param configured: ``[share] catalog_type``.
+    """
+    if configured and configured != 'share':
+        return configured
+    with _lock:
+        if configured not in _catalog_types:
+            catalog_type = None
+            try:
+                catalog = auth_provider.get_auth()[1].get('catalog', [])
+                for entry in catalog:
+                    if entry.get('type') in CATALOG_TYPES:
+                        catalog_type = entry['type']
+                        break
+            except Exception as e:
+                LOG.debug("Cannot read the service catalog: %s", e)
+            _catalog_types[configured] = (catalog_type or configured or
+                                          DEFAULT_CATALOG_TYPE)
+            LOG.debug("Share service catalog type: %s",
+                      _catalog_types[configured])
+        return _catalog_types[configured]
+
+
+def resolve_microversion(client):
+    """Return the highest microversion of the share service, asking once.
+
+    Falls back to ``[share] max_api_microversion`` when the version
+    document cannot be read.
+    """
+    with _lock:
+        if not _microversion:
+            version = CONF.share.max_api_microversion
+            try:
+                body = client.send_microversion_request(script_name='v2')[1]
+                version = body['version']['version'] or version
+            except Exception as e:
+                LOG.debug("Cannot read the share API version document, "
+                          "assuming %s: %s", version, e)
+            _microversion.append(version)
+            LOG.debug("Share service supports microversions up to %s",
+                      version)
+        return _microversion[0]
+
+
+class SharesV2Client(shares_client.SharesV2Client):
+    """Manila shares client on the catalog type resolved for the process.
+
+    Accepts the parameters of ``service_client_config('share')``.
+    """
+
+    def __init__(self, auth_provider, service=None, **kwargs):
+        service = resolve_catalog_type(auth_provider, service)
+        super(SharesV2Client, self).__init__(auth_provider, service=service,
+                                             **kwargs)
+
+
+class ShareTypesClient(SharesV2Client):
+    """Share type and extra spec calls, kept apart from share calls."""
+
+
+class QosTypesClient(SharesV2Client):
+    """Raw QoS type calls, which need microversion 2.94 or later.
+
+    Replies are returned as ``(resp, body)`` with *body* decoded.
+    """
+
+    microversion = QOS_TYPE_MIN_API_VERSION
+
+    def _check_microversion(self):
+        supported = resolve_microversion(self)
+        if _version_tuple(supported) < _version_tuple(self.microversion):
+            raise UnsupportedMicroversion(required=self.microversion,
+                                          supported=supported)
+
+    def _request(self, method, url, body=None):
+        self._check_microversion()
+        if method == 'POST':
+            resp, resp_body = self.post(url, json.dumps(body),
+                                        version=self.microversion)
+        elif method == 'GET':
+            resp, resp_body = self.get(url, version=self.microversion)
+        elif method == 'DELETE':
+            resp, resp_body = self.delete(url, version=self.microversion)
+        else:
+            raise ValueError("Unsupported method: %s" % method)
+        return resp, json.loads(resp_body) if resp_body else {}
+
+    def qos_type_request(self, method, url_suffix='', body=None):
+        """Send a request to ``qos-types[/<url_suffix>]``."""
+        url = 'qos-types'
+        if url_suffix:
+            url = '%s/%s' % (url, url_suffix)
+        return self._request(method, url, body=body)
+
+    def qos_type_specs_request(self, method, qos_type_id, key=None,
+                               body=None):
+        """Send a request to ``qos-types/<id>/specs[/<key>]``."""
+        url = 'qos-types/%s/specs' % qos_type_id
+        if key:
+            url = '%s/%s' % (url, key)
+        return self._request(method, url, body=body)
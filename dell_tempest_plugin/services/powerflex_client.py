@@ -0,0 +1,270 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Pooled PowerFlex gateway client for vTree verification.
+
+The vTree tests could only infer the driver's clone bookkeeping from
+Cinder's ``source_volid``.  A ``PowerFlexRestClient`` asks the gateway
+directly, the way the driver's ``query_vtree_volumes`` does:
+
+  - one keep-alive ``requests.Session`` per gateway, with an
+    ``HTTPAdapter`` pool sized for ``[dell_driver] waiter_workers``
+    concurrent requests
+  - ``/api/login`` is called once; the token it returns is sent as the
+    basic auth password of every later request, and a 401 logs in
+    again and retries once
+
+``from_cinder_conf`` returns the worker's client for the PowerFlex
+backend of ``cinder.conf``, or ``None`` when there is none::
+
+    client = powerflex_client.from_cinder_conf()
+    if client is not None:
+        vol_id = client.find_volume_id(cinder_volume['id'])
+        children = client.count_direct_children(vol_id)
+
+Volumes are found by the name the Cinder driver gives them (the
+base64 encoded Cinder ID, see ``volume_name``).  Accessors return
+``None`` when the object does not exist and raise
+``PowerFlexRestError`` on any other unexpected reply.
+"""
+
+import atexit
+import base64
+import binascii
+import threading
+
+from oslo_log import log as logging
+import requests
+from requests import adapters
+from tempest.lib import exceptions as lib_exc
+
+from dell_tempest_plugin.common import async_waiters
+from dell_tempest_plugin.common import backend_config as dell_backends
+from dell_tempest_plugin.common import budget as dell_budget
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PORT = 443
+
+
+class PowerFlexRestError(lib_exc.TempestException):
+    message = "PowerFlex %(method)s %(path)s returned %(status)s: %(body)s"
+
+
+def volume_name(cinder_volume_id):
+    """Return the PowerFlex name the Cinder driver gives a volume.
+
+    PowerFlex names are limited to 31 characters, so the driver uses
+    the base64 encoding of the 16 bytes of the Cinder UUID.
+    """
+    name = str(cinder_volume_id).replace('-', '')
+    try:
+        name = base64.b16decode(name.upper())
+    except (TypeError, binascii.Error):
+        name = name.encode('utf-8')
+    return base64.b64encode(name).decode('ascii')
+
+
+class PowerFlexRestClient(object):
+    """Token-based access to the REST API of one PowerFlex gateway.
+
+    :param host: Gateway address.
+    :param user: Gateway user.
+    :param password: Gateway password.
+    :param port: Gateway HTTPS port.
+    :param pool_size: Connections kept open; defaults to
+        ``waiter_workers``.
+    """
+
+    def __init__(self, host, user, password, port=DEFAULT_PORT,
+                 pool_size=None):
+        self.host = host
+        self.base_url = 'https://%s:%s' % (host, port)
+        self._user = user
+        self._password = password
+        self._token = None
+        self._lock = threading.Lock()
+        size = pool_size or async_waiters.get_workers()
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.mount('https://', adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=size))
+
+    def _login(self, stale_token=None):
+        """Fetch a token unless another thread already renewed it.
+
+        :param stale_token: Token a request was rejected with; only that
+            token is replaced, so concurrent 401s log in once.
+        """
+        with self._lock:
+            if self._token is not None and self._token != stale_token:
+                return self._token
+            resp = self.session.get(
+                self.base_url + '/api/login',
+                auth=(self._user, self._password),
+                timeout=dell_budget.rest_timeout())
+            if resp.status_code != 200:
+                raise PowerFlexRestError(method='GET', path='/api/login',
+                                         status=resp.status_code,
+                                         body=resp.text)
+            self._token = resp.json()
+            LOG.debug("Logged in to PowerFlex gateway %s", self.host)
+            return self._token
+
+    def request(self, method, path, payload=None):
+        """Send one request and return the ``requests.Response``.
+
+        :param path: Absolute API path, e.g. ``/api/instances/...``.
+        :param payload: JSON body; ignored for ``GET``.
+        """
+        token = self._token or self._login()
+        kwargs = {'timeout': dell_budget.rest_timeout()}
+        if payload is not None and method != 'GET':
+            kwargs['json'] = payload
+        resp = self.session.request(method, self.base_url + path,
+                                    auth=(self._user, token), **kwargs)
+        if resp.status_code == 401:
+            LOG.debug("PowerFlex gateway %s token expired; renewing",
+                      self.host)
+            token = self._login(stale_token=token)
+            resp = self.session.request(method, self.base_url + path,
+                                        auth=(self._user, token), **kwargs)
+        return resp
+
+    def _json(self, method, path, payload=None):
+        """Return the decoded reply, or ``None`` if the object is unknown.
+
+        The gateway reports unknown objects with a 404, or with a 500
+        whose message says the object was not found.
+        """
+        resp = self.request(method, path, payload=payload)
+        if resp.status_code == 200:
+            return resp.json()
+        if (resp.status_code == 404 or
+                (resp.status_code == 500 and
+                 'not found' in resp.text.lower())):
+            return None
+        raise PowerFlexRestError(method=method, path=path,
+                                 status=resp.status_code, body=resp.text)
+
+    # ------------------------------------------------------------------
+    # Volumes
+    # ------------------------------------------------------------------
+    def get_volume_id(self, name):
+        """Return the ID of the PowerFlex volume named *name*, or None."""
+        return self._json(
+            'POST', '/api/types/Volume/instances/action/queryIdByKey',
+            {'name': name})
+
+    def find_volume_id(self, cinder_volume_id):
+        """Return the PowerFlex ID of a Cinder volume, or ``None``."""
+        return self.get_volume_id(volume_name(cinder_volume_id))
+
+    def get_volume(self, volume_id):
+        return self._json('GET', '/api/instances/Volume::%s' % volume_id)
+
+    def get_volume_statistics(self, volume_id):
+        return self._json(
+            'GET', '/api/instances/Volume::%s/relationships/Statistics'
+            % volume_id)
+
+    # ------------------------------------------------------------------
+    # vTrees
+    # ------------------------------------------------------------------
+    def get_vtree(self, vtree_id):
+        return self._json('GET', '/api/instances/VTree::%s' % vtree_id)
+
+    def list_vtree_volumes(self, vtree_id):
+        """Return every volume of a vTree (the driver's query)."""
+        return self._json(
+            'GET', '/api/instances/VTree::%s/relationships/Volume'
+            % vtree_id) or []
+
+    def get_vtree_statistics(self, vtree_id):
+        """Return the vTree statistics (``numOfVolumes`` and so on)."""
+        return self._json(
+            'GET', '/api/instances/VTree::%s/relationships/Statistics'
+            % vtree_id)
+
+    def list_direct_children(self, volume_id):
+        """Return the volumes whose ``ancestorVolumeId`` is *volume_id*.
+
+        :raises: PowerFlexRestError if the volume does not exist.
+        """
+        volume = self.get_volume(volume_id)
+        if volume is None:
+            raise PowerFlexRestError(method='GET', status=404, body='',
+                                     path='/api/instances/Volume::%s'
+                                     % volume_id)
+        return [vol for vol in self.list_vtree_volumes(volume['vtreeId'])
+                if vol.get('ancestorVolumeId') == volume_id]
+
+    def count_direct_children(self, volume_id):
+        return len(self.list_direct_children(volume_id))
+
+    def close(self):
+        """Log out of the gateway and close the pooled connections."""
+        with self._lock:
+            if self._token is not None:
+                try:
+                    self.session.get(self.base_url + '/api/logout',
+                                     auth=(self._user, self._token),
+                                     timeout=dell_budget.rest_timeout())
+                except requests.RequestException:
+                    pass
+                self._token = None
+            self.session.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(host, user, password, port=DEFAULT_PORT):
+    """Return the worker's client for a gateway, creating it on first use."""
+    key = (host, port, user, password)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if not _clients:
+                atexit.register(_close_clients)
+            client = PowerFlexRestClient(host, user, password, port=port)
+            _clients[key] = client
+    return client
+
+
+def from_cinder_conf(backend_name=None, path=dell_backends.CINDER_CONF):
+    """Return the client of a PowerFlex backend in ``cinder.conf``.
+
+    :param backend_name: ``volume_backend_name`` (or section name) to
+        prefer; any PowerFlex backend is used when it is not found.
+    :returns: The client, or ``None`` when no PowerFlex backend is
+        configured.
+    """
+    backend = dell_backends.get_index(path).find(
+        'powerflex', names=[backend_name] if backend_name else None)
+    if backend is None:
+        return None
+    return get_client(backend.host, backend.user, backend.password,
+                      port=backend.port or DEFAULT_PORT)
+
+
+def _close_clients():
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
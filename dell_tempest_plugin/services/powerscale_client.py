@@ -0,0 +1,316 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Pooled PowerScale (OneFS) platform API client for backend verification.
+
+The PowerScale suites only exercised Manila; what the driver did on the
+cluster (quota thresholds, snapshots, jobs, exports, SmartQoS
+workloads) could not be checked.  A ``PowerScaleRestClient`` gives the
+tests direct, cheap access to the OneFS platform API:
+
+  - one keep-alive ``requests.Session`` per cluster, with an
+    ``HTTPAdapter`` pool sized for ``[dell_driver] waiter_workers``
+    concurrent requests
+  - OneFS session auth: the credentials are posted once to
+    ``/session/1/session``; later requests reuse the ``isisessid``
+    cookie and send the ``isicsrf`` cookie back as ``X-CSRF-Token``, and
+    a 401 logs in again and retries once
+  - clusters that refuse a session fall back to basic auth
+
+``from_manila_conf`` returns the worker's client for the PowerScale
+backend of ``manila.conf``, or ``None`` when there is none, so backend
+checks are skipped rather than failed on clouds without one::
+
+    client = powerscale_client.from_manila_conf()
+    if client is not None:
+        quota = client.get_quota(path)
+
+The typed accessors unwrap the OneFS collection (``quotas``,
+``snapshots``, ...), return ``None`` when the object does not exist and
+raise ``PowerScaleRestError`` on any other unexpected reply.
+"""
+
+import atexit
+import threading
+
+from oslo_log import log as logging
+import requests
+from requests import adapters
+from tempest.lib import exceptions as lib_exc
+
+from dell_tempest_plugin.common import async_waiters
+from dell_tempest_plugin.common import backend_config as dell_backends
+from dell_tempest_plugin.common import budget as dell_budget
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8080
+
+SESSION_PATH = '/session/1/session'
+CSRF_COOKIE = 'isicsrf'
+CSRF_HEADER = 'X-CSRF-Token'
+
+QUOTAS = '/platform/1/quota/quotas'
+SNAPSHOTS = '/platform/1/snapshot/snapshots'
+SNAPSHOT_ALIASES = '/platform/1/snapshot/aliases'
+JOBS = '/platform/12/job/jobs'
+NFS_EXPORTS = '/platform/1/protocols/nfs/exports'
+NFS_ALIASES = '/platform/2/protocols/nfs/aliases'
+SMB_SHARES = '/platform/1/protocols/smb/shares'
+DEDUPE_SETTINGS = '/platform/1/dedupe/settings'
+DATASETS = '/platform/19/performance/datasets'
+
+
+class PowerScaleRestError(lib_exc.TempestException):
+    message = "PowerScale %(method)s %(path)s returned %(status)s: %(body)s"
+
+
+class PowerScaleRestClient(object):
+    """Session-based access to the platform API of one OneFS cluster.
+
+    :param host: Cluster management address.
+    :param user: API user.
+    :param password: API password.
+    :param port: Platform API port.
+    :param pool_size: Connections kept open; defaults to
+        ``waiter_workers``.
+    """
+
+    def __init__(self, host, user, password, port=DEFAULT_PORT,
+                 pool_size=None):
+        self.host = host
+        self.base_url = 'https://%s:%s' % (host, port)
+        self._auth = (user, password)
+        self._lock = threading.Lock()
+        self._logged_in = False
+        size = pool_size or async_waiters.get_workers()
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.headers['Referer'] = self.base_url
+        self.session.mount('https://', adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=size))
+
+    def _login(self, stale_token=None):
+        """Open a OneFS session unless another thread already renewed it.
+
+        :param stale_token: CSRF token a request was rejected with; only
+            that token is replaced, so concurrent 401s log in once.
+        """
+        with self._lock:
+            token = self.session.headers.get(CSRF_HEADER)
+            if self._logged_in and token != stale_token:
+                return
+            self.session.headers.pop(CSRF_HEADER, None)
+            self.session.cookies.clear()
+            self.session.auth = None
+            try:
+                resp = self.session.post(
+                    self.base_url + SESSION_PATH,
+                    json={'username': self._auth[0],
+                          'password': self._auth[1],
+                          'services': ['platform', 'namespace']},
+                    timeout=dell_budget.rest_timeout())
+                token = self.session.cookies.get(CSRF_COOKIE)
+            except requests.RequestException as e:
+                LOG.debug("PowerScale %s session login failed: %s",
+                          self.host, e)
+                resp = token = None
+            if resp is not None and resp.status_code == 201 and token:
+                self.session.headers[CSRF_HEADER] = token
+                LOG.debug("Opened PowerScale session on %s", self.host)
+            else:
+                self.session.auth = self._auth
+                LOG.debug("PowerScale %s refused a session; using basic "
+                          "auth", self.host)
+            self._logged_in = True
+
+    def request(self, method, path, payload=None, params=None):
+        """Send one request and return the ``requests.Response``.
+
+        :param path: Absolute API path, e.g. ``/platform/1/quota/quotas``.
+        :param payload: JSON body; ignored for ``GET``.
+        :param params: Query parameters.
+        """
+        if not self._logged_in:
+            self._login()
+        kwargs = {'params': params, 'timeout': dell_budget.rest_timeout()}
+        if payload is not None and method != 'GET':
+            kwargs['json'] = payload
+        token = self.session.headers.get(CSRF_HEADER)
+        resp = self.session.request(method, self.base_url + path, **kwargs)
+        if resp.status_code == 401 and token:
+            LOG.debug("PowerScale %s session expired; renewing", self.host)
+            self._login(stale_token=token)
+            resp = self.session.request(method, self.base_url + path,
+                                        **kwargs)
+        return resp
+
+    def _json(self, method, path, params=None, payload=None,
+              expected=(200,)):
+        """Return the decoded reply, or ``None`` on 404."""
+        resp = self.request(method, path, payload=payload, params=params)
+        if resp.status_code == 404:
+            return None
+        if resp.status_code not in expected:
+            raise PowerScaleRestError(method=method, path=path,
+                                      status=resp.status_code,
+                                      body=resp.text)
+        return resp.json() if resp.content else {}
+
+    def _collection(self, path, key, params=None):
+        """Return the *key* list of a collection, following ``resume``."""
+        items = []
+        body = self._json('GET', path, params=params)
+        while body:
+            items.extend(body.get(key) or [])
+            if not body.get('resume'):
+                break
+            body = self._json('GET', path, params={'resume': body['resume']})
+        return items
+
+    def _one(self, path, key):
+        """Return the single object of an item URL, or ``None``."""
+        body = self._json('GET', path)
+        found = (body or {}).get(key) or []
+        return found[0] if found else None
+
+    # ------------------------------------------------------------------
+    # Quotas
+    # ------------------------------------------------------------------
+    def list_quotas(self, path=None):
+        return self._collection(QUOTAS, 'quotas',
+                                params={'path': path} if path else None)
+
+    def get_quota(self, path):
+        """Return the directory quota of *path*, or ``None``."""
+        for quota in self.list_quotas(path=path):
+            if quota.get('type', 'directory') == 'directory':
+                return quota
+        return None
+
+    # ------------------------------------------------------------------
+    # Snapshots and snapshot aliases
+    # ------------------------------------------------------------------
+    def get_snapshot(self, snapshot_id):
+        """Return a snapshot by ID or name, or ``None``."""
+        return self._one('%s/%s' % (SNAPSHOTS, snapshot_id), 'snapshots')
+
+    def list_snapshots(self, path=None):
+        snapshots = self._collection(SNAPSHOTS, 'snapshots')
+        if path is None:
+            return snapshots
+        return [snap for snap in snapshots if snap.get('path') == path]
+
+    def list_snapshot_aliases(self):
+        return self._collection(SNAPSHOT_ALIASES, 'aliases')
+
+    def get_snapshot_alias(self, name):
+        return self._one('%s/%s' % (SNAPSHOT_ALIASES, name), 'aliases')
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+    def get_job(self, job_id):
+        return self._one('%s/%s' % (JOBS, job_id), 'jobs')
+
+    def list_jobs(self, state=None):
+        return self._collection(JOBS, 'jobs',
+                                params={'state': state} if state else None)
+
+    # ------------------------------------------------------------------
+    # NFS exports, NFS aliases and SMB shares
+    # ------------------------------------------------------------------
+    def list_nfs_exports(self, path=None):
+        return self._collection(NFS_EXPORTS, 'exports',
+                                params={'path': path} if path else None)
+
+    def get_nfs_export(self, export_id):
+        return self._one('%s/%s' % (NFS_EXPORTS, export_id), 'exports')
+
+    def list_nfs_aliases(self):
+        return self._collection(NFS_ALIASES, 'aliases')
+
+    def get_smb_share(self, name):
+        return self._one('%s/%s' % (SMB_SHARES, name), 'shares')
+
+    # ------------------------------------------------------------------
+    # Deduplication and SmartQoS
+    # ------------------------------------------------------------------
+    def get_dedupe_settings(self):
+        return (self._json('GET', DEDUPE_SETTINGS) or {}).get('settings')
+
+    def list_datasets(self):
+        return self._collection(DATASETS, 'datasets')
+
+    def find_dataset(self, name):
+        for dataset in self.list_datasets():
+            if dataset.get('name') == name:
+                return dataset
+        return None
+
+    def list_workloads(self, dataset_id):
+        return self._collection('%s/%s/workloads' % (DATASETS, dataset_id),
+                                'workloads')
+
+    def close(self):
+        """End the OneFS session and close the pooled connections."""
+        with self._lock:
+            if self.session.headers.get(CSRF_HEADER):
+                try:
+                    self.session.delete(self.base_url + SESSION_PATH,
+                                        timeout=dell_budget.rest_timeout())
+                except requests.RequestException:
+                    pass
+            self.session.close()
+            self._logged_in = False
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(host, user, password, port=DEFAULT_PORT):
+    """Return the worker's client for a cluster, creating it on first use."""
+    key = (host, port, user, password)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if not _clients:
+                atexit.register(_close_clients)
+            client = PowerScaleRestClient(host, user, password, port=port)
+            _clients[key] = client
+    return client
+
+
+def from_manila_conf(path=dell_backends.MANILA_CONF):
+    """Return the client of the PowerScale backend in ``manila.conf``.
+
+    :returns: The client, or ``None`` when no PowerScale backend is
+        configured.
+    """
+    backend = dell_backends.get_index(path).find('powerscale')
+    if backend is None:
+        return None
+    return get_client(backend.host, backend.user, backend.password,
+                      port=backend.port or DEFAULT_PORT)
+
+
+def _close_clients():
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -0,0 +1,324 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Pooled PowerStore REST client shared by every test of a worker.
+
+The PowerStore tests used to talk to the array with one-shot
+``requests.get``/``requests.post`` calls: every call opened a new TLS
+connection and sent basic auth again, which the array answers by
+creating (and later expiring) a login session each time.
+
+A ``PowerStoreRestClient`` keeps one ``requests.Session`` per array:
+
+  - connections are kept alive in an ``HTTPAdapter`` pool sized for
+    ``[dell_driver] waiter_workers`` concurrent requests, so the bulk and
+    fixture helpers can share it from their thread pools
+  - basic auth is sent once, to ``/login_session``; later requests reuse
+    the session cookie and send back the ``DELL-EMC-TOKEN`` CSRF token
+    the array returned, and a 401/403 logs in again and retries once
+  - arrays that refuse the login session fall back to basic auth on
+    every request
+
+``get_client`` returns the worker's instance for an array::
+
+    client = powerstore_client.get_client(ip, user, password)
+    vol = client.find_volume('volume-%s' % vol_id, select='id,name')
+
+``request`` returns the raw ``requests.Response`` for callers that check
+status codes themselves.  The typed helpers return decoded JSON, return
+``None`` (``get_*``, ``find_*``) or ``False`` (``delete_*``) when the
+object does not exist, and raise ``PowerStoreRestError`` otherwise.
+"""
+
+import atexit
+import threading
+
+from oslo_log import log as logging
+import requests
+from requests import adapters
+from tempest.lib import exceptions as lib_exc
+
+from dell_tempest_plugin.common import async_waiters
+from dell_tempest_plugin.common import budget as dell_budget
+
+LOG = logging.getLogger(__name__)
+
+TOKEN_HEADER = 'DELL-EMC-TOKEN'
+
+PAGE_SIZE = 2000
+
+
+class PowerStoreRestError(lib_exc.TempestException):
+    message = "PowerStore %(method)s %(path)s returned %(status)s: %(body)s"
+
+
+def _eq(value):
+    return 'eq.%s' % value
+
+
+class PowerStoreRestClient(object):
+    """Session-based access to the REST API of one PowerStore array.
+
+    :param host: Management address of the array.
+    :param user: REST user.
+    :param password: REST password.
+    :param pool_size: Connections kept open; defaults to
+        ``waiter_workers``.
+    """
+
+    def __init__(self, host, user, password, pool_size=None):
+        self.host = host
+        self.base_url = 'https://%s/api/rest' % host
+        self._auth = (user, password)
+        self._lock = threading.Lock()
+        self._logged_in = False
+        size = pool_size or async_waiters.get_workers()
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.mount('https://', adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=size))
+
+    def _login(self, stale_token=None):
+        """Open a login session unless another thread already renewed it.
+
+        :param stale_token: Token a request was rejected with; only that
+            token is replaced, so concurrent 401s log in once.
+        """
+        with self._lock:
+            token = self.session.headers.get(TOKEN_HEADER)
+            if self._logged_in and token != stale_token:
+                return
+            self.session.headers.pop(TOKEN_HEADER, None)
+            self.session.cookies.clear()
+            self.session.auth = self._auth
+            try:
+                resp = self.session.get(
+                    self.base_url + '/login_session',
+                    timeout=dell_budget.rest_timeout())
+                token = resp.headers.get(TOKEN_HEADER)
+            except requests.RequestException as e:
+                LOG.debug("PowerStore %s login session failed: %s",
+                          self.host, e)
+                resp = token = None
+            if resp is not None and resp.status_code == 200 and token:
+                self.session.headers[TOKEN_HEADER] = token
+                self.session.auth = None
+                LOG.debug("Opened PowerStore login session on %s",
+                          self.host)
+            else:
+                LOG.debug("PowerStore %s refused a login session; using "
+                          "basic auth", self.host)
+            self._logged_in = True
+
+    def request(self, method, path, payload=None, params=None):
+        """Send one request and return the ``requests.Response``.
+
+        :param path: Path below ``/api/rest``, e.g. ``/volume/<id>``.
+        :param payload: JSON body; ignored for ``GET``.
+        :param params: Query parameters.
+        """
+        if not self._logged_in:
+            self._login()
+        kwargs = {'params': params, 'timeout': dell_budget.rest_timeout()}
+        if payload is not None and method != 'GET':
+            kwargs['json'] = payload
+        token = self.session.headers.get(TOKEN_HEADER)
+        resp = self.session.request(method, self.base_url + path, **kwargs)
+        if resp.status_code in (401, 403) and token:
+            LOG.debug("PowerStore %s login session expired; renewing",
+                      self.host)
+            self._login(stale_token=token)
+            resp = self.session.request(method, self.base_url + path,
+                                        **kwargs)
+        return resp
+
+    def _json(self, method, path, expected, payload=None, params=None,
+              missing=None):
+        resp = self.request(method, path, payload=payload, params=params)
+        if resp.status_code == 404 and missing is not None:
+            return missing
+        if resp.status_code not in expected:
+            raise PowerStoreRestError(method=method, path=path,
+                                      status=resp.status_code,
+                                      body=resp.text)
+        if resp.status_code == 204 or not resp.content:
+            return None
+        return resp.json()
+
+    # ------------------------------------------------------------------
+    # Generic helpers
+    # ------------------------------------------------------------------
+    def list(self, kind, filters=None, select=None, params=None):
+        """Return the first page of *kind* objects matching *filters*.
+
+        :param filters: ``{column: value}``, each compared with ``eq.``.
+        :param select: Columns to return, e.g. ``'id,name'``.
+        :param params: Further query parameters, passed as they are.
+        """
+        params = dict(params or {})
+        for column, value in (filters or {}).items():
+            params[column] = _eq(value)
+        if select:
+            params['select'] = select
+        return self._json('GET', '/' + kind, (200, 206), params=params)
+
+    def list_all(self, kind, params=None, page=PAGE_SIZE):
+        """Yield every *kind* object, following ``limit``/``offset``."""
+        offset = 0
+        while True:
+            batch = self._json('GET', '/' + kind, (200, 206),
+                               params=dict(params or {}, limit=page,
+                                           offset=offset))
+            for item in batch:
+                yield item
+            if len(batch) < page:
+                return
+            offset += len(batch)
+
+    def get(self, kind, obj_id, select=None):
+        """Return one object, or ``None`` when it does not exist."""
+        return self._json('GET', '/%s/%s' % (kind, obj_id), (200,),
+                          params={'select': select} if select else None,
+                          missing=False) or None
+
+    def find(self, kind, name, select=None, **filters):
+        """Return the first object named *name*, or ``None``."""
+        found = self.list(kind, dict(filters, name=name), select=select)
+        return found[0] if found else None
+
+    def create(self, kind, payload):
+        """Create an object and return the array's reply (its ``id``)."""
+        return self._json('POST', '/' + kind, (200, 201), payload=payload)
+
+    def modify(self, kind, obj_id, payload):
+        """Modify an object; returns ``False`` when it does not exist."""
+        return self._json('PATCH', '/%s/%s' % (kind, obj_id), (200, 204),
+                          payload=payload, missing=False) is not False
+
+    def delete(self, kind, obj_id, payload=None):
+        """Delete an object; returns ``False`` when it was already gone."""
+        return self._json('DELETE', '/%s/%s' % (kind, obj_id), (200, 204),
+                          payload=payload, missing=False) is not False
+
+    # ------------------------------------------------------------------
+    # Volumes and volume snapshots
+    # ------------------------------------------------------------------
+    def get_volume(self, volume_id, select=None):
+        return self.get('volume', volume_id, select=select)
+
+    def find_volume(self, name, select=None):
+        return self.find('volume', name, select=select)
+
+    def list_snapshots(self, parent_id, select=None):
+        """Return the snapshots of the volume *parent_id*."""
+        return self.list('volume', {
+            'type': 'Snapshot',
+            'protection_data->>parent_id': parent_id}, select=select)
+
+    def find_snapshot(self, name, parent_id, select=None):
+        return self.find('volume', name, select=select, type='Snapshot',
+                         **{'protection_data->>parent_id': parent_id})
+
+    # ------------------------------------------------------------------
+    # File systems and NAS servers
+    # ------------------------------------------------------------------
+    def get_file_system(self, fs_id, select=None):
+        return self.get('file_system', fs_id, select=select)
+
+    def find_file_system(self, name, select=None):
+        return self.find('file_system', name, select=select)
+
+    def create_file_system(self, name, size, nas_server_id, **extra):
+        """Create a file system of *size* bytes; returns its ``id``."""
+        payload = dict(extra, name=name, size_total=size,
+                       nas_server_id=nas_server_id)
+        return self.create('file_system', payload)['id']
+
+    def delete_file_system(self, fs_id):
+        return self.delete('file_system', fs_id)
+
+    def find_file_system_snapshot(self, name, select=None):
+        return self.find('file_system_snapshot', name, select=select)
+
+    def get_nas_server(self, nas_server_id, select=None):
+        return self.get('nas_server', nas_server_id, select=select)
+
+    def find_nas_server(self, name, select=None):
+        return self.find('nas_server', name, select=select)
+
+    # ------------------------------------------------------------------
+    # Replication, hosts and policies
+    # ------------------------------------------------------------------
+    def get_replication_session(self, session_id, select=None):
+        return self.get('replication_session', session_id, select=select)
+
+    def find_host(self, name, select=None):
+        return self.find('host', name, select=select)
+
+    def list_hosts(self, filters=None, select=None):
+        return self.list('host', filters, select=select)
+
+    def get_policy(self, policy_id, select=None):
+        return self.get('policy', policy_id, select=select)
+
+    def find_policy(self, name, select=None):
+        return self.find('policy', name, select=select)
+
+    def get_file_io_limit_rule(self, rule_id, select=None):
+        return self.get('file_io_limit_rule', rule_id, select=select)
+
+    def find_file_io_limit_rule(self, name, select=None):
+        return self.find('file_io_limit_rule', name, select=select)
+
+    def delete_file_io_limit_rule(self, rule_id):
+        return self.delete('file_io_limit_rule', rule_id)
+
+    def close(self):
+        """Log out and close the pooled connections."""
+        with self._lock:
+            if self.session.headers.get(TOKEN_HEADER):
+                try:
+                    self.session.post(self.base_url + '/logout',
+                                      timeout=dell_budget.rest_timeout())
+                except requests.RequestException:
+                    pass
+            self.session.close()
+            self._logged_in = False
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(host, user, password):
+    """Return the worker's client for an array, creating it on first use."""
+    key = (host, user, password)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if not _clients:
+                atexit.register(_close_clients)
+            client = PowerStoreRestClient(host, user, password)
+            _clients[key] = client
+    return client
+
+
+def _close_clients():
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -152,7 +152,10 @@ class BaseTempestTest(cinder_base.BaseVolumeTest):
 
         try:
             volume_details = self.volumes_client.show_volume(volume['id'])['volume']
-            LOG.info("Volume details after failover: %s", volume_details)
+            LOG.info("Volume %s after failover: status=%s, replication_status=%s",
+                     volume['id'], volume_details.get('status'),
+                     volume_details.get('replication_status'))
+            LOG.debug("Volume details after failover: %s", volume_details)
         except Exception as e:
             self.fail(f"Failed to fetch volume details after failover: {e}")
 
@@ -31,7 +31,7 @@ to verify:
   - Boundary conditions around the configured vtree size limit
 """
 
-import time
+import collections
 
 from oslo_log import log as logging
 from tempest.api.volume import base as volume_base
@@ -41,11 +41,21 @@ from tempest.lib.common.utils import data_utils
 from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import bulk as dell_bulk
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin.services import powerflex_client
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 VOLUME_BUILD_TIMEOUT = 300
-VOLUME_BUILD_INTERVAL = 5
+# How long class cleanup waits for a busy volume to become deletable
+CLEANUP_SETTLE_TIMEOUT = 120
+
+CLEANUP_DELETABLE = ('available', 'error', 'error_restoring',
+                     'error_extending', 'error_managing')
 
 
 class PowerFlexVtreeBaseTest(volume_base.BaseVolumeAdminTest):
@@ -82,6 +92,10 @@ class PowerFlexVtreeBaseTest(volume_base.BaseVolumeAdminTest):
         super(PowerFlexVtreeBaseTest, cls).resource_setup()
         cls._created_type_ids = []
 
+    def setUp(self):
+        super(PowerFlexVtreeBaseTest, self).setUp()
+        dell_budget.start_test_budget(self)
+
     @classmethod
     def resource_cleanup(cls):
         # Get class-level admin clients
@@ -100,27 +114,87 @@ class PowerFlexVtreeBaseTest(volume_base.BaseVolumeAdminTest):
                                   or getattr(os_admin, 'volumes_v3_client', None)
                                   or getattr(os_admin, 'volumes_client', None))
         
-        if types_client and vols_client:
-            for type_id in cls._created_type_ids:
-                try:
-                    # Delete all volumes using this volume type first
-                    volumes = vols_client.list_volumes(detail=True)['volumes']
-                    for vol in volumes:
-                        if vol['volume_type'] == type_id and vol['status'] in ('available', 'error', 'error_restoring', 'error_extending', 'error_managing'):
-                            try:
-                                vols_client.delete_volume(vol['id'])
-                                waiters.wait_for_volume_resource_status(vols_client, vol['id'], 'deleted')
-                            except (lib_exc.NotFound, lib_exc.TimeoutException):
-                                pass
-                    # Now delete the volume type
-                    types_client.delete_volume_type(type_id)
-                except lib_exc.NotFound:
-                    pass
-                except lib_exc.BadRequest as ex:
-                    LOG.warning("Skipping volume type cleanup for %s: %s",
-                                type_id, ex)
+        if types_client and vols_client and cls._created_type_ids:
+            cls._cleanup_created_types(types_client, vols_client)
         super(PowerFlexVtreeBaseTest, cls).resource_cleanup()
 
+    @classmethod
+    def _cleanup_created_types(cls, types_client, vols_client):
+        """Delete the class's volume types and every volume using them.
+
+        One detailed volume listing is indexed by volume type (ID or
+        name, depending on the microversion) instead of rescanning the
+        cloud per type. Clone trees are then deleted leaf-first by the
+        cleanup executor: each level is deleted in parallel and its
+        deletions awaited together before the parents go.
+
+        A volume in a busy status (``creating``, ``extending``, ...) is
+        given a short wait to settle; one that stays busy is left behind
+        together with its volume type, whose deletion could only fail.
+        """
+        type_ids = set(cls._created_type_ids)
+        try:
+            names = dict(
+                (t['name'], t['id']) for t in
+                types_client.list_volume_types()['volume_types']
+                if t['id'] in type_ids)
+            volumes = vols_client.list_volumes(detail=True)['volumes']
+        except lib_exc.TempestException as ex:
+            LOG.warning("Skipping vTree class cleanup: %s", ex)
+            return
+
+        by_type = collections.defaultdict(list)
+        for vol in volumes:
+            vtype = vol.get('volume_type_id') or vol.get('volume_type')
+            type_id = vtype if vtype in type_ids else names.get(vtype)
+            if type_id:
+                by_type[type_id].append(vol)
+
+        executor = dell_cleanup.CleanupExecutor()
+        for type_id in cls._created_type_ids:
+            keep_type = False
+            for vol in by_type.get(type_id, ()):
+                if vol['status'] not in CLEANUP_DELETABLE:
+                    vol = cls._settle_for_cleanup(vols_client, vol)
+                    if vol is None:
+                        continue
+                if vol['status'] not in CLEANUP_DELETABLE:
+                    LOG.warning("Skipping deletion of volume %s in status "
+                                "%s and of its volume type %s", vol['id'],
+                                vol['status'], type_id)
+                    keep_type = True
+                    continue
+                executor.add(
+                    'volume', vol['id'], vols_client.delete_volume,
+                    waiter=lambda vid: dell_waiters.deletion_waiter(
+                        vols_client.show_volume, vid, kind='volume',
+                        response_key='volume',
+                        error_states=('error_deleting',)),
+                    depends_on=[('volume', vol.get('source_volid')),
+                                ('volume_type', type_id)])
+            if not keep_type:
+                executor.add('volume_type', type_id,
+                             types_client.delete_volume_type)
+        executor.run()
+
+    @staticmethod
+    def _settle_for_cleanup(vols_client, vol):
+        """Wait briefly for a busy volume to become deletable.
+
+        :returns: The settled volume dict, the last one seen if it is
+            still busy, or ``None`` once the volume is gone.
+        """
+        try:
+            return dell_waiters.wait_for_settle(
+                vols_client.show_volume, vol['id'], kind='volume',
+                expected_states=CLEANUP_DELETABLE, response_key='volume',
+                timeout=CLEANUP_SETTLE_TIMEOUT)
+        except lib_exc.NotFound:
+            return None
+        except dell_waiters.WaitError as e:
+            LOG.warning("Volume %s did not settle: %s", vol['id'], e)
+            return vol
+
     # ------------------------------------------------------------------
     # Admin client helpers
     # ------------------------------------------------------------------
@@ -215,6 +289,73 @@ class PowerFlexVtreeBaseTest(volume_base.BaseVolumeAdminTest):
         self._wait_for_volume_status(vol['id'], 'available')
         return vols_client.show_volume(vol['id'])['volume']
 
+    def _clone_volumes(self, source_volume_ids, volume_type_name):
+        """Clone each source volume and wait for all clones together.
+
+        The create requests are submitted concurrently; the clones are
+        then awaited with a single detailed list call per poll. A source
+        ID may appear more than once to fan out several clones from it.
+        """
+        batch_tag = data_utils.rand_name('pflex-vtree-batch')
+        return dell_bulk.clone_volumes_bulk(
+            self._get_admin_volumes_client(), source_volume_ids,
+            [{'name': data_utils.rand_name('pflex-vtree-clone'),
+              'volume_type': volume_type_name,
+              'metadata': {dell_waiters.BATCH_METADATA_KEY: batch_tag}}
+             for _ in source_volume_ids],
+            register=self._register_volume,
+            wait=lambda ids: self._wait_for_volumes_status(
+                ids, 'available', batch_tag))
+
+    def _create_volumes_from_image(self, volume_type_name, image_ref,
+                                   count, size=8):
+        """Create *count* volumes from a glance image concurrently and
+        wait for them together."""
+        batch_tag = data_utils.rand_name('pflex-vtree-batch')
+        return dell_bulk.create_volumes_bulk(
+            self._get_admin_volumes_client(),
+            [{'name': data_utils.rand_name('pflex-vtree-imgvol'),
+              'size': size,
+              'volume_type': volume_type_name,
+              'imageRef': image_ref,
+              'metadata': {dell_waiters.BATCH_METADATA_KEY: batch_tag}}
+             for _ in range(count)],
+            register=self._register_volume,
+            wait=lambda ids: self._wait_for_volumes_status(
+                ids, 'available', batch_tag))
+
+    # ------------------------------------------------------------------
+    # PowerFlex backend verification
+    # ------------------------------------------------------------------
+    def _assert_direct_children(self, volume_id, expected):
+        """Check a volume's direct-child count on the PowerFlex array.
+
+        Counts the vTree volumes whose ancestorVolumeId is the volume,
+        as the driver's query_vtree_volumes does.  Skipped when no
+        PowerFlex backend is configured in cinder.conf.
+
+        :param volume_id: Cinder ID of the parent volume.
+        :param expected: Expected number of direct children.
+        """
+        client = powerflex_client.from_cinder_conf(
+            self._get_powerflex_backend_name())
+        if client is None:
+            LOG.debug("No PowerFlex backend in cinder.conf; skipping "
+                      "vTree check of %s", volume_id)
+            return
+        pflex_id = client.find_volume_id(volume_id)
+        self.assertIsNotNone(
+            pflex_id, "Volume %s not found on PowerFlex" % volume_id)
+        children = client.count_direct_children(pflex_id)
+        self.assertEqual(
+            expected, children,
+            "Volume %s (PowerFlex %s) should have %d direct child(ren) "
+            "on the array, found %d"
+            % (volume_id, pflex_id, expected, children))
+
+    def _register_volume(self, vol):
+        self.addCleanup(self._safe_delete_volume, vol['id'])
+
     def _safe_delete_volume(self, volume_id):
         """Delete a volume, ignoring 404 (already deleted)."""
         vols_client = self._get_admin_volumes_client()
@@ -237,25 +378,35 @@ class PowerFlexVtreeBaseTest(volume_base.BaseVolumeAdminTest):
 
     def _wait_for_volume_status(self, volume_id, status,
                                 timeout=VOLUME_BUILD_TIMEOUT,
-                                interval=VOLUME_BUILD_INTERVAL):
+                                interval=None):
         """Wait for a volume to reach the expected status."""
         vols_client = self._get_admin_volumes_client()
-        try:
-            waiters.wait_for_volume_resource_status(
-                vols_client, volume_id, status)
-        except Exception:
-            end = time.time() + timeout
-            while time.time() < end:
-                vol = vols_client.show_volume(volume_id)['volume']
-                if vol['status'] == status:
-                    return
-                if vol['status'] == 'error':
-                    raise lib_exc.TempestException(
-                        "Volume %s went to error state" % volume_id)
-                time.sleep(interval)
-            raise lib_exc.TimeoutException(
-                "Volume %s did not reach status '%s' within %ds"
-                % (volume_id, status, timeout))
+        dell_waiters.wait_for_status(
+            vols_client.show_volume, volume_id, status, kind='volume',
+            response_key='volume',
+            error_states=('error', 'error_restoring', 'error_extending'),
+            timeout=timeout, max_interval=interval)
+
+    def _wait_for_volumes_status(self, volume_ids, status, batch_tag=None,
+                                 timeout=VOLUME_BUILD_TIMEOUT,
+                                 interval=None):
+        """Wait for several volumes with one list call per poll.
+
+        :param batch_tag: Batch metadata value the volumes were created
+            with; used to filter the list server-side.
+        :returns: Dict mapping volume ID to its detailed volume body.
+        """
+        vols_client = self._get_admin_volumes_client()
+        params = dell_waiters.batch_params(batch_tag) if batch_tag else {}
+
+        def _list_volumes():
+            return vols_client.list_volumes(detail=True, params=params)
+
+        return dell_waiters.wait_for_all_status(
+            _list_volumes, volume_ids, status, kind='volume',
+            list_key='volumes',
+            error_states=('error', 'error_restoring', 'error_extending'),
+            timeout=timeout, max_interval=interval)
 
 
 class TestPowerFlexCloneVtree(PowerFlexVtreeBaseTest):
@@ -330,6 +481,7 @@ class TestPowerFlexCloneVtree(PowerFlexVtreeBaseTest):
         self.assertEqual(len(clone_ids), num_clones)
         self.assertEqual(len(set(clone_ids)), num_clones,
                          "Clone IDs should be unique")
+        self._assert_direct_children(source['id'], num_clones)
 
     # ------------------------------------------------------------------
     # Test: Clone chain (grandchildren not counted)
@@ -363,6 +515,10 @@ class TestPowerFlexCloneVtree(PowerFlexVtreeBaseTest):
         clone_2 = self._clone_volume(source['id'], self.vtype['name'])
         self.assertEqual(clone_2['status'], 'available')
 
+        # The grandchild counts against clone_1 only.
+        self._assert_direct_children(source['id'], 2)
+        self._assert_direct_children(clone_1['id'], 1)
+
         LOG.info("Clone chain test passed: source=%s "
                  "clone_1=%s clone_1_1=%s clone_2=%s",
                  source['id'], clone_1['id'],
@@ -397,6 +553,7 @@ class TestPowerFlexCloneVtree(PowerFlexVtreeBaseTest):
         # existed before this; new total direct children = 2.
         level_1_b = self._clone_volume(root['id'], self.vtype['name'])
         self.assertEqual(level_1_b['status'], 'available')
+        self._assert_direct_children(root['id'], 2)
 
         LOG.info("Deep chain test passed: root=%s depths=[%s, %s, %s] "
                  "root_clone_b=%s",
@@ -508,6 +665,8 @@ class TestPowerFlexCloneVtree(PowerFlexVtreeBaseTest):
         # Source should still be clonable (only 1 direct child: mid)
         source_clone = self._clone_volume(source['id'], self.vtype['name'])
         self.assertEqual(source_clone['status'], 'available')
+        self._assert_direct_children(mid['id'], 2)
+        self._assert_direct_children(source['id'], 2)
 
         LOG.info("Intermediate-node clone test passed: "
                  "source=%s mid=%s leaf=%s mid_clone=%s source_clone=%s",
@@ -580,13 +739,15 @@ class TestPowerFlexImageCacheVtree(PowerFlexVtreeBaseTest):
         If image cache is disabled, all 3 are independent volumes and
         the vtree limit path is not exercised (still a valid test).
         """
-        volumes = []
         num_volumes = 3
-        for i in range(num_volumes):
-            vol = self._create_volume_from_image(
-                self.vtype['name'], self.image_ref)
+        # The first volume seeds the image cache; the rest are created
+        # together so they clone from the same cache entry.
+        volumes = [self._create_volume_from_image(
+            self.vtype['name'], self.image_ref)]
+        volumes += self._create_volumes_from_image(
+            self.vtype['name'], self.image_ref, num_volumes - 1)
+        for i, vol in enumerate(volumes):
             self.assertEqual(vol['status'], 'available')
-            volumes.append(vol)
             LOG.info("Image volume %d/%d created: %s",
                      i + 1, num_volumes, vol['id'])
 
@@ -710,14 +871,16 @@ class TestPowerFlexImageCacheVtree(PowerFlexVtreeBaseTest):
         in cinder.conf on the PowerFlex backend. If set to 0 (unlimited), this
         test still passes but doesn't trigger replacement.
         """
-        volumes = []
         num_volumes = 4
 
-        for i in range(num_volumes):
-            vol = self._create_volume_from_image(
-                self.vtype['name'], self.image_ref)
+        # The first volume seeds the cache entry; the rest are created
+        # concurrently, so the limit is hit under parallel clone load.
+        volumes = [self._create_volume_from_image(
+            self.vtype['name'], self.image_ref)]
+        volumes += self._create_volumes_from_image(
+            self.vtype['name'], self.image_ref, num_volumes - 1)
+        for i, vol in enumerate(volumes):
             self.assertEqual(vol['status'], 'available')
-            volumes.append(vol)
             LOG.info("Image volume %d/%d created: %s",
                      i + 1, num_volumes, vol['id'])
 
@@ -806,6 +969,8 @@ class TestPowerFlexCloneEdgeCases(PowerFlexVtreeBaseTest):
         # Source should still be clonable
         clone_2 = self._clone_volume(source['id'], self.vtype['name'])
         self.assertEqual(clone_2['status'], 'available')
+        self._assert_direct_children(source['id'], 2)
+        self._assert_direct_children(clone_1['id'], 1)
 
         LOG.info("Clone-of-clone test passed: source=%s clone_1=%s "
                  "clone_of_clone=%s clone_2=%s",
@@ -823,15 +988,15 @@ class TestPowerFlexCloneEdgeCases(PowerFlexVtreeBaseTest):
         clones and none are falsely blocked.
         """
         source = self._create_volume(self.vtype['name'])
-        clones = []
         num_clones = 5
 
-        for i in range(num_clones):
-            clone = self._clone_volume(source['id'], self.vtype['name'])
+        clones = self._clone_volumes([source['id']] * num_clones,
+                                     self.vtype['name'])
+        for clone in clones:
             self.assertEqual(clone['status'], 'available')
-            clones.append(clone)
 
         self.assertEqual(len(clones), num_clones)
+        self._assert_direct_children(source['id'], num_clones)
         LOG.info("Wide fan-out test passed: source=%s clones=%s",
                  source['id'], [c['id'] for c in clones])
 
@@ -862,6 +1027,7 @@ class TestPowerFlexCloneEdgeCases(PowerFlexVtreeBaseTest):
         # Source should still be clonable
         final_clone = self._clone_volume(source['id'], self.vtype['name'])
         self.assertEqual(final_clone['status'], 'available')
+        self._assert_direct_children(source['id'], 4)
         LOG.info("Fan-out with nested test passed: source=%s "
                  "final_clone=%s", source['id'], final_clone['id'])
 
@@ -981,11 +1147,11 @@ class TestPowerFlexCloneEdgeCases(PowerFlexVtreeBaseTest):
         """
         source = self._create_volume(self.vtype['name'])
 
-        child_1 = self._clone_volume(source['id'], self.vtype['name'])
-        child_2 = self._clone_volume(source['id'], self.vtype['name'])
+        child_1, child_2 = self._clone_volumes(
+            [source['id'], source['id']], self.vtype['name'])
 
-        gc_1 = self._clone_volume(child_1['id'], self.vtype['name'])
-        gc_2 = self._clone_volume(child_2['id'], self.vtype['name'])
+        gc_1, gc_2 = self._clone_volumes(
+            [child_1['id'], child_2['id']], self.vtype['name'])
 
         self.assertEqual(gc_1['status'], 'available')
         self.assertEqual(gc_2['status'], 'available')
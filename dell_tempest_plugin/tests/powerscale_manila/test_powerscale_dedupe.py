@@ -30,8 +30,6 @@ References (from dedupe-share.patch):
   - Config option: powerscale_dedupe_schedule
 """
 
-import time
-
 from oslo_log import log as logging
 from tempest import clients
 from tempest import config
@@ -41,11 +39,17 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import bulk as dell_bulk
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import manila_clients as dell_manila
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import waiters as dell_waiters
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 SHARE_BUILD_TIMEOUT = 600
-SHARE_BUILD_INTERVAL = 5
 
 
 class PowerScaleDedupeShareTest(object):
@@ -65,58 +69,19 @@ class PowerScaleDedupeShareTest(object):
         cls.share_types_client = cls._get_manila_share_types_client(
             cls.admin_manager)
 
+    def setUp(self):
+        super(PowerScaleDedupeShareTest, self).setUp()
+        dell_budget.start_test_budget(self)
+
     @staticmethod
     def _get_manila_client(manager):
         """Resolve Manila shares client from the manager."""
-        for attr in ('shares_v2_client', 'shares_client',
-                     'share_v2_client', 'share_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        try:
-            from manila_tempest_tests.services.share.v2.json import (
-                shares_client as manila_shares_client)
-            service_type = getattr(CONF, 'share', None)
-            configured_type = getattr(service_type, 'catalog_type',
-                                      None) if service_type else None
-            region = (getattr(service_type, 'region', None)
-                      if service_type else None) or CONF.identity.region
-            endpoint_type = (getattr(service_type, 'endpoint_type', 'public')
-                             if service_type else 'public')
-            # Auto-detect the Manila service type from the catalog if
-            # not explicitly configured (the manila_tempest_tests default
-            # of 'share' may not match the actual catalog entry).
-            catalog_type = configured_type
-            if not catalog_type or catalog_type == 'share':
-                try:
-                    auth_data = manager.auth_provider.get_auth()
-                    catalog = auth_data[1].get('catalog', [])
-                    for entry in catalog:
-                        if entry.get('type') in ('shared-file-system', 'share'):
-                            catalog_type = entry['type']
-                            break
-                except Exception:
-                    pass
-            catalog_type = catalog_type or 'shared-file-system'
-            return manila_shares_client.SharesV2Client(
-                auth_provider=manager.auth_provider,
-                service=catalog_type,
-                region=region,
-                endpoint_type=endpoint_type,
-            )
-        except ImportError:
-            pass
-        return None
+        return dell_manila.shares_client(manager)
 
     @classmethod
     def _get_manila_share_types_client(cls, manager):
         """Resolve Manila share types client from the manager."""
-        for attr in ('share_types_v2_client', 'share_types_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        # Fall back to the shares v2 client which also has share type methods
-        return cls._get_manila_client(manager)
+        return dell_manila.share_types_client(manager)
 
     # ------------------------------------------------------------------
     # Share type helpers
@@ -125,18 +90,30 @@ class PowerScaleDedupeShareTest(object):
                                  extra_specs=None):
         """Create a Manila share type with dedupe extra-spec.
 
+        Without *name*, the worker's shared share type with the same
+        extra specs is returned (see ``type_registry``).
+
         :param name: Optional name; auto-generated if None.
         :param dedupe: Whether to set dedupe=True in extra-specs.
         :param extra_specs: Additional extra-specs dict to merge.
         :returns: Created share type dict.
         """
-        name = name or data_utils.rand_name('ps-dedupe-type')
         specs = {'driver_handles_share_servers': 'False'}
         if dedupe:
             specs['dedupe'] = 'True'
         if extra_specs:
             specs.update(extra_specs)
 
+        if name is None:
+            return dell_types.acquire(
+                self, 'share_type', specs,
+                lambda name: self._new_share_type(
+                    name or data_utils.rand_name('ps-dedupe-type'), specs))
+        st = self._new_share_type(name, specs)
+        self._cleanup_share_type(st['id'])
+        return st
+
+    def _new_share_type(self, name, specs):
         share_type = self.share_types_client.create_share_type(
             name=name,
             extra_specs=specs,
@@ -144,7 +121,6 @@ class PowerScaleDedupeShareTest(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) with specs=%s",
                  st['name'], st['id'], specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
         return st
 
     def create_non_dedupe_share_type(self, name=None, extra_specs=None):
@@ -152,16 +128,11 @@ class PowerScaleDedupeShareTest(object):
         return self.create_dedupe_share_type(
             name=name, dedupe=False, extra_specs=extra_specs)
 
-    def _delete_share_type_safe(self, share_type_id):
-        """Delete share type, ignoring NotFound."""
-        try:
-            self.share_types_client.delete_share_type(share_type_id)
-            LOG.info("Deleted share type %s", share_type_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share type %s already gone", share_type_id)
-        except Exception as e:
-            LOG.warning("Failed to delete share type %s: %s",
-                        share_type_id, e)
+    def _cleanup_share_type(self, share_type_id):
+        """Register a share type with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_type', share_type_id,
+            self.share_types_client.delete_share_type)
 
     # ------------------------------------------------------------------
     # Share helpers
@@ -185,58 +156,119 @@ class PowerScaleDedupeShareTest(object):
         sh = share.get('share', share)
         LOG.info("Created share '%s' (id=%s, protocol=%s, type=%s)",
                  sh['name'], sh['id'], protocol, share_type_name)
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         return self.shares_v2_client.get_share(sh['id']).get(
             'share', self.shares_v2_client.get_share(sh['id']))
 
-    def _delete_share_safe(self, share_id):
-        """Delete a share and wait for it to be removed."""
-        try:
-            self.shares_v2_client.delete_share(share_id)
-            LOG.info("Requested deletion of share %s", share_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share %s already gone", share_id)
-            return
-        except Exception as e:
-            LOG.warning("Failed to delete share %s: %s", share_id, e)
-            return
-        self._wait_for_share_deletion(share_id)
+    def create_shares(self, protocol, share_type_name, count, size=1,
+                      name_prefix=None):
+        """Create several Manila shares and wait for them together.
+
+        The create requests are submitted concurrently; the shares are
+        then awaited with one ``list_shares_with_detail`` call per poll.
+
+        :param protocol: 'NFS' or 'CIFS'
+        :param share_type_name: Name of the share type to use.
+        :param count: Number of shares to create.
+        :param size: Share size in GB.
+        :param name_prefix: Optional share name prefix.
+        :returns: List of share dicts, in creation order.
+        """
+        name_prefix = name_prefix or f'ps-dedupe-{protocol.lower()}'
+        batch_tag = data_utils.rand_name('ps-dedupe-batch')
+
+        def _register(sh):
+            LOG.info("Created share '%s' (id=%s, protocol=%s, type=%s)",
+                     sh['name'], sh['id'], protocol, share_type_name)
+            self._cleanup_share(sh['id'], sh.get('share_type'))
+
+        return dell_bulk.create_shares_bulk(
+            self.shares_v2_client,
+            [{'share_protocol': protocol,
+              'size': size,
+              'name': data_utils.rand_name(f'{name_prefix}-{i}'),
+              'share_type_id': share_type_name,
+              'metadata': {dell_waiters.BATCH_METADATA_KEY: batch_tag}}
+             for i in range(count)],
+            register=_register,
+            wait=lambda ids: self._wait_for_shares_status(
+                ids, 'available', batch_tag=batch_tag))
+
+    def _cleanup_share(self, share_id, share_type_id=None):
+        """Register a share with the test's cleanup executor.
+
+        Shares of one test are deleted together and their deletions
+        awaited in one batch before any share type is removed.
+        """
+        dell_cleanup.get_executor(self).add(
+            'share', share_id, self.shares_v2_client.delete_share,
+            waiter=self._share_deletion_waiter,
+            depends_on=[('share_type', share_type_id)])
+
+    def _share_deletion_waiter(self, share_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_share, share_id, kind='share',
+            response_key='share', error_states=('error_deleting',),
+            timeout=SHARE_BUILD_TIMEOUT)
 
     def _wait_for_share_status(self, share_id, target_status,
                                timeout=SHARE_BUILD_TIMEOUT,
-                               interval=SHARE_BUILD_INTERVAL):
+                               interval=None):
         """Poll share status until it reaches target or errors out."""
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            share = self.shares_v2_client.get_share(share_id)
-            sh = share.get('share', share)
-            status = sh.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'error_deleting'):
-                self.fail(
-                    f"Share {share_id} entered error state: {status}")
-            time.sleep(interval)
-        self.fail(
-            f"Timeout waiting for share {share_id} to reach "
-            f"'{target_status}'; last status='{last_status}'")
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, target_status,
+                kind='share',
+                response_key='share',
+                error_states=('error', 'error_deleting'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
+
+    def _wait_for_shares_status(self, share_ids, target_status,
+                                batch_tag=None,
+                                timeout=SHARE_BUILD_TIMEOUT,
+                                interval=None):
+        """Poll several shares with one list call per poll.
+
+        :returns: Dict mapping share ID to its share dict.
+        """
+        params = dell_waiters.batch_params(batch_tag) if batch_tag else None
+        try:
+            return dell_waiters.wait_for_shares_status(
+                self.shares_v2_client, share_ids, target_status,
+                params=params,
+                error_states=('error', 'error_deleting'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     def _wait_for_share_deletion(self, share_id,
                                  timeout=SHARE_BUILD_TIMEOUT,
-                                 interval=SHARE_BUILD_INTERVAL):
+                                 interval=None):
         """Poll until share is gone (NotFound)."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_share(share_id)
-            except lib_exc.NotFound:
-                LOG.info("Share %s deletion confirmed", share_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for share %s deletion", share_id)
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_share, share_id, kind='share',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for share %s deletion", share_id)
+            return
+        LOG.info("Share %s deletion confirmed", share_id)
+
+    def _wait_for_shares_deletion(self, share_ids,
+                                  timeout=SHARE_BUILD_TIMEOUT,
+                                  interval=None):
+        """Poll until several shares are gone, one list call per poll."""
+        try:
+            dell_waiters.wait_for_shares_deletion(
+                self.shares_v2_client, share_ids,
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout as e:
+            LOG.warning("Timeout waiting for share deletion: %s", e)
+            return
+        LOG.info("Shares %s deletion confirmed", ', '.join(share_ids))
 
     # ------------------------------------------------------------------
     # Manage / Unmanage helpers
@@ -264,7 +296,7 @@ class PowerScaleDedupeShareTest(object):
         )
         sh = share.get('share', share)
         LOG.info("Manage request for share '%s' (id=%s)", sh['name'], sh['id'])
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         return self.shares_v2_client.get_share(sh['id']).get(
             'share', self.shares_v2_client.get_share(sh['id']))
@@ -568,11 +600,11 @@ class _NFSDedupeTests(object):
                 name=data_utils.rand_name('ps-manage-fail'),
             )
             sh = result.get('share', result)
-            self.addCleanup(self._delete_share_safe, sh['id'])
-            # Wait a bit for the manage operation to process
-            time.sleep(10)
-            managed = self.shares_v2_client.get_share(sh['id'])
-            managed_sh = managed.get('share', managed)
+            self._cleanup_share(sh['id'], sh.get('share_type'))
+            managed_sh = dell_waiters.settle_share(
+                self.shares_v2_client, sh['id'],
+                ('manage_error', 'error', 'available'),
+                timeout=SHARE_BUILD_TIMEOUT)
             self.assertIn(managed_sh['status'],
                           ('manage_error', 'error'),
                           f"Expected manage to fail but got status: "
@@ -638,10 +670,11 @@ class _NFSDedupeTests(object):
                 name=data_utils.rand_name('ps-manage-fail'),
             )
             sh = result.get('share', result)
-            self.addCleanup(self._delete_share_safe, sh['id'])
-            time.sleep(10)
-            managed = self.shares_v2_client.get_share(sh['id'])
-            managed_sh = managed.get('share', managed)
+            self._cleanup_share(sh['id'], sh.get('share_type'))
+            managed_sh = dell_waiters.settle_share(
+                self.shares_v2_client, sh['id'],
+                ('manage_error', 'error', 'available'),
+                timeout=SHARE_BUILD_TIMEOUT)
             self.assertIn(managed_sh['status'],
                           ('manage_error', 'error'),
                           f"Expected manage to fail but got status: "
@@ -871,23 +904,21 @@ class _ShareTypeDedupeTests(object):
 
         share_type = self.create_dedupe_share_type()
 
-        shares = []
-        for i in range(3):
-            share = self.create_share(
-                protocol='NFS',
-                share_type_name=share_type['name'],
-                size=1,
-                name=data_utils.rand_name(f'ps-dedupe-multi-{i}'),
-            )
+        shares = self.create_shares(
+            protocol='NFS',
+            share_type_name=share_type['name'],
+            count=3,
+            size=1,
+            name_prefix='ps-dedupe-multi',
+        )
+        for share in shares:
             self.assertEqual(share['status'], 'available')
-            shares.append(share)
 
         LOG.info("Created %d dedupe shares successfully", len(shares))
 
-        # Clean up in reverse order
-        for share in reversed(shares):
+        for share in shares:
             self.shares_v2_client.delete_share(share['id'])
-            self._wait_for_share_deletion(share['id'])
+        self._wait_for_shares_deletion([share['id'] for share in shares])
 
         LOG.info("All %d dedupe shares deleted; paths deregistered",
                  len(shares))
@@ -49,9 +49,6 @@ Driver methods tested:
   - _qos_backend_enabled_for_path
 """
 
-import json
-import time
-
 from oslo_config import cfg
 from oslo_log import log as logging
 from tempest import clients
@@ -61,6 +58,13 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import bulk as dell_bulk
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import manila_clients as dell_manila
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import waiters as dell_waiters
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
@@ -75,10 +79,6 @@ except cfg.DuplicateOptError:
     pass
 
 SHARE_BUILD_TIMEOUT = 600
-SHARE_BUILD_INTERVAL = 5
-
-# Minimum Manila API microversion that supports QoS types
-QOS_TYPE_MIN_API_VERSION = '2.94'
 
 
 class PowerScaleQoSShareTest(object):
@@ -102,111 +102,60 @@ class PowerScaleQoSShareTest(object):
         cls.shares_v2_client = cls._get_manila_client(cls.admin_manager)
         cls.share_types_client = cls._get_manila_share_types_client(
             cls.admin_manager)
+        cls.qos_types_client = dell_manila.qos_types_client(
+            cls.admin_manager)
+
+    def setUp(self):
+        super(PowerScaleQoSShareTest, self).setUp()
+        dell_budget.start_test_budget(self)
 
     @staticmethod
     def _get_manila_client(manager):
         """Resolve Manila shares client from the manager."""
-        for attr in ('shares_v2_client', 'shares_client',
-                     'share_v2_client', 'share_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        try:
-            from manila_tempest_tests.services.share.v2.json import (
-                shares_client as manila_shares_client)
-            service_type = getattr(CONF, 'share', None)
-            configured_type = getattr(service_type, 'catalog_type',
-                                      None) if service_type else None
-            region = (getattr(service_type, 'region', None)
-                      if service_type else None) or CONF.identity.region
-            endpoint_type = (getattr(service_type, 'endpoint_type', 'public')
-                             if service_type else 'public')
-            catalog_type = configured_type
-            if not catalog_type or catalog_type == 'share':
-                try:
-                    auth_data = manager.auth_provider.get_auth()
-                    catalog = auth_data[1].get('catalog', [])
-                    for entry in catalog:
-                        if entry.get('type') in (
-                                'shared-file-system', 'share'):
-                            catalog_type = entry['type']
-                            break
-                except Exception:
-                    pass
-            catalog_type = catalog_type or 'shared-file-system'
-            return manila_shares_client.SharesV2Client(
-                auth_provider=manager.auth_provider,
-                service=catalog_type,
-                region=region,
-                endpoint_type=endpoint_type,
-            )
-        except ImportError:
-            pass
-        return None
+        return dell_manila.shares_client(manager)
 
     @classmethod
     def _get_manila_share_types_client(cls, manager):
         """Resolve Manila share types client from the manager."""
-        for attr in ('share_types_v2_client', 'share_types_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        return cls._get_manila_client(manager)
+        return dell_manila.share_types_client(manager)
 
     # ------------------------------------------------------------------
-    # QoS type helpers (raw HTTP via shares_v2_client)
+    # QoS type helpers (raw HTTP via qos_types_client)
     # ------------------------------------------------------------------
     def _qos_type_request(self, method, url_suffix='', body=None):
         """Make a raw Manila API request for QoS type operations.
 
         The Manila QoS type API requires microversion >= 2.94.
         """
-        url = 'qos-types'
-        if url_suffix:
-            url = f'{url}/{url_suffix}'
-        headers = {'Content-Type': 'application/json'}
-        client = self.shares_v2_client
-        if method == 'POST':
-            resp, resp_body = client.post(
-                url, json.dumps(body), version=QOS_TYPE_MIN_API_VERSION)
-        elif method == 'GET':
-            resp, resp_body = client.get(
-                url, version=QOS_TYPE_MIN_API_VERSION)
-        elif method == 'DELETE':
-            resp, resp_body = client.delete(
-                url, version=QOS_TYPE_MIN_API_VERSION)
-        else:
-            raise ValueError(f"Unsupported method: {method}")
-        return resp, json.loads(resp_body) if resp_body else {}
+        return self.qos_types_client.qos_type_request(
+            method, url_suffix=url_suffix, body=body)
 
     def _qos_type_specs_request(self, method, qos_type_id,
                                 key=None, body=None):
         """Make a raw Manila API request for QoS type specs operations."""
-        url = f'qos-types/{qos_type_id}/specs'
-        if key:
-            url = f'{url}/{key}'
-        client = self.shares_v2_client
-        if method == 'POST':
-            resp, resp_body = client.post(
-                url, json.dumps(body), version=QOS_TYPE_MIN_API_VERSION)
-        elif method == 'GET':
-            resp, resp_body = client.get(
-                url, version=QOS_TYPE_MIN_API_VERSION)
-        elif method == 'DELETE':
-            resp, resp_body = client.delete(
-                url, version=QOS_TYPE_MIN_API_VERSION)
-        else:
-            raise ValueError(f"Unsupported method: {method}")
-        return resp, json.loads(resp_body) if resp_body else {}
+        return self.qos_types_client.qos_type_specs_request(
+            method, qos_type_id, key=key, body=body)
 
     def create_qos_type(self, name=None, specs=None):
         """Create a Manila QoS type with given specs.
 
+        Without *name*, the worker's shared QoS type with the same specs
+        is returned (see ``type_registry``).
+
         :param name: Optional name; auto-generated if None.
         :param specs: Dict of QoS specs (e.g. protocol_ops, dataset_id).
         :returns: Created QoS type dict.
         """
-        name = name or data_utils.rand_name('ps-qos-type')
+        if name is None:
+            return dell_types.acquire(
+                self, 'qos_type', specs,
+                lambda name: self._new_qos_type(
+                    name or data_utils.rand_name('ps-qos-type'), specs))
+        qt = self._new_qos_type(name, specs)
+        self._cleanup_qos_type(qt['id'])
+        return qt
+
+    def _new_qos_type(self, name, specs):
         body = {
             'qos_type': {
                 'name': name,
@@ -217,18 +166,15 @@ class PowerScaleQoSShareTest(object):
         qt = resp_body.get('qos_type', resp_body)
         LOG.info("Created QoS type '%s' (id=%s) with specs=%s",
                  qt.get('name'), qt.get('id'), specs)
-        self.addCleanup(self._delete_qos_type_safe, qt['id'])
         return qt
 
-    def _delete_qos_type_safe(self, qos_type_id):
-        """Delete QoS type, ignoring NotFound."""
-        try:
-            self._qos_type_request('DELETE', url_suffix=str(qos_type_id))
-            LOG.info("Deleted QoS type %s", qos_type_id)
-        except lib_exc.NotFound:
-            LOG.debug("QoS type %s already gone", qos_type_id)
-        except Exception as e:
-            LOG.warning("Failed to delete QoS type %s: %s", qos_type_id, e)
+    def _delete_qos_type(self, qos_type_id):
+        self._qos_type_request('DELETE', url_suffix=str(qos_type_id))
+
+    def _cleanup_qos_type(self, qos_type_id):
+        """Register a QoS type with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'qos_type', qos_type_id, self._delete_qos_type)
 
     # ------------------------------------------------------------------
     # Share type helpers
@@ -237,12 +183,14 @@ class PowerScaleQoSShareTest(object):
                               extra_specs=None):
         """Create a share type with default_qos_type pointing to a QoS type.
 
+        Without *name*, the worker's shared share type with the same
+        extra specs is returned (see ``type_registry``).
+
         :param qos_type_name: Name of the QoS type to link.
         :param name: Optional share type name.
         :param extra_specs: Additional extra-specs dict to merge.
         :returns: Created share type dict.
         """
-        name = name or data_utils.rand_name('ps-qos-share-type')
         specs = {
             'driver_handles_share_servers': 'False',
             'default_qos_type': qos_type_name,
@@ -250,6 +198,16 @@ class PowerScaleQoSShareTest(object):
         if extra_specs:
             specs.update(extra_specs)
 
+        if name is None:
+            return dell_types.acquire(
+                self, 'share_type', specs,
+                lambda name: self._new_share_type(
+                    name or data_utils.rand_name('ps-qos-share-type'), specs))
+        st = self._new_share_type(name, specs)
+        self._cleanup_share_type(st['id'])
+        return st
+
+    def _new_share_type(self, name, specs):
         share_type = self.share_types_client.create_share_type(
             name=name,
             extra_specs=specs,
@@ -257,7 +215,6 @@ class PowerScaleQoSShareTest(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) with specs=%s",
                  st['name'], st['id'], specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
         return st
 
     def create_plain_share_type(self, name=None, extra_specs=None):
@@ -274,19 +231,14 @@ class PowerScaleQoSShareTest(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) without QoS", st['name'],
                  st['id'])
-        self.addCleanup(self._delete_share_type_safe, st['id'])
+        self._cleanup_share_type(st['id'])
         return st
 
-    def _delete_share_type_safe(self, share_type_id):
-        """Delete share type, ignoring NotFound."""
-        try:
-            self.share_types_client.delete_share_type(share_type_id)
-            LOG.info("Deleted share type %s", share_type_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share type %s already gone", share_type_id)
-        except Exception as e:
-            LOG.warning("Failed to delete share type %s: %s",
-                        share_type_id, e)
+    def _cleanup_share_type(self, share_type_id):
+        """Register a share type with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_type', share_type_id,
+            self.share_types_client.delete_share_type)
 
     # ------------------------------------------------------------------
     # Share helpers
@@ -310,58 +262,121 @@ class PowerScaleQoSShareTest(object):
         sh = share.get('share', share)
         LOG.info("Created share '%s' (id=%s, protocol=%s, type=%s)",
                  sh['name'], sh['id'], protocol, share_type_name)
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         return self.shares_v2_client.get_share(sh['id']).get(
             'share', self.shares_v2_client.get_share(sh['id']))
 
-    def _delete_share_safe(self, share_id):
-        """Delete a share and wait for it to be removed."""
-        try:
-            self.shares_v2_client.delete_share(share_id)
-            LOG.info("Requested deletion of share %s", share_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share %s already gone", share_id)
-            return
-        except Exception as e:
-            LOG.warning("Failed to delete share %s: %s", share_id, e)
-            return
-        self._wait_for_share_deletion(share_id)
+    def create_shares(self, protocol, share_type_name, count, size=1,
+                      name_prefix=None):
+        """Create several Manila shares and wait for them together.
+
+        The create requests are submitted concurrently; the shares are
+        then awaited with one ``list_shares_with_detail`` call per poll.
+
+        :param protocol: 'NFS' or 'CIFS'
+        :param share_type_name: Name of the share type to use.
+        :param count: Number of shares to create.
+        :param size: Share size in GB.
+        :param name_prefix: Optional share name prefix.
+        :returns: List of share dicts, in creation order.
+        """
+        name_prefix = name_prefix or f'ps-qos-{protocol.lower()}'
+        batch_tag = data_utils.rand_name('ps-qos-batch')
+
+        def _register(sh):
+            LOG.info("Created share '%s' (id=%s, protocol=%s, type=%s)",
+                     sh['name'], sh['id'], protocol, share_type_name)
+            self._cleanup_share(sh['id'], sh.get('share_type'))
+
+        return dell_bulk.create_shares_bulk(
+            self.shares_v2_client,
+            [{'share_protocol': protocol,
+              'size': size,
+              'name': data_utils.rand_name(f'{name_prefix}-{i}'),
+              'share_type_id': share_type_name,
+              'metadata': {dell_waiters.BATCH_METADATA_KEY: batch_tag}}
+             for i in range(count)],
+            register=_register,
+            wait=lambda ids: self._wait_for_shares_status(
+                ids, 'available', batch_tag=batch_tag))
+
+    def _cleanup_share(self, share_id, share_type_id=None,
+                       snapshot_id=None):
+        """Register a share with the test's cleanup executor.
+
+        Shares of one test are deleted together and their deletions
+        awaited in one batch before any share type is removed; a share
+        created from *snapshot_id* goes before that snapshot.
+        """
+        dell_cleanup.get_executor(self).add(
+            'share', share_id, self.shares_v2_client.delete_share,
+            waiter=self._share_deletion_waiter,
+            depends_on=[('share_type', share_type_id),
+                        ('share_snapshot', snapshot_id)])
+
+    def _share_deletion_waiter(self, share_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_share, share_id, kind='share',
+            error_states=('error_deleting',), timeout=SHARE_BUILD_TIMEOUT)
 
     def _wait_for_share_status(self, share_id, target_status,
                                timeout=SHARE_BUILD_TIMEOUT,
-                               interval=SHARE_BUILD_INTERVAL):
+                               interval=None):
         """Poll share status until it reaches target or errors out."""
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            share = self.shares_v2_client.get_share(share_id)
-            sh = share.get('share', share)
-            status = sh.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'error_deleting', 'manage_error'):
-                self.fail(
-                    f"Share {share_id} entered error state: {status}")
-            time.sleep(interval)
-        self.fail(
-            f"Timeout waiting for share {share_id} to reach "
-            f"'{target_status}'; last status='{last_status}'")
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, target_status,
+                kind='share',
+                response_key='share',
+                error_states=('error', 'error_deleting', 'manage_error'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
+
+    def _wait_for_shares_status(self, share_ids, target_status,
+                                batch_tag=None,
+                                timeout=SHARE_BUILD_TIMEOUT,
+                                interval=None):
+        """Poll several shares with one list call per poll.
+
+        :returns: Dict mapping share ID to its share dict.
+        """
+        params = dell_waiters.batch_params(batch_tag) if batch_tag else None
+        try:
+            return dell_waiters.wait_for_shares_status(
+                self.shares_v2_client, share_ids, target_status,
+                params=params,
+                error_states=('error', 'error_deleting', 'manage_error'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     def _wait_for_share_deletion(self, share_id,
                                  timeout=SHARE_BUILD_TIMEOUT,
-                                 interval=SHARE_BUILD_INTERVAL):
+                                 interval=None):
         """Poll until share is gone (NotFound)."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_share(share_id)
-            except lib_exc.NotFound:
-                LOG.info("Share %s deletion confirmed", share_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for share %s deletion", share_id)
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_share, share_id, kind='share',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for share %s deletion", share_id)
+            return
+        LOG.info("Share %s deletion confirmed", share_id)
+
+    def _wait_for_shares_deletion(self, share_ids,
+                                  timeout=SHARE_BUILD_TIMEOUT,
+                                  interval=None):
+        """Poll until several shares are gone, one list call per poll."""
+        try:
+            dell_waiters.wait_for_shares_deletion(
+                self.shares_v2_client, share_ids,
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout as e:
+            LOG.warning("Timeout waiting for share deletion: %s", e)
+            return
+        LOG.info("Shares %s deletion confirmed", ', '.join(share_ids))
 
     # ------------------------------------------------------------------
     # Manage / Unmanage helpers
@@ -388,7 +403,7 @@ class PowerScaleQoSShareTest(object):
         sh = share.get('share', share)
         LOG.info("Manage request for share '%s' (id=%s)",
                  sh['name'], sh['id'])
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         return self.shares_v2_client.get_share(sh['id']).get(
             'share', self.shares_v2_client.get_share(sh['id']))
@@ -773,10 +788,11 @@ class _NFSQoSTests(object):
                 name=data_utils.rand_name('ps-manage-qos-fail'),
             )
             sh = result.get('share', result)
-            self.addCleanup(self._delete_share_safe, sh['id'])
-            time.sleep(15)
-            managed = self.shares_v2_client.get_share(sh['id'])
-            managed_sh = managed.get('share', managed)
+            self._cleanup_share(sh['id'], qos_share_type['id'])
+            managed_sh = dell_waiters.settle_share(
+                self.shares_v2_client, sh['id'],
+                ('manage_error', 'error', 'available'),
+                timeout=SHARE_BUILD_TIMEOUT)
             self.assertIn(managed_sh['status'],
                           ('manage_error', 'error'),
                           f"Expected manage to fail but got status: "
@@ -868,23 +884,21 @@ class _NFSQoSTests(object):
         share_type = self.create_qos_share_type(
             qos_type_name=qos_type['name'])
 
-        shares = []
-        for i in range(2):
-            share = self.create_share(
-                protocol='NFS',
-                share_type_name=share_type['name'],
-                size=1,
-                name=data_utils.rand_name(f'ps-qos-multi-{i}'),
-            )
+        shares = self.create_shares(
+            protocol='NFS',
+            share_type_name=share_type['name'],
+            count=2,
+            size=1,
+            name_prefix='ps-qos-multi',
+        )
+        for share in shares:
             self.assertEqual(share['status'], 'available')
-            shares.append(share)
 
         LOG.info("Created %d QoS NFS shares successfully", len(shares))
 
-        # Clean up in reverse order
-        for share in reversed(shares):
+        for share in shares:
             self.shares_v2_client.delete_share(share['id'])
-            self._wait_for_share_deletion(share['id'])
+        self._wait_for_shares_deletion([share['id'] for share in shares])
 
         LOG.info("All %d QoS NFS shares deleted; workloads removed",
                  len(shares))
@@ -1121,11 +1135,13 @@ class _QoSShareTypeTests(object):
         """Create a QoS type and verify specs are stored correctly."""
         LOG.info("=== test_create_qos_type_with_specs ===")
 
-        qos_type = self.create_qos_type(specs={
-            'protocol_ops': '1000',
-            'dataset': 'openstack_manila_qos',
-            'protocols': 'nfs3,nfs4',
-        })
+        qos_type = self.create_qos_type(
+            name=data_utils.rand_name('ps-qos-type'),
+            specs={
+                'protocol_ops': '1000',
+                'dataset': 'openstack_manila_qos',
+                'protocols': 'nfs3,nfs4',
+            })
 
         self.assertIsNotNone(qos_type.get('id'))
         specs = qos_type.get('specs', {})
@@ -1148,7 +1164,8 @@ class _QoSShareTypeTests(object):
             'dataset': 'openstack_manila_qos',
         })
         share_type = self.create_qos_share_type(
-            qos_type_name=qos_type['name'])
+            qos_type_name=qos_type['name'],
+            name=data_utils.rand_name('ps-qos-share-type'))
 
         specs = share_type.get('extra_specs', {})
         self.assertIn('default_qos_type', specs)
@@ -1181,10 +1198,12 @@ class _QoSShareTypeTests(object):
         """Create QoS type using dataset_id instead of dataset name."""
         LOG.info("=== test_create_qos_type_with_dataset_id ===")
 
-        qos_type = self.create_qos_type(specs={
-            'protocol_ops': '3000',
-            'dataset_id': '3',
-        })
+        qos_type = self.create_qos_type(
+            name=data_utils.rand_name('ps-qos-type'),
+            specs={
+                'protocol_ops': '3000',
+                'dataset_id': '3',
+            })
 
         specs = qos_type.get('specs', {})
         self.assertEqual(specs.get('protocol_ops'), '3000')
@@ -39,8 +39,6 @@ References (from revert_snapshot.patch):
   - Config options: powerscale_job_retries, powerscale_job_interval
 """
 
-import time
-
 from oslo_log import log as logging
 from tempest import clients
 from tempest import config
@@ -49,15 +47,19 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import manila_clients as dell_manila
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import waiters as dell_waiters
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 SHARE_BUILD_TIMEOUT = 600
-SHARE_BUILD_INTERVAL = 5
 
 # Revert is async on PowerScale; allow extra time for the SnapRevert job
 REVERT_TIMEOUT = 900
-REVERT_INTERVAL = 10
 
 
 class PowerScaleRevertSnapshotTest(object):
@@ -78,55 +80,19 @@ class PowerScaleRevertSnapshotTest(object):
         cls.share_types_client = cls._get_manila_share_types_client(
             cls.admin_manager)
 
+    def setUp(self):
+        super(PowerScaleRevertSnapshotTest, self).setUp()
+        dell_budget.start_test_budget(self)
+
     @staticmethod
     def _get_manila_client(manager):
         """Resolve Manila shares client from the manager."""
-        for attr in ('shares_v2_client', 'shares_client',
-                     'share_v2_client', 'share_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        try:
-            from manila_tempest_tests.services.share.v2.json import (
-                shares_client as manila_shares_client)
-            service_type = getattr(CONF, 'share', None)
-            configured_type = getattr(service_type, 'catalog_type',
-                                      None) if service_type else None
-            region = (getattr(service_type, 'region', None)
-                      if service_type else None) or CONF.identity.region
-            endpoint_type = (getattr(service_type, 'endpoint_type', 'public')
-                             if service_type else 'public')
-            catalog_type = configured_type
-            if not catalog_type or catalog_type == 'share':
-                try:
-                    auth_data = manager.auth_provider.get_auth()
-                    catalog = auth_data[1].get('catalog', [])
-                    for entry in catalog:
-                        if entry.get('type') in (
-                                'shared-file-system', 'share'):
-                            catalog_type = entry['type']
-                            break
-                except Exception:
-                    pass
-            catalog_type = catalog_type or 'shared-file-system'
-            return manila_shares_client.SharesV2Client(
-                auth_provider=manager.auth_provider,
-                service=catalog_type,
-                region=region,
-                endpoint_type=endpoint_type,
-            )
-        except ImportError:
-            pass
-        return None
+        return dell_manila.shares_client(manager)
 
     @classmethod
     def _get_manila_share_types_client(cls, manager):
         """Resolve Manila share types client from the manager."""
-        for attr in ('share_types_v2_client', 'share_types_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        return cls._get_manila_client(manager)
+        return dell_manila.share_types_client(manager)
 
     # ------------------------------------------------------------------
     # Share type helpers
@@ -134,11 +100,13 @@ class PowerScaleRevertSnapshotTest(object):
     def create_revert_share_type(self, name=None, extra_specs=None):
         """Create a Manila share type with revert_to_snapshot_support.
 
+        Without *name*, the worker's shared share type with the same
+        extra specs is returned (see ``type_registry``).
+
         :param name: Optional name; auto-generated if None.
         :param extra_specs: Additional extra-specs dict to merge.
         :returns: Created share type dict.
         """
-        name = name or data_utils.rand_name('ps-revert-type')
         specs = {
             'driver_handles_share_servers': 'False',
             'snapshot_support': 'True',
@@ -147,6 +115,16 @@ class PowerScaleRevertSnapshotTest(object):
         if extra_specs:
             specs.update(extra_specs)
 
+        if name is None:
+            return dell_types.acquire(
+                self, 'share_type', specs,
+                lambda name: self._new_share_type(
+                    name or data_utils.rand_name('ps-revert-type'), specs))
+        st = self._new_share_type(name, specs)
+        self._cleanup_share_type(st['id'])
+        return st
+
+    def _new_share_type(self, name, specs):
         share_type = self.share_types_client.create_share_type(
             name=name,
             extra_specs=specs,
@@ -154,7 +132,6 @@ class PowerScaleRevertSnapshotTest(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) with specs=%s",
                  st['name'], st['id'], specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
         return st
 
     def create_snapshot_share_type(self, name=None, extra_specs=None):
@@ -174,19 +151,14 @@ class PowerScaleRevertSnapshotTest(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) with specs=%s",
                  st['name'], st['id'], specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
+        self._cleanup_share_type(st['id'])
         return st
 
-    def _delete_share_type_safe(self, share_type_id):
-        """Delete share type, ignoring NotFound."""
-        try:
-            self.share_types_client.delete_share_type(share_type_id)
-            LOG.info("Deleted share type %s", share_type_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share type %s already gone", share_type_id)
-        except Exception as e:
-            LOG.warning("Failed to delete share type %s: %s",
-                        share_type_id, e)
+    def _cleanup_share_type(self, share_type_id):
+        """Register a share type with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_type', share_type_id,
+            self.share_types_client.delete_share_type)
 
     # ------------------------------------------------------------------
     # Share helpers
@@ -211,13 +183,33 @@ class PowerScaleRevertSnapshotTest(object):
         sh = share.get('share', share)
         LOG.info("Created share '%s' (id=%s, protocol=%s, size=%sG)",
                  sh['name'], sh['id'], protocol, size)
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         return self.shares_v2_client.get_share(sh['id']).get(
             'share', self.shares_v2_client.get_share(sh['id']))
 
-    def _delete_share_safe(self, share_id):
-        """Delete a share and wait for it to be removed."""
+    def _cleanup_share(self, share_id, share_type_id=None,
+                       snapshot_id=None):
+        """Register a share with the test's cleanup executor.
+
+        Shares of one test are deleted together and their deletions
+        awaited in one batch before any share type is removed; a share
+        created from *snapshot_id* goes before that snapshot.
+        """
+        dell_cleanup.get_executor(self).add(
+            'share', share_id, self._delete_share,
+            waiter=self._share_deletion_waiter,
+            depends_on=[('share_type', share_type_id),
+                        ('share_snapshot', snapshot_id)])
+
+    def _share_deletion_waiter(self, share_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_share, share_id, kind='share',
+            response_key='share', error_states=('error_deleting',),
+            timeout=SHARE_BUILD_TIMEOUT)
+
+    def _delete_share(self, share_id):
+        """Delete a share, first resetting a failed revert to available."""
         try:
             share = self.shares_v2_client.get_share(share_id)
             sh = share.get('share', share)
@@ -231,82 +223,56 @@ class PowerScaleRevertSnapshotTest(object):
                 self._wait_for_share_status(share_id, 'available',
                                             timeout=60)
         except lib_exc.NotFound:
-            LOG.debug("Share %s already gone", share_id)
-            return
+            raise
         except Exception as e:
             LOG.warning("Pre-delete check for share %s failed: %s",
                         share_id, e)
-        try:
-            self.shares_v2_client.delete_share(share_id)
-            LOG.info("Requested deletion of share %s", share_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share %s already gone", share_id)
-            return
-        except Exception as e:
-            LOG.warning("Failed to delete share %s: %s", share_id, e)
-            return
-        self._wait_for_share_deletion(share_id)
+        self.shares_v2_client.delete_share(share_id)
 
     def _wait_for_share_status(self, share_id, target_status,
                                timeout=SHARE_BUILD_TIMEOUT,
-                               interval=SHARE_BUILD_INTERVAL):
+                               interval=None):
         """Poll share status until it reaches target or errors out."""
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            share = self.shares_v2_client.get_share(share_id)
-            sh = share.get('share', share)
-            status = sh.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'error_deleting', 'reverting_error'):
-                self.fail(
-                    f"Share {share_id} entered error state: {status}")
-            time.sleep(interval)
-        self.fail(
-            f"Timeout waiting for share {share_id} to reach "
-            f"'{target_status}'; last status='{last_status}'")
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, target_status,
+                kind='share',
+                response_key='share',
+                error_states=('error', 'error_deleting',
+                              'reverting_error'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     def _wait_for_share_status_revert(self, share_id, target_status,
                                       timeout=REVERT_TIMEOUT,
-                                      interval=REVERT_INTERVAL):
+                                      interval=None):
         """Poll share status for revert operations (longer timeout).
 
         Revert is async on PowerScale — the share goes through
         reverting -> reverting_to_snapshot -> available.
         """
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            share = self.shares_v2_client.get_share(share_id)
-            sh = share.get('share', share)
-            status = sh.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'reverting_error'):
-                self.fail(
-                    f"Share {share_id} entered error state during revert: "
-                    f"{status}")
-            time.sleep(interval)
-        self.fail(
-            f"Timeout waiting for share {share_id} to reach "
-            f"'{target_status}' after revert; last status='{last_status}'")
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, target_status,
+                kind='share_revert', response_key='share',
+                error_states=('error', 'reverting_error'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(f"{e} (after revert)")
 
     def _wait_for_share_deletion(self, share_id,
                                  timeout=SHARE_BUILD_TIMEOUT,
-                                 interval=SHARE_BUILD_INTERVAL):
+                                 interval=None):
         """Poll until share is gone (NotFound)."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_share(share_id)
-            except lib_exc.NotFound:
-                LOG.info("Share %s deletion confirmed", share_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for share %s deletion", share_id)
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_share, share_id, kind='share',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for share %s deletion", share_id)
+            return
+        LOG.info("Share %s deletion confirmed", share_id)
 
     def _get_export_locations(self, share_id):
         """Retrieve export locations for a share via the dedicated API."""
@@ -334,13 +300,26 @@ class PowerScaleRevertSnapshotTest(object):
         sn = snap.get('snapshot', snap)
         LOG.info("Created snapshot '%s' (id=%s) for share %s",
                  sn['name'], sn['id'], share_id)
-        self.addCleanup(self._delete_snapshot_safe, sn['id'])
+        self._cleanup_snapshot(sn['id'], share_id)
         self._wait_for_snapshot_status(sn['id'], 'available')
         return self.shares_v2_client.get_snapshot(sn['id']).get(
             'snapshot', self.shares_v2_client.get_snapshot(sn['id']))
 
-    def _delete_snapshot_safe(self, snapshot_id):
-        """Delete a snapshot, ignoring NotFound."""
+    def _cleanup_snapshot(self, snapshot_id, share_id=None):
+        """Register a snapshot with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_snapshot', snapshot_id, self._delete_snapshot,
+            waiter=self._snapshot_deletion_waiter,
+            depends_on=[('share', share_id)])
+
+    def _snapshot_deletion_waiter(self, snapshot_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_snapshot, snapshot_id,
+            kind='share_snapshot', response_key='snapshot',
+            error_states=('error_deleting',), timeout=SHARE_BUILD_TIMEOUT)
+
+    def _delete_snapshot(self, snapshot_id):
+        """Delete a snapshot, first resetting a busy one to available."""
         try:
             snap = self.shares_v2_client.get_snapshot(snapshot_id)
             sn = snap.get('snapshot', snap)
@@ -353,57 +332,38 @@ class PowerScaleRevertSnapshotTest(object):
                 self._wait_for_snapshot_status(snapshot_id, 'available',
                                                timeout=60)
         except lib_exc.NotFound:
-            LOG.debug("Snapshot %s already gone", snapshot_id)
-            return
+            raise
         except Exception as e:
             LOG.warning("Pre-delete check for snapshot %s failed: %s",
                         snapshot_id, e)
-        try:
-            self.shares_v2_client.delete_snapshot(snapshot_id)
-            LOG.info("Requested deletion of snapshot %s", snapshot_id)
-        except lib_exc.NotFound:
-            LOG.debug("Snapshot %s already gone", snapshot_id)
-            return
-        except Exception as e:
-            LOG.warning("Failed to delete snapshot %s: %s",
-                        snapshot_id, e)
-            return
-        self._wait_for_snapshot_deletion(snapshot_id)
+        self.shares_v2_client.delete_snapshot(snapshot_id)
 
     def _wait_for_snapshot_status(self, snapshot_id, target_status,
                                   timeout=SHARE_BUILD_TIMEOUT,
-                                  interval=SHARE_BUILD_INTERVAL):
+                                  interval=None):
         """Poll snapshot status until it reaches target."""
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            snap = self.shares_v2_client.get_snapshot(snapshot_id)
-            sn = snap.get('snapshot', snap)
-            status = sn.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'error_deleting'):
-                self.fail(
-                    f"Snapshot {snapshot_id} entered error state: {status}")
-            time.sleep(interval)
-        self.fail(
-            f"Timeout waiting for snapshot {snapshot_id} to reach "
-            f"'{target_status}'; last status='{last_status}'")
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_snapshot, snapshot_id, target_status,
+                kind='share_snapshot', response_key='snapshot',
+                error_states=('error', 'error_deleting'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     def _wait_for_snapshot_deletion(self, snapshot_id,
                                     timeout=SHARE_BUILD_TIMEOUT,
-                                    interval=SHARE_BUILD_INTERVAL):
+                                    interval=None):
         """Poll until snapshot is gone (NotFound)."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_snapshot(snapshot_id)
-            except lib_exc.NotFound:
-                LOG.info("Snapshot %s deletion confirmed", snapshot_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for snapshot %s deletion", snapshot_id)
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_snapshot, snapshot_id,
+                kind='share_snapshot',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for snapshot %s deletion", snapshot_id)
+            return
+        LOG.info("Snapshot %s deletion confirmed", snapshot_id)
 
     # ------------------------------------------------------------------
     # Revert helper
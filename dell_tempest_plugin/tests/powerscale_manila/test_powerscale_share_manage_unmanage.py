@@ -30,8 +30,6 @@ specific behaviour that is NOT covered generically:
 
 """
 
-import time
-
 from oslo_log import log as logging
 from tempest import clients
 from tempest import config
@@ -40,11 +38,15 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import manila_clients as dell_manila
+from dell_tempest_plugin.common import waiters as dell_waiters
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 SHARE_BUILD_TIMEOUT = 600
-SHARE_BUILD_INTERVAL = 5
 
 
 # ======================================================================
@@ -68,55 +70,19 @@ class PowerScaleManageUnmanageTest(object):
         cls.share_types_client = cls._get_manila_share_types_client(
             cls.admin_manager)
 
+    def setUp(self):
+        super(PowerScaleManageUnmanageTest, self).setUp()
+        dell_budget.start_test_budget(self)
+
     @staticmethod
     def _get_manila_client(manager):
         """Resolve Manila shares client from the manager."""
-        for attr in ('shares_v2_client', 'shares_client',
-                     'share_v2_client', 'share_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        try:
-            from manila_tempest_tests.services.share.v2.json import (
-                shares_client as manila_shares_client)
-            service_type = getattr(CONF, 'share', None)
-            configured_type = getattr(service_type, 'catalog_type',
-                                      None) if service_type else None
-            region = (getattr(service_type, 'region', None)
-                      if service_type else None) or CONF.identity.region
-            endpoint_type = (getattr(service_type, 'endpoint_type', 'public')
-                             if service_type else 'public')
-            catalog_type = configured_type
-            if not catalog_type or catalog_type == 'share':
-                try:
-                    auth_data = manager.auth_provider.get_auth()
-                    catalog = auth_data[1].get('catalog', [])
-                    for entry in catalog:
-                        if entry.get('type') in (
-                                'shared-file-system', 'share'):
-                            catalog_type = entry['type']
-                            break
-                except Exception:
-                    pass
-            catalog_type = catalog_type or 'shared-file-system'
-            return manila_shares_client.SharesV2Client(
-                auth_provider=manager.auth_provider,
-                service=catalog_type,
-                region=region,
-                endpoint_type=endpoint_type,
-            )
-        except ImportError:
-            pass
-        return None
+        return dell_manila.shares_client(manager)
 
     @classmethod
     def _get_manila_share_types_client(cls, manager):
         """Resolve Manila share types client from the manager."""
-        for attr in ('share_types_v2_client', 'share_types_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        return cls._get_manila_client(manager)
+        return dell_manila.share_types_client(manager)
 
     # ------------------------------------------------------------------
     # Share type helpers
@@ -135,18 +101,14 @@ class PowerScaleManageUnmanageTest(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) with specs=%s",
                  st['name'], st['id'], specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
+        self._cleanup_share_type(st['id'])
         return st
 
-    def _delete_share_type_safe(self, share_type_id):
-        try:
-            self.share_types_client.delete_share_type(share_type_id)
-            LOG.info("Deleted share type %s", share_type_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share type %s already gone", share_type_id)
-        except Exception as e:
-            LOG.warning("Failed to delete share type %s: %s",
-                        share_type_id, e)
+    def _cleanup_share_type(self, share_type_id):
+        """Register a share type with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_type', share_type_id,
+            self.share_types_client.delete_share_type)
 
     # ------------------------------------------------------------------
     # Share helpers
@@ -164,57 +126,54 @@ class PowerScaleManageUnmanageTest(object):
         sh = share.get('share', share)
         LOG.info("Created share '%s' (id=%s, protocol=%s, size=%dG)",
                  sh['name'], sh['id'], protocol, size)
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         return self.shares_v2_client.get_share(sh['id']).get(
             'share', self.shares_v2_client.get_share(sh['id']))
 
-    def _delete_share_safe(self, share_id):
-        try:
-            self.shares_v2_client.delete_share(share_id)
-            LOG.info("Requested deletion of share %s", share_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share %s already gone", share_id)
-            return
-        except Exception as e:
-            LOG.warning("Failed to delete share %s: %s", share_id, e)
-            return
-        self._wait_for_share_deletion(share_id)
+    def _cleanup_share(self, share_id, share_type_id=None):
+        """Register a share with the test's cleanup executor.
+
+        Shares of one test are deleted together and their deletions
+        awaited in one batch before any share type is removed.
+        """
+        dell_cleanup.get_executor(self).add(
+            'share', share_id, self.shares_v2_client.delete_share,
+            waiter=self._share_deletion_waiter,
+            depends_on=[('share_type', share_type_id)])
+
+    def _share_deletion_waiter(self, share_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_share, share_id, kind='share',
+            response_key='share', error_states=('error_deleting',),
+            timeout=SHARE_BUILD_TIMEOUT)
 
     def _wait_for_share_status(self, share_id, target_status,
                                timeout=SHARE_BUILD_TIMEOUT,
-                               interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            share = self.shares_v2_client.get_share(share_id)
-            sh = share.get('share', share)
-            status = sh.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'error_deleting',
-                          'manage_error', 'shrinking_error',
-                          'extending_error'):
-                self.fail(
-                    f"Share {share_id} entered error state: {status}")
-            time.sleep(interval)
-        self.fail(
-            f"Timeout waiting for share {share_id} to reach "
-            f"'{target_status}'; last status='{last_status}'")
+                               interval=None):
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, target_status,
+                kind='share',
+                response_key='share',
+                error_states=('error', 'error_deleting',
+                              'manage_error', 'shrinking_error',
+                              'extending_error'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     def _wait_for_share_deletion(self, share_id,
                                  timeout=SHARE_BUILD_TIMEOUT,
-                                 interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_share(share_id)
-            except lib_exc.NotFound:
-                LOG.info("Share %s deletion confirmed", share_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for share %s deletion", share_id)
+                                 interval=None):
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_share, share_id, kind='share',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for share %s deletion", share_id)
+            return
+        LOG.info("Share %s deletion confirmed", share_id)
 
     # ------------------------------------------------------------------
     # Manage / Unmanage helpers
@@ -261,7 +220,7 @@ class PowerScaleManageUnmanageTest(object):
         sh = share.get('share', share)
         LOG.info("Manage request for share '%s' (id=%s, export=%s)",
                  sh['name'], sh['id'], export_path)
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         return self.shares_v2_client.get_share(sh['id']).get(
             'share', self.shares_v2_client.get_share(sh['id']))
@@ -31,8 +31,6 @@ References (from share-shrink.patch):
   - Error status: shrinking_possible_data_loss_error (new_size < used)
 """
 
-import time
-
 from oslo_log import log as logging
 from tempest import clients
 from tempest import config
@@ -41,11 +39,16 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import manila_clients as dell_manila
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin.services import powerscale_client
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 SHARE_BUILD_TIMEOUT = 600
-SHARE_BUILD_INTERVAL = 5
 
 
 class PowerScaleShrinkShareTest(object):
@@ -66,55 +69,19 @@ class PowerScaleShrinkShareTest(object):
         cls.share_types_client = cls._get_manila_share_types_client(
             cls.admin_manager)
 
+    def setUp(self):
+        super(PowerScaleShrinkShareTest, self).setUp()
+        dell_budget.start_test_budget(self)
+
     @staticmethod
     def _get_manila_client(manager):
         """Resolve Manila shares client from the manager."""
-        for attr in ('shares_v2_client', 'shares_client',
-                     'share_v2_client', 'share_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        try:
-            from manila_tempest_tests.services.share.v2.json import (
-                shares_client as manila_shares_client)
-            service_type = getattr(CONF, 'share', None)
-            configured_type = getattr(service_type, 'catalog_type',
-                                      None) if service_type else None
-            region = (getattr(service_type, 'region', None)
-                      if service_type else None) or CONF.identity.region
-            endpoint_type = (getattr(service_type, 'endpoint_type', 'public')
-                             if service_type else 'public')
-            catalog_type = configured_type
-            if not catalog_type or catalog_type == 'share':
-                try:
-                    auth_data = manager.auth_provider.get_auth()
-                    catalog = auth_data[1].get('catalog', [])
-                    for entry in catalog:
-                        if entry.get('type') in (
-                                'shared-file-system', 'share'):
-                            catalog_type = entry['type']
-                            break
-                except Exception:
-                    pass
-            catalog_type = catalog_type or 'shared-file-system'
-            return manila_shares_client.SharesV2Client(
-                auth_provider=manager.auth_provider,
-                service=catalog_type,
-                region=region,
-                endpoint_type=endpoint_type,
-            )
-        except ImportError:
-            pass
-        return None
+        return dell_manila.shares_client(manager)
 
     @classmethod
     def _get_manila_share_types_client(cls, manager):
         """Resolve Manila share types client from the manager."""
-        for attr in ('share_types_v2_client', 'share_types_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        return cls._get_manila_client(manager)
+        return dell_manila.share_types_client(manager)
 
     # ------------------------------------------------------------------
     # Share type helpers
@@ -138,19 +105,14 @@ class PowerScaleShrinkShareTest(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) with specs=%s",
                  st['name'], st['id'], specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
+        self._cleanup_share_type(st['id'])
         return st
 
-    def _delete_share_type_safe(self, share_type_id):
-        """Delete share type, ignoring NotFound."""
-        try:
-            self.share_types_client.delete_share_type(share_type_id)
-            LOG.info("Deleted share type %s", share_type_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share type %s already gone", share_type_id)
-        except Exception as e:
-            LOG.warning("Failed to delete share type %s: %s",
-                        share_type_id, e)
+    def _cleanup_share_type(self, share_type_id):
+        """Register a share type with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_type', share_type_id,
+            self.share_types_client.delete_share_type)
 
     # ------------------------------------------------------------------
     # Share helpers
@@ -175,13 +137,30 @@ class PowerScaleShrinkShareTest(object):
         sh = share.get('share', share)
         LOG.info("Created share '%s' (id=%s, protocol=%s, size=%sG)",
                  sh['name'], sh['id'], protocol, size)
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         return self.shares_v2_client.get_share(sh['id']).get(
             'share', self.shares_v2_client.get_share(sh['id']))
 
-    def _delete_share_safe(self, share_id):
-        """Delete a share and wait for it to be removed."""
+    def _cleanup_share(self, share_id, share_type_id=None):
+        """Register a share with the test's cleanup executor.
+
+        Shares of one test are deleted together and their deletions
+        awaited in one batch before any share type is removed.
+        """
+        dell_cleanup.get_executor(self).add(
+            'share', share_id, self._delete_share,
+            waiter=self._share_deletion_waiter,
+            depends_on=[('share_type', share_type_id)])
+
+    def _share_deletion_waiter(self, share_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_share, share_id, kind='share',
+            response_key='share', error_states=('error_deleting',),
+            timeout=SHARE_BUILD_TIMEOUT)
+
+    def _delete_share(self, share_id):
+        """Delete a share, first resetting a failed shrink to available."""
         try:
             share = self.shares_v2_client.get_share(share_id)
             sh = share.get('share', share)
@@ -195,56 +174,38 @@ class PowerScaleShrinkShareTest(object):
                 self._wait_for_share_status(share_id, 'available',
                                             timeout=60)
         except lib_exc.NotFound:
-            LOG.debug("Share %s already gone", share_id)
-            return
+            raise
         except Exception as e:
             LOG.warning("Pre-delete check for share %s failed: %s",
                         share_id, e)
-        try:
-            self.shares_v2_client.delete_share(share_id)
-            LOG.info("Requested deletion of share %s", share_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share %s already gone", share_id)
-            return
-        except Exception as e:
-            LOG.warning("Failed to delete share %s: %s", share_id, e)
-            return
-        self._wait_for_share_deletion(share_id)
+        self.shares_v2_client.delete_share(share_id)
 
     def _wait_for_share_status(self, share_id, target_status,
                                timeout=SHARE_BUILD_TIMEOUT,
-                               interval=SHARE_BUILD_INTERVAL):
+                               interval=None):
         """Poll share status until it reaches target or errors out."""
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            share = self.shares_v2_client.get_share(share_id)
-            sh = share.get('share', share)
-            status = sh.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'error_deleting'):
-                self.fail(
-                    f"Share {share_id} entered error state: {status}")
-            time.sleep(interval)
-        self.fail(
-            f"Timeout waiting for share {share_id} to reach "
-            f"'{target_status}'; last status='{last_status}'")
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, target_status,
+                kind='share',
+                response_key='share',
+                error_states=('error', 'error_deleting'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     def _wait_for_share_deletion(self, share_id,
                                  timeout=SHARE_BUILD_TIMEOUT,
-                                 interval=SHARE_BUILD_INTERVAL):
+                                 interval=None):
         """Poll until share is gone (NotFound)."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_share(share_id)
-            except lib_exc.NotFound:
-                LOG.info("Share %s deletion confirmed", share_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for share %s deletion", share_id)
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_share, share_id, kind='share',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for share %s deletion", share_id)
+            return
+        LOG.info("Share %s deletion confirmed", share_id)
 
     def _get_export_locations(self, share_id):
         """Retrieve export locations for a share via the dedicated API."""
@@ -267,6 +228,7 @@ class PowerScaleShrinkShareTest(object):
         LOG.info("Shrinking share %s to %sG", share_id, new_size)
         self.shares_v2_client.shrink_share(share_id, new_size)
         self._wait_for_share_status(share_id, 'available')
+        self._verify_backend_quota(share_id, new_size)
         share = self.shares_v2_client.get_share(share_id)
         return share.get('share', share)
 
@@ -280,9 +242,40 @@ class PowerScaleShrinkShareTest(object):
         LOG.info("Extending share %s to %sG", share_id, new_size)
         self.shares_v2_client.extend_share(share_id, new_size)
         self._wait_for_share_status(share_id, 'available')
+        self._verify_backend_quota(share_id, new_size)
         share = self.shares_v2_client.get_share(share_id)
         return share.get('share', share)
 
+    # ------------------------------------------------------------------
+    # PowerScale backend verification
+    # ------------------------------------------------------------------
+    def _get_backend_path(self, share_id):
+        """Return the /ifs directory of an NFS share, or None."""
+        for el in self._get_export_locations(share_id):
+            path = el.get('path', '') if isinstance(el, dict) else el
+            if ':/ifs/' in path:
+                return path.split(':', 1)[1]
+        return None
+
+    def _verify_backend_quota(self, share_id, size_gb):
+        """Check the hard quota of the share directory on PowerScale.
+
+        Skipped when no PowerScale backend is configured in manila.conf
+        or the share has no NFS export to derive the directory from.
+        """
+        client = powerscale_client.from_manila_conf()
+        path = self._get_backend_path(share_id) if client else None
+        if not path:
+            return
+        quota = client.get_quota(path)
+        self.assertIsNotNone(
+            quota, "No PowerScale quota found for %s" % path)
+        self.assertEqual(
+            size_gb * (1024 ** 3), quota.get('thresholds', {}).get('hard'),
+            "PowerScale hard quota of %s does not match %sG"
+            % (path, size_gb))
+        LOG.info("PowerScale quota of %s is %sG", path, size_gb)
+
 
 # ===================================================================
 # NFS Share Shrink Tests
@@ -15,6 +15,10 @@ References:
 import time
 import json
 
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import waiters as dell_waiters
 import dell_tempest_plugin.tests.base.test_dell_base as dell_base
 
 from tempest.lib import decorators
@@ -30,7 +34,6 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 MIGRATION_TIMEOUT = 1800  # seconds (adjust for your env)
-MIGRATION_POLL_INTERVAL = 10  # seconds
 
 
 class PowerStoreTempestTest(dell_base.BaseTempestTest):
@@ -112,6 +115,7 @@ class PowerStoreMigrateVolumeTest(volume_base.BaseVolumeAdminTest):
     def setUp(self):
         """Instance-level setup so clients exist and are safe to use."""
         super(PowerStoreMigrateVolumeTest, self).setUp()
+        dell_budget.start_test_budget(self)
 
         self.vols = self._get_admin_volumes_client()
         self.vtypes = self._get_admin_volume_types_client()
@@ -171,21 +175,25 @@ class PowerStoreMigrateVolumeTest(volume_base.BaseVolumeAdminTest):
             name=data_utils.rand_name(f'ps-type-{backend_name}'),
         )['volume_type']
         # Safe deletion on cleanup
-        self.addCleanup(self._delete_volume_type_safe, vt['id'])
+        self._cleanup_volume_type(vt['id'])
         LOG.info("Created volume type %s (%s) with volume_backend_name=%s",
                  vt['name'], vt['id'], backend_name)
         return vt
 
     def _create_powerstore_volume_type(self):
         """
-        Create a volume type pointing to the PowerStore backend.
+        Return a volume type pointing to the PowerStore backend.
         Adjust backend_name if your cinder.conf uses a different string.
+        The type is shared by the worker's tests (see type_registry).
         """
+        return dell_types.acquire(
+            self, 'volume_type', {}, self._new_powerstore_volume_type)
+
+    def _new_powerstore_volume_type(self, name=None):
         backend_name = 'powerstore'  # e.g., 'Dell PowerStore' if configured differently
         vt = self.vtypes.create_volume_type(
-            name=data_utils.rand_name('powerstore-type'),
+            name=name or data_utils.rand_name('powerstore-type'),
         )['volume_type']
-        self.addCleanup(self.vtypes.delete_volume_type, vt['id'])
         LOG.info("Created volume type %s (%s) with backend_name=%s", vt['name'], vt['id'], backend_name)
         return vt
 
@@ -197,7 +205,7 @@ class PowerStoreMigrateVolumeTest(volume_base.BaseVolumeAdminTest):
             volume_type=vt_name
         )['volume']
         # Robust cleanup (delete and wait until gone)
-        self.addCleanup(self._delete_volume_and_wait, vol['id'])
+        self._cleanup_volume(vol['id'])
 
         # Wait until it becomes 'available'
         try:
@@ -212,83 +220,36 @@ class PowerStoreMigrateVolumeTest(volume_base.BaseVolumeAdminTest):
         LOG.info("Volume %s is available on host '%s'", vol_info['id'], host)
         return vol_info
 
-    def _wait_until_volume_status(self, volume_id, target='available', timeout=600, interval=5):
+    def _wait_until_volume_status(self, volume_id, target='available', timeout=600, interval=None):
         """Fallback waiter for older Tempest builds."""
-        end = time.time() + timeout
-        last = None
-        while time.time() < end:
-            v = self.vols.show_volume(volume_id)['volume']
-            status = (v.get('status') or '').lower()
-            last = status
-            if status == target:
-                return
-            if status in ('error', 'error_restoring', 'error_extending'):
-                self.fail(f"Volume {volume_id} entered failure status: {status}")
-            time.sleep(interval)
-        self.fail(f"Timeout waiting for volume {volume_id} to reach '{target}', last='{last}'")
-
-    # --- deletion waiter improvements ---
-    def _has_waiter(self, name: str) -> bool:
-        """Return True if tempest.common.waiters exposes the given attribute."""
-        try:
-            import tempest.common.waiters as w
-            return hasattr(w, name)
-        except Exception:
-            return False
-
-    def _wait_until_volume_deleted(self, vol_id, timeout=600, interval=1.0, backoff=1.5, max_interval=10.0):
-        """Local fallback waiter for deletion: polls show_volume until NotFound."""
-        deadline = time.time() + timeout
-        delay = max(0.1, float(interval))
-        last_err = None
-
-        while time.time() < deadline:
-            try:
-                self.vols.show_volume(vol_id)  # still present
-            except lib_exc.NotFound:
-                return
-            except Exception as e:
-                last_err = e
-                LOG.debug("show_volume(%s) error during deletion wait: %s", vol_id, e)
-
-            time.sleep(delay)
-            delay = min(delay * backoff, max_interval)
-
-        msg = f"Timeout waiting for volume {vol_id} deletion (last error: {last_err})"
-        LOG.error(msg)
-        raise lib_exc.TempestException(msg)
-
-    def _delete_volume_and_wait(self, vol_id, timeout=600, interval=1.0):
-        """Delete a volume and wait until it is gone (feature-probe Tempest waiters quietly)."""
-        LOG.info("Deleting volume %s and waiting until it vanishes...", vol_id)
         try:
-            self.vols.delete_volume(vol_id)
-        except lib_exc.NotFound:
-            LOG.info("Volume %s not found at delete request time; treating as deleted.", vol_id)
-            return
-        except Exception as e:
-            LOG.debug("delete_volume(%s) raised: %s (continuing to wait for deletion)", vol_id, e)
-
-        try:
-            import tempest.common.waiters as w
-
-            if self._has_waiter('wait_for_resource_deletion'):
-                LOG.debug("Using Tempest waiters.wait_for_resource_deletion for volume %s", vol_id)
-                w.wait_for_resource_deletion(self.vols, vol_id, timeout=timeout, interval=interval)
-                return
-
-            if self._has_waiter('wait_for_volume_resource_deletion'):
-                LOG.debug("Using Tempest waiters.wait_for_volume_resource_deletion for volume %s", vol_id)
-                w.wait_for_volume_resource_deletion(self.vols, vol_id, timeout=timeout, interval=interval)
-                return
-
-        except Exception as e:
-            LOG.debug("Tempest waiter import/use failed for volume %s: %s; using local poller.", vol_id, e)
-
-        self._wait_until_volume_deleted(vol_id, timeout=timeout, interval=interval)
-        LOG.info("Volume %s deletion confirmed.", vol_id)
+            dell_waiters.wait_for_status(
+                self.vols.show_volume, volume_id, target, kind='volume',
+                response_key='volume',
+                error_states=('error', 'error_restoring', 'error_extending'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
+
+    # --- cleanup registration ---
+    def _cleanup_volume(self, vol_id, type_id=None):
+        """Register a volume with the test's cleanup executor.
+
+        Volumes are deleted concurrently and awaited in one batch before
+        their volume types are removed.
+        """
+        dell_cleanup.get_executor(self).add(
+            'volume', vol_id, self.vols.delete_volume,
+            waiter=lambda vid: dell_waiters.deletion_waiter(
+                self.vols.show_volume, vid, kind='volume',
+                response_key='volume', error_states=('error_deleting',)),
+            depends_on=[('volume_type', type_id)])
+
+    def _cleanup_volume_type(self, type_id):
+        """Register a volume type; deletion retries while it is in use."""
+        dell_cleanup.get_executor(self).add(
+            'volume_type', type_id, self._delete_volume_type_safe)
 
-    
     def _migrate_volume_admin(self, volume_id, dest_host, force_host_copy=False):
         """Admin migration using the legacy 'os-migrate_volume' action.
 
@@ -348,27 +309,33 @@ class PowerStoreMigrateVolumeTest(volume_base.BaseVolumeAdminTest):
 
     def _wait_for_migration(self, volume_id, target_host):
         """Poll until migration completes (host equals target or status=='success')."""
-        deadline = time.time() + MIGRATION_TIMEOUT
-        last_status = None
-        while time.time() < deadline:
-            vol = self.vols.show_volume(volume_id)['volume']
+        def _migrated(vol):
             host = vol.get('os-vol-host-attr:host') or vol.get('host')
             mstatus = (vol.get('migration_status') or '').lower()
-            last_status = mstatus
-            LOG.info("Polling vol=%s host='%s' migration_status='%s'",
-                     volume_id, host, mstatus)
-            if host == target_host or mstatus == 'success':
-                LOG.info("Migration succeeded for vol=%s: host='%s', status='%s'",
-                         volume_id, host, mstatus)
-                return vol
-            if mstatus in ('error', 'failed'):
-                self.fail(f"Migration failed for vol={volume_id} with status={mstatus}")
-            time.sleep(MIGRATION_POLL_INTERVAL)
-        self.fail(f"Migration timed out for vol={volume_id}; last status={last_status}")
+            return host == target_host or mstatus == 'success'
+
+        def _failed(vol):
+            return (vol.get('migration_status') or '').lower() in ('error', 'failed')
+
+        poller = dell_waiters.volume_changes_poller(
+            self.vols, kind='migration', status_key='migration_status',
+            timeout=MIGRATION_TIMEOUT)
+        poller.watch(volume_id, _migrated, is_error=_failed,
+                     target=f"host '{target_host}'")
+        try:
+            vol = poller.wait()[volume_id]
+        except dell_waiters.ResourceErrorState as e:
+            self.fail(f"Migration failed for vol={volume_id}: {e}")
+        except dell_waiters.WaitTimeout as e:
+            self.fail(f"Migration timed out for vol={volume_id}: {e}")
+        LOG.info("Migration succeeded for vol=%s: host='%s', status='%s'",
+                 volume_id, vol.get('os-vol-host-attr:host') or vol.get('host'),
+                 vol.get('migration_status'))
+        return vol
 
     def _delete_volume_type_safe(self, type_id, timeout=300, interval=5):
         """Try to delete a type; if still in use, retry briefly then log."""
-        end = time.time() + timeout
+        end = time.time() + dell_budget.cap(timeout)
         while time.time() < end:
             try:
                 self.vtypes.delete_volume_type(type_id)
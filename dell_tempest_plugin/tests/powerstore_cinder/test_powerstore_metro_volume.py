@@ -45,11 +45,9 @@ Patch reference: https://review.opendev.org/c/openstack/cinder/+/933628
   - options.py: powerstore_host_connectivity config option
 """
 
-import configparser
 import time
 
 from oslo_log import log as logging
-import requests
 from tempest.api.volume import base as volume_base
 from tempest.common import waiters
 from tempest import config
@@ -57,17 +55,23 @@ from tempest.lib.common.utils import data_utils
 from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 
+from dell_tempest_plugin.common import backend_config as dell_backends
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import inventory as dell_inventory
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin.services import powerstore_client
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 VOLUME_BUILD_TIMEOUT = 600
-VOLUME_BUILD_INTERVAL = 5
 
 
 # ======================================================================
 # Helper mixin — no test methods
 # ======================================================================
-class PowerStoreMetroVolumeBase(object):
+class PowerStoreMetroVolumeBase(dell_inventory.LeakCheckMixin):
     """Mixin providing helpers for PowerStore metro volume functional tests.
 
     Provides:
@@ -132,6 +136,7 @@ class PowerStoreMetroVolumeBase(object):
     # ------------------------------------------------------------------
     def setUp(self):
         super(PowerStoreMetroVolumeBase, self).setUp()
+        dell_budget.start_test_budget(self)
         self.vols = self._get_admin_volumes_client()
         self.vtypes = self._get_admin_volume_types_client()
         self.snaps = self._get_admin_snapshots_client()
@@ -193,46 +198,29 @@ class PowerStoreMetroVolumeBase(object):
 
     def _read_powerstore_credentials(self):
         """Read PowerStore REST API credentials from cinder.conf."""
-        sections = ['powerstore', 'powerstore1', 'backend_defaults']
-        try:
-            conf = configparser.ConfigParser()
-            conf.read('/etc/cinder/cinder.conf')
-            for section in sections:
-                try:
-                    ps_ip = conf.get(section, 'san_ip')
-                    ps_user = conf.get(section, 'san_login')
-                    ps_pass = conf.get(section, 'san_password')
-                    LOG.info("PowerStore creds found in [%s]", section)
-                    return ps_ip, ps_user, ps_pass
-                except (configparser.NoSectionError,
-                        configparser.NoOptionError):
-                    continue
-            LOG.warning("No PowerStore creds found in cinder.conf "
-                        "sections: %s", sections)
-            return None, None, None
-        except Exception as e:
-            LOG.warning("Cannot read PowerStore creds from cinder.conf: %s",
-                        e)
+        backend = dell_backends.cinder().find(
+            'powerstore', names=['powerstore', 'powerstore1'])
+        if backend is None:
+            LOG.warning("No PowerStore backend found in cinder.conf")
             return None, None, None
+        LOG.info("PowerStore creds found in [%s]", backend.section)
+        return backend.host, backend.user, backend.password
 
     # ------------------------------------------------------------------
     # PowerStore REST API helpers (direct backend verification)
     # ------------------------------------------------------------------
+    def _ps_client(self):
+        """Return the worker's shared PowerStore REST client."""
+        return powerstore_client.get_client(
+            self.ps_ip, self.ps_user, self.ps_pass)
+
     def _ps_get(self, path, params=None):
         """GET from PowerStore REST API."""
-        url = 'https://%s/api/rest%s' % (self.ps_ip, path)
-        resp = requests.get(url, params=params,
-                            auth=(self.ps_user, self.ps_pass),
-                            verify=False, timeout=30)
-        return resp
+        return self._ps_client().request('GET', path, params=params)
 
     def _ps_post(self, path, payload=None):
         """POST to PowerStore REST API."""
-        url = 'https://%s/api/rest%s' % (self.ps_ip, path)
-        resp = requests.post(url, json=payload,
-                             auth=(self.ps_user, self.ps_pass),
-                             verify=False, timeout=30)
-        return resp
+        return self._ps_client().request('POST', path, payload=payload)
 
     def _ps_get_volume_by_name(self, name):
         """Query PowerStore for a volume by name.
@@ -331,7 +319,7 @@ class PowerStoreMetroVolumeBase(object):
             name=name, extra_specs=specs)['volume_type']
         LOG.info("Created metro volume type '%s' (id=%s) with specs=%s",
                  vt['name'], vt['id'], specs)
-        self.addCleanup(self._delete_volume_type_safe, vt['id'])
+        self._cleanup_volume_type(vt['id'])
         return vt
 
     def _create_normal_volume_type(self):
@@ -344,11 +332,16 @@ class PowerStoreMetroVolumeBase(object):
             name=name, extra_specs=specs)['volume_type']
         LOG.info("Created normal volume type '%s' (id=%s)", vt['name'],
                  vt['id'])
-        self.addCleanup(self._delete_volume_type_safe, vt['id'])
+        self._cleanup_volume_type(vt['id'])
         return vt
 
+    def _cleanup_volume_type(self, type_id):
+        """Register a volume type; deletion retries while it is in use."""
+        dell_cleanup.get_executor(self).add(
+            'volume_type', type_id, self._delete_volume_type_safe)
+
     def _delete_volume_type_safe(self, type_id, timeout=300, interval=5):
-        end = time.time() + timeout
+        end = time.time() + dell_budget.cap(timeout)
         while time.time() < end:
             try:
                 self.vtypes.delete_volume_type(type_id)
@@ -376,7 +369,7 @@ class PowerStoreMetroVolumeBase(object):
             size=size,
             volume_type=vt_name,
         )['volume']
-        self.addCleanup(self._delete_volume_safe, vol['id'])
+        self._cleanup_volume(vol['id'])
         waiters.wait_for_volume_resource_status(
             self.vols, vol['id'], 'available')
         vol_info = self.vols.show_volume(vol['id'])['volume']
@@ -387,50 +380,41 @@ class PowerStoreMetroVolumeBase(object):
                  vol_info.get('replication_status'))
         return vol_info
 
-    def _delete_volume_safe(self, vol_id):
-        try:
-            self.vols.delete_volume(vol_id)
-        except lib_exc.NotFound:
-            return
-        except Exception as e:
-            LOG.debug("delete_volume(%s) raised: %s", vol_id, e)
-        try:
-            self.vols.wait_for_resource_deletion(vol_id)
-        except lib_exc.NotFound:
-            pass
-        except Exception:
-            self._wait_for_volume_deletion(vol_id)
+    def _cleanup_volume(self, vol_id):
+        """Register a volume with the test's cleanup executor.
+
+        Volumes are deleted concurrently and awaited in one batch before
+        their volume types are removed.
+        """
+        dell_cleanup.get_executor(self).add(
+            'volume', vol_id, self.vols.delete_volume,
+            waiter=lambda vid: dell_waiters.deletion_waiter(
+                self.vols.show_volume, vid, kind='volume',
+                response_key='volume', error_states=('error_deleting',),
+                timeout=VOLUME_BUILD_TIMEOUT))
 
     def _wait_for_volume_deletion(self, vol_id,
                                   timeout=VOLUME_BUILD_TIMEOUT,
-                                  interval=VOLUME_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.vols.show_volume(vol_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for volume %s deletion", vol_id)
+                                  interval=None):
+        try:
+            dell_waiters.wait_for_deletion(
+                self.vols.show_volume, vol_id, kind='volume',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for volume %s deletion", vol_id)
 
     def _wait_for_volume_status(self, vol_id, target,
                                 timeout=VOLUME_BUILD_TIMEOUT,
-                                interval=VOLUME_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        last = None
-        while time.time() < deadline:
-            v = self.vols.show_volume(vol_id)['volume']
-            status = (v.get('status') or '').lower()
-            last = status
-            if status == target:
-                return v
-            if status in ('error', 'error_restoring', 'error_extending',
-                          'error_managing'):
-                self.fail("Volume %s entered error state: %s"
-                          % (vol_id, status))
-            time.sleep(interval)
-        self.fail("Timeout waiting for volume %s to reach '%s'; "
-                  "last='%s'" % (vol_id, target, last))
+                                interval=None):
+        try:
+            return dell_waiters.wait_for_status(
+                self.vols.show_volume, vol_id, target,
+                kind='volume', response_key='volume',
+                error_states=('error', 'error_restoring',
+                              'error_extending', 'error_managing'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     # ------------------------------------------------------------------
     # Snapshot helpers
@@ -444,7 +428,7 @@ class PowerStoreMetroVolumeBase(object):
             volume_id=volume_id,
             display_name=snap_name,
         )['snapshot']
-        self.addCleanup(self._delete_snapshot_safe, snap['id'])
+        self._cleanup_snapshot(snap['id'], volume_id)
         waiters.wait_for_volume_resource_status(
             self.snaps, snap['id'], 'available')
         snap_info = self.snaps.show_snapshot(snap['id'])['snapshot']
@@ -452,17 +436,15 @@ class PowerStoreMetroVolumeBase(object):
                  snap_info['id'], volume_id)
         return snap_info
 
-    def _delete_snapshot_safe(self, snap_id):
-        try:
-            self.snaps.delete_snapshot(snap_id)
-        except lib_exc.NotFound:
-            return
-        except Exception as e:
-            LOG.debug("delete_snapshot(%s) raised: %s", snap_id, e)
-        try:
-            self.snaps.wait_for_resource_deletion(snap_id)
-        except (lib_exc.NotFound, Exception):
-            pass
+    def _cleanup_snapshot(self, snap_id, volume_id=None):
+        """Register a snapshot; it is deleted before *volume_id*."""
+        dell_cleanup.get_executor(self).add(
+            'volume_snapshot', snap_id, self.snaps.delete_snapshot,
+            waiter=lambda sid: dell_waiters.deletion_waiter(
+                self.snaps.show_snapshot, sid, kind='volume_snapshot',
+                response_key='snapshot', error_states=('error_deleting',),
+                timeout=VOLUME_BUILD_TIMEOUT),
+            depends_on=[('volume', volume_id)])
 
 
 # ======================================================================
@@ -718,9 +700,10 @@ class PowerStoreMetroVolumeTest(PowerStoreMetroVolumeBase,
         try:
             self.vols.revert_volume_to_snapshot(vol['id'],
                                                 snap['id'])
-            # If the API accepted, wait and check
-            time.sleep(10)
-            vol_after = self.vols.show_volume(vol['id'])['volume']
+            # If the API accepted, wait for the revert to settle
+            vol_after = dell_waiters.settle_volume(
+                self.vols, vol['id'], ('error', 'error_restoring'),
+                timeout=VOLUME_BUILD_TIMEOUT)
             status = vol_after.get('status', '').lower()
             if status in ('error', 'error_restoring'):
                 LOG.info("Revert correctly failed with status '%s' "
@@ -37,10 +37,6 @@ This file covers PowerStore-specific behaviour:
   * Negative: manage with nonexistent source-name
 """
 
-import configparser
-import time
-
-import requests
 from oslo_log import log as logging
 from tempest.api.volume import base as volume_base
 from tempest.common import waiters
@@ -49,17 +45,26 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import admin_clients
+from dell_tempest_plugin.common import backend_config as dell_backends
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import inventory as dell_inventory
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin.common import warm_pool as dell_pools
+from dell_tempest_plugin.services import powerstore_client
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 VOLUME_BUILD_TIMEOUT = 600
-VOLUME_BUILD_INTERVAL = 5
 
 
 # ======================================================================
 # Base mixin — helpers only, no test methods
 # ======================================================================
-class PowerStoreSnapshotManageUnmanageBase(object):
+class PowerStoreSnapshotManageUnmanageBase(dell_inventory.LeakCheckMixin):
     """Mixin providing helpers for PowerStore snapshot manage/unmanage tests.
 
     All heavy lifting (volume type creation, volume/snapshot creation,
@@ -139,6 +144,7 @@ class PowerStoreSnapshotManageUnmanageBase(object):
     # ------------------------------------------------------------------
     def setUp(self):
         super(PowerStoreSnapshotManageUnmanageBase, self).setUp()
+        dell_budget.start_test_budget(self)
         self.vols = self._get_admin_volumes_client()
         self.snaps = self._get_admin_snapshots_client()
         self.snap_manage = self._get_admin_snapshot_manage_client()
@@ -201,44 +207,42 @@ class PowerStoreSnapshotManageUnmanageBase(object):
     # Volume type helpers
     # ------------------------------------------------------------------
     def _create_powerstore_volume_type(self, extra_specs=None):
-        """Create a volume type targeting the PowerStore backend."""
-        name = data_utils.rand_name(
-            prefix=CONF.resource_name_prefix,
-            name='ps-snap-manage-type')
+        """Return a volume type targeting the PowerStore backend.
+
+        The type is shared by every test of the worker asking for the
+        same extra specs (see ``type_registry``).
+        """
         specs = {'volume_backend_name': getattr(
             self, 'powerstore_backend_name', 'powerstore')}
         if extra_specs:
             specs.update(extra_specs)
+        return dell_types.acquire(
+            self, 'volume_type', specs,
+            lambda name: self._new_volume_type(specs, name))
+
+    def _new_volume_type(self, specs, name=None):
+        name = name or data_utils.rand_name(
+            prefix=CONF.resource_name_prefix,
+            name='ps-snap-manage-type')
         vt = self.vtypes.create_volume_type(
             name=name, extra_specs=specs)['volume_type']
         LOG.info("Created volume type '%s' (id=%s) with specs=%s",
                  vt['name'], vt['id'], specs)
-        self.addCleanup(self._delete_volume_type_safe, vt['id'])
         return vt
 
-    def _delete_volume_type_safe(self, type_id, timeout=300, interval=5):
-        """Try to delete a volume type; retry if still in use."""
-        end = time.time() + timeout
-        while time.time() < end:
-            try:
-                self.vtypes.delete_volume_type(type_id)
-                return
-            except lib_exc.BadRequest:
-                LOG.info("Volume type %s still in use; retrying...", type_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        try:
-            self.vtypes.delete_volume_type(type_id)
-        except Exception as e:
-            LOG.warning("Final delete of volume type %s failed: %s",
-                        type_id, e)
-
     # ------------------------------------------------------------------
     # Volume helpers
     # ------------------------------------------------------------------
     def _create_volume(self, vt_name, size=1):
-        """Create a volume on PowerStore and wait until available."""
+        """Create a volume on PowerStore and wait until available.
+
+        With warm pools enabled, a pre-created volume is leased instead.
+        """
+        pool = self._volume_pool(vt_name, size)
+        vol = pool.lease() if pool else None
+        if vol is not None:
+            self.addCleanup(pool.recycle, vol['id'])
+            return vol
         vol = self.vols.create_volume(
             name=data_utils.rand_name(
                 prefix=CONF.resource_name_prefix,
@@ -246,7 +250,7 @@ class PowerStoreSnapshotManageUnmanageBase(object):
             size=size,
             volume_type=vt_name,
         )['volume']
-        self.addCleanup(self._delete_volume_safe, vol['id'])
+        self._cleanup_volume(vol['id'])
         waiters.wait_for_volume_resource_status(
             self.vols, vol['id'], 'available')
         vol_info = self.vols.show_volume(vol['id'])['volume']
@@ -256,33 +260,44 @@ class PowerStoreSnapshotManageUnmanageBase(object):
                  vol_info.get('provider_id'))
         return vol_info
 
-    def _delete_volume_safe(self, vol_id):
-        """Delete a volume; ignore NotFound."""
-        try:
-            self.vols.delete_volume(vol_id)
-        except lib_exc.NotFound:
-            return
-        except Exception as e:
-            LOG.debug("delete_volume(%s) raised: %s", vol_id, e)
-        try:
-            self.vols.wait_for_resource_deletion(vol_id)
-        except lib_exc.NotFound:
-            pass
-        except Exception:
-            self._wait_for_volume_deletion(vol_id)
+    def _volume_pool(self, vt_name, size):
+        """Return the warm pool of *size* GB volumes of *vt_name*.
 
-    def _wait_for_volume_deletion(self, vol_id,
-                                  timeout=VOLUME_BUILD_TIMEOUT,
-                                  interval=VOLUME_BUILD_INTERVAL):
-        """Poll until a volume is gone."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.vols.show_volume(vol_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for volume %s deletion", vol_id)
+        The pool outlives the class, so its volumes are created and
+        deleted with the static admin clients, not ``self.vols``.
+        """
+        vols = admin_clients.volumes_client()
+        if vols is None:
+            return None
+        return dell_pools.get_pool(
+            ('volume', vt_name, size), 'volume',
+            create=lambda: vols.create_volume(
+                name=data_utils.rand_name(
+                    prefix=CONF.resource_name_prefix,
+                    name='ps-snap-manage-vol'),
+                size=size,
+                volume_type=vt_name,
+            )['volume'],
+            ready=lambda vid: dell_waiters.wait_for_status(
+                vols.show_volume, vid, 'available', kind='volume',
+                response_key='volume', error_states=('error',)),
+            delete=vols.delete_volume,
+            waiter=lambda vid: dell_waiters.deletion_waiter(
+                vols.show_volume, vid, kind='volume', response_key='volume',
+                error_states=('error_deleting',)))
+
+    def _cleanup_volume(self, vol_id):
+        """Register a volume with the test's cleanup executor.
+
+        Volumes are deleted concurrently and awaited in one batch before
+        their volume types are removed.
+        """
+        dell_cleanup.get_executor(self).add(
+            'volume', vol_id, self.vols.delete_volume,
+            waiter=lambda vid: dell_waiters.deletion_waiter(
+                self.vols.show_volume, vid, kind='volume',
+                response_key='volume', error_states=('error_deleting',),
+                timeout=VOLUME_BUILD_TIMEOUT))
 
     # ------------------------------------------------------------------
     # Snapshot helpers
@@ -295,7 +310,7 @@ class PowerStoreSnapshotManageUnmanageBase(object):
                 prefix=CONF.resource_name_prefix,
                 name='ps-snap-manage-snap'),
         )['snapshot']
-        self.addCleanup(self._delete_snapshot_safe, snap['id'])
+        self._cleanup_snapshot(snap['id'], volume_id)
         waiters.wait_for_volume_resource_status(
             self.snaps, snap['id'], 'available')
         snap_info = self.snaps.show_snapshot(snap['id'])['snapshot']
@@ -303,52 +318,39 @@ class PowerStoreSnapshotManageUnmanageBase(object):
                  snap_info['id'], volume_id)
         return snap_info
 
-    def _delete_snapshot_safe(self, snap_id):
-        """Delete a snapshot; ignore NotFound."""
-        try:
-            self.snaps.delete_snapshot(snap_id)
-        except lib_exc.NotFound:
-            return
-        except Exception as e:
-            LOG.debug("delete_snapshot(%s) raised: %s", snap_id, e)
-        try:
-            self.snaps.wait_for_resource_deletion(snap_id)
-        except lib_exc.NotFound:
-            pass
-        except Exception:
-            self._wait_for_snapshot_deletion(snap_id)
+    def _cleanup_snapshot(self, snap_id, volume_id=None):
+        """Register a snapshot; it is deleted before *volume_id*."""
+        dell_cleanup.get_executor(self).add(
+            'volume_snapshot', snap_id, self.snaps.delete_snapshot,
+            waiter=lambda sid: dell_waiters.deletion_waiter(
+                self.snaps.show_snapshot, sid, kind='volume_snapshot',
+                response_key='snapshot', error_states=('error_deleting',),
+                timeout=VOLUME_BUILD_TIMEOUT),
+            depends_on=[('volume', volume_id)])
 
     def _wait_for_snapshot_deletion(self, snap_id,
                                     timeout=VOLUME_BUILD_TIMEOUT,
-                                    interval=VOLUME_BUILD_INTERVAL):
+                                    interval=None):
         """Poll until a snapshot is gone."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.snaps.show_snapshot(snap_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for snapshot %s deletion", snap_id)
+        try:
+            dell_waiters.wait_for_deletion(
+                self.snaps.show_snapshot, snap_id, kind='volume_snapshot',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for snapshot %s deletion", snap_id)
 
     def _wait_for_snapshot_status(self, snap_id, target,
                                   timeout=VOLUME_BUILD_TIMEOUT,
-                                  interval=VOLUME_BUILD_INTERVAL):
+                                  interval=None):
         """Poll until the snapshot reaches the target status."""
-        deadline = time.time() + timeout
-        last = None
-        while time.time() < deadline:
-            s = self.snaps.show_snapshot(snap_id)['snapshot']
-            status = (s.get('status') or '').lower()
-            last = status
-            if status == target:
-                return s
-            if status in ('error', 'error_deleting'):
-                self.fail(
-                    "Snapshot %s entered error state: %s" % (snap_id, status))
-            time.sleep(interval)
-        self.fail("Timeout waiting for snapshot %s to reach '%s'; "
-                  "last='%s'" % (snap_id, target, last))
+        try:
+            return dell_waiters.wait_for_status(
+                self.snaps.show_snapshot, snap_id, target,
+                kind='volume_snapshot', response_key='snapshot',
+                error_states=('error', 'error_deleting'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     # ------------------------------------------------------------------
     # Unmanage / Manage snapshot helpers
@@ -384,7 +386,7 @@ class PowerStoreSnapshotManageUnmanageBase(object):
         new_snap = self.snap_manage.manage_snapshot(**body)['snapshot']
         LOG.info("Manage snapshot request submitted: id=%s, ref=%s",
                  new_snap['id'], ref)
-        self.addCleanup(self._delete_snapshot_safe, new_snap['id'])
+        self._cleanup_snapshot(new_snap['id'], volume_id)
         waiters.wait_for_volume_resource_status(
             self.snaps, new_snap['id'], 'available')
         managed = self.snaps.show_snapshot(new_snap['id'])['snapshot']
@@ -411,21 +413,21 @@ class PowerStoreSnapshotManageUnmanageBase(object):
             LOG.info("Manage snapshot correctly rejected by API: %s", e)
             return None
 
-        self.addCleanup(self._delete_snapshot_safe, new_snap['id'])
-        # Wait for the manage operation to settle
-        deadline = time.time() + VOLUME_BUILD_TIMEOUT
-        while time.time() < deadline:
-            s = self.snaps.show_snapshot(new_snap['id'])['snapshot']
-            status = (s.get('status') or '').lower()
-            if status in ('error', 'error_managing'):
-                LOG.info("Manage snapshot correctly failed with status=%s",
-                         status)
-                return s
-            if status == 'available':
-                # Manage unexpectedly succeeded
-                return s
-            time.sleep(VOLUME_BUILD_INTERVAL)
-        return self.snaps.show_snapshot(new_snap['id'])['snapshot']
+        self._cleanup_snapshot(new_snap['id'], volume_id)
+        # Wait for the manage operation to settle; 'available' means the
+        # manage unexpectedly succeeded and is left to the caller to assert.
+        try:
+            s = dell_waiters.wait_for_status(
+                self.snaps.show_snapshot, new_snap['id'],
+                ('error', 'error_managing', 'available'),
+                kind='volume_snapshot', response_key='snapshot',
+                error_states=(), timeout=VOLUME_BUILD_TIMEOUT)
+        except dell_waiters.WaitTimeout:
+            return self.snaps.show_snapshot(new_snap['id'])['snapshot']
+        if s['status'].lower() != 'available':
+            LOG.info("Manage snapshot correctly failed with status=%s",
+                     s['status'])
+        return s
 
     # ------------------------------------------------------------------
     # PowerStore REST API helpers
@@ -433,61 +435,40 @@ class PowerStoreSnapshotManageUnmanageBase(object):
     def _get_powerstore_credentials(self):
         """Read PowerStore credentials from cinder.conf.
 
-        Searches multiple sections in priority order:
-        1. The discovered backend section (e.g. powerstore2)
-        2. Common section names: powerstore, powerstore1, powerstore2
-        3. backend_defaults (shared config for all backends)
+        Prefers the discovered backend (e.g. powerstore2), then the
+        common section names, then any PowerStore backend.
         """
-        try:
-            conf = configparser.ConfigParser()
-            conf.read('/etc/cinder/cinder.conf')
-            # Build candidate section list
-            candidates = []
-            backend_name = getattr(self, 'powerstore_backend_name', None)
-            if backend_name:
-                candidates.append(backend_name)
-            candidates.extend(['powerstore', 'powerstore1', 'powerstore2',
-                                'backend_defaults'])
-            for section in candidates:
-                try:
-                    ps_ip = conf.get(section, 'san_ip')
-                    ps_user = conf.get(section, 'san_login')
-                    ps_pass = conf.get(section, 'san_password')
-                    LOG.info("PowerStore credentials found in [%s]", section)
-                    return ps_ip, ps_user, ps_pass
-                except (configparser.NoSectionError,
-                        configparser.NoOptionError):
-                    continue
+        names = ['powerstore', 'powerstore1', 'powerstore2']
+        backend_name = getattr(self, 'powerstore_backend_name', None)
+        if backend_name:
+            names.insert(0, backend_name)
+        backend = dell_backends.cinder().find('powerstore', names=names)
+        if backend is None:
             LOG.warning("No PowerStore credentials found in cinder.conf")
-        except Exception as e:
-            LOG.warning("Cannot read PowerStore creds from cinder.conf: %s", e)
-        return None, None, None
+            return None, None, None
+        LOG.info("PowerStore credentials found in [%s]", backend.section)
+        return backend.host, backend.user, backend.password
 
-    def _get_powerstore_volume_id_by_name(self, backend_name):
-        """Query the PowerStore REST API to get a volume UUID by name."""
+    def _get_powerstore_client(self):
+        """Return the worker's shared PowerStore REST client, or None."""
         ps_ip, ps_user, ps_pass = self._get_powerstore_credentials()
         if not ps_ip:
             return None
+        return powerstore_client.get_client(ps_ip, ps_user, ps_pass)
+
+    def _get_powerstore_volume_id_by_name(self, backend_name):
+        """Query the PowerStore REST API to get a volume UUID by name."""
+        client = self._get_powerstore_client()
+        if not client:
+            return None
 
-        url = 'https://%s/api/rest/volume' % ps_ip
-        params = {
-            'name': 'eq.%s' % backend_name,
-            'select': 'id,name',
-        }
         try:
-            resp = requests.get(
-                url, params=params,
-                auth=(ps_user, ps_pass),
-                verify=False, timeout=30)
-            if resp.status_code == 200:
-                data = resp.json()
-                if data:
-                    ps_id = data[0]['id']
-                    LOG.info("PowerStore volume '%s' has id '%s'",
-                             backend_name, ps_id)
-                    return ps_id
-            LOG.warning("PowerStore lookup for volume '%s' returned %s",
-                        backend_name, resp.status_code)
+            vol = client.find_volume(backend_name, select='id,name')
+            if vol:
+                LOG.info("PowerStore volume '%s' has id '%s'",
+                         backend_name, vol['id'])
+                return vol['id']
+            LOG.warning("PowerStore volume '%s' not found", backend_name)
         except Exception as e:
             LOG.warning("PowerStore REST query failed: %s", e)
         return None
@@ -499,31 +480,19 @@ class PowerStoreSnapshotManageUnmanageBase(object):
         :param parent_vol_id: PowerStore parent volume UUID.
         :returns: PowerStore snapshot UUID or None.
         """
-        ps_ip, ps_user, ps_pass = self._get_powerstore_credentials()
-        if not ps_ip:
+        client = self._get_powerstore_client()
+        if not client:
             return None
 
-        url = 'https://%s/api/rest/volume' % ps_ip
-        params = {
-            'name': 'eq.%s' % snap_name,
-            'type': 'eq.Snapshot',
-            'protection_data->>parent_id': 'eq.%s' % parent_vol_id,
-            'select': 'id,name,type,protection_data',
-        }
         try:
-            resp = requests.get(
-                url, params=params,
-                auth=(ps_user, ps_pass),
-                verify=False, timeout=30)
-            if resp.status_code == 200:
-                data = resp.json()
-                if data:
-                    ps_snap_id = data[0]['id']
-                    LOG.info("PowerStore snapshot '%s' has id '%s'",
-                             snap_name, ps_snap_id)
-                    return ps_snap_id
-            LOG.warning("PowerStore snapshot lookup for '%s' returned %s",
-                        snap_name, resp.status_code)
+            snap = client.find_snapshot(
+                snap_name, parent_vol_id,
+                select='id,name,type,protection_data')
+            if snap:
+                LOG.info("PowerStore snapshot '%s' has id '%s'",
+                         snap_name, snap['id'])
+                return snap['id']
+            LOG.warning("PowerStore snapshot '%s' not found", snap_name)
         except Exception as e:
             LOG.warning("PowerStore REST query for snapshot failed: %s", e)
         return None
@@ -534,48 +503,27 @@ class PowerStoreSnapshotManageUnmanageBase(object):
         :param parent_vol_id: PowerStore parent volume UUID.
         :returns: list of snapshot dicts, or empty list.
         """
-        ps_ip, ps_user, ps_pass = self._get_powerstore_credentials()
-        if not ps_ip:
+        client = self._get_powerstore_client()
+        if not client:
             return []
 
-        url = 'https://%s/api/rest/volume' % ps_ip
-        params = {
-            'type': 'eq.Snapshot',
-            'protection_data->>parent_id': 'eq.%s' % parent_vol_id,
-            'select': 'id,name,size,type,state,protection_data',
-        }
         try:
-            resp = requests.get(
-                url, params=params,
-                auth=(ps_user, ps_pass),
-                verify=False, timeout=30)
-            if resp.status_code == 200:
-                return resp.json() or []
-            LOG.warning("PowerStore snapshots query returned %s",
-                        resp.status_code)
+            return client.list_snapshots(
+                parent_vol_id,
+                select='id,name,size,type,state,protection_data') or []
         except Exception as e:
             LOG.warning("PowerStore REST query for snapshots failed: %s", e)
         return []
 
     def _powerstore_snapshot_exists(self, snapshot_id):
         """Check if a snapshot still exists on PowerStore by its UUID."""
-        ps_ip, ps_user, ps_pass = self._get_powerstore_credentials()
-        if not ps_ip:
+        client = self._get_powerstore_client()
+        if not client:
             return None
 
-        url = 'https://%s/api/rest/volume/%s' % (ps_ip, snapshot_id)
-        params = {'select': 'id,name,type'}
         try:
-            resp = requests.get(
-                url, params=params,
-                auth=(ps_user, ps_pass),
-                verify=False, timeout=30)
-            if resp.status_code == 200:
-                return True
-            elif resp.status_code == 404:
-                return False
-            LOG.warning("PowerStore snapshot existence check returned %s",
-                        resp.status_code)
+            return client.get_volume(
+                snapshot_id, select='id,name,type') is not None
         except Exception as e:
             LOG.warning("PowerStore REST query failed: %s", e)
         return None
@@ -38,10 +38,6 @@ Patch reference: manage-unmanage-volume.patch
   - client.py:  get_volume_details_by_id/name(), volume_is_mapped()
 """
 
-import configparser
-import time
-
-import requests
 from oslo_log import log as logging
 from tempest.api.volume import base as volume_base
 from tempest.common import waiters
@@ -50,17 +46,26 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import admin_clients
+from dell_tempest_plugin.common import backend_config as dell_backends
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import inventory as dell_inventory
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin.common import warm_pool as dell_pools
+from dell_tempest_plugin.services import powerstore_client
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 VOLUME_BUILD_TIMEOUT = 600
-VOLUME_BUILD_INTERVAL = 5
 
 
 # ======================================================================
 # Base mixin — helpers only, no test methods
 # ======================================================================
-class PowerStoreVolumeManageUnmanageBase(object):
+class PowerStoreVolumeManageUnmanageBase(dell_inventory.LeakCheckMixin):
     """Mixin providing helpers for PowerStore volume manage/unmanage tests.
 
     All heavy lifting (volume type creation, volume creation, manage,
@@ -126,6 +131,7 @@ class PowerStoreVolumeManageUnmanageBase(object):
     # ------------------------------------------------------------------
     def setUp(self):
         super(PowerStoreVolumeManageUnmanageBase, self).setUp()
+        dell_budget.start_test_budget(self)
         self.vols = self._get_admin_volumes_client()
         self.vtypes = self._get_admin_volume_types_client()
         self.vol_manage = self._get_admin_volume_manage_client()
@@ -186,43 +192,41 @@ class PowerStoreVolumeManageUnmanageBase(object):
     # Volume type helpers
     # ------------------------------------------------------------------
     def _create_powerstore_volume_type(self, extra_specs=None):
-        """Create a volume type targeting the PowerStore backend."""
-        name = data_utils.rand_name(
-            prefix=CONF.resource_name_prefix,
-            name='ps-manage-type')
+        """Return a volume type targeting the PowerStore backend.
+
+        The type is shared by every test of the worker asking for the
+        same extra specs (see ``type_registry``).
+        """
         specs = {'volume_backend_name': 'powerstore'}
         if extra_specs:
             specs.update(extra_specs)
+        return dell_types.acquire(
+            self, 'volume_type', specs,
+            lambda name: self._new_volume_type(specs, name))
+
+    def _new_volume_type(self, specs, name=None):
+        name = name or data_utils.rand_name(
+            prefix=CONF.resource_name_prefix,
+            name='ps-manage-type')
         vt = self.vtypes.create_volume_type(
             name=name, extra_specs=specs)['volume_type']
         LOG.info("Created volume type '%s' (id=%s) with specs=%s",
                  vt['name'], vt['id'], specs)
-        self.addCleanup(self._delete_volume_type_safe, vt['id'])
         return vt
 
-    def _delete_volume_type_safe(self, type_id, timeout=300, interval=5):
-        """Try to delete a volume type; retry if still in use."""
-        end = time.time() + timeout
-        while time.time() < end:
-            try:
-                self.vtypes.delete_volume_type(type_id)
-                return
-            except lib_exc.BadRequest:
-                LOG.info("Volume type %s still in use; retrying...", type_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        try:
-            self.vtypes.delete_volume_type(type_id)
-        except Exception as e:
-            LOG.warning("Final delete of volume type %s failed: %s",
-                        type_id, e)
-
     # ------------------------------------------------------------------
     # Volume helpers
     # ------------------------------------------------------------------
     def _create_volume(self, vt_name, size=1):
-        """Create a volume on PowerStore and wait until available."""
+        """Create a volume on PowerStore and wait until available.
+
+        With warm pools enabled, a pre-created volume is leased instead.
+        """
+        pool = self._volume_pool(vt_name, size)
+        vol = pool.lease() if pool else None
+        if vol is not None:
+            self.addCleanup(pool.recycle, vol['id'])
+            return vol
         vol = self.vols.create_volume(
             name=data_utils.rand_name(
                 prefix=CONF.resource_name_prefix,
@@ -230,7 +234,7 @@ class PowerStoreVolumeManageUnmanageBase(object):
             size=size,
             volume_type=vt_name,
         )['volume']
-        self.addCleanup(self._delete_volume_safe, vol['id'])
+        self._cleanup_volume(vol['id'])
         waiters.wait_for_volume_resource_status(
             self.vols, vol['id'], 'available')
         vol_info = self.vols.show_volume(vol['id'])['volume']
@@ -240,53 +244,69 @@ class PowerStoreVolumeManageUnmanageBase(object):
                  vol_info.get('provider_id'))
         return vol_info
 
-    def _delete_volume_safe(self, vol_id):
-        """Delete a volume; ignore NotFound."""
-        try:
-            self.vols.delete_volume(vol_id)
-        except lib_exc.NotFound:
-            return
-        except Exception as e:
-            LOG.debug("delete_volume(%s) raised: %s", vol_id, e)
-        try:
-            self.vols.wait_for_resource_deletion(vol_id)
-        except lib_exc.NotFound:
-            pass
-        except Exception:
-            self._wait_for_volume_deletion(vol_id)
+    def _volume_pool(self, vt_name, size):
+        """Return the warm pool of *size* GB volumes of *vt_name*.
+
+        The pool outlives the class, so its volumes are created and
+        deleted with the static admin clients, not ``self.vols``.
+        """
+        vols = admin_clients.volumes_client()
+        if vols is None:
+            return None
+        return dell_pools.get_pool(
+            ('volume', vt_name, size), 'volume',
+            create=lambda: vols.create_volume(
+                name=data_utils.rand_name(
+                    prefix=CONF.resource_name_prefix,
+                    name='ps-manage-vol'),
+                size=size,
+                volume_type=vt_name,
+            )['volume'],
+            ready=lambda vid: dell_waiters.wait_for_status(
+                vols.show_volume, vid, 'available', kind='volume',
+                response_key='volume', error_states=('error',)),
+            delete=vols.delete_volume,
+            waiter=lambda vid: dell_waiters.deletion_waiter(
+                vols.show_volume, vid, kind='volume', response_key='volume',
+                error_states=('error_deleting',)))
+
+    def _cleanup_volume(self, vol_id):
+        """Register a volume with the test's cleanup executor.
+
+        Volumes are deleted concurrently and awaited in one batch before
+        their volume types are removed.
+        """
+        dell_cleanup.get_executor(self).add(
+            'volume', vol_id, self.vols.delete_volume,
+            waiter=lambda vid: dell_waiters.deletion_waiter(
+                self.vols.show_volume, vid, kind='volume',
+                response_key='volume', error_states=('error_deleting',),
+                timeout=VOLUME_BUILD_TIMEOUT))
 
     def _wait_for_volume_deletion(self, vol_id,
                                   timeout=VOLUME_BUILD_TIMEOUT,
-                                  interval=VOLUME_BUILD_INTERVAL):
+                                  interval=None):
         """Poll until a volume is gone."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.vols.show_volume(vol_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for volume %s deletion", vol_id)
+        try:
+            dell_waiters.wait_for_deletion(
+                self.vols.show_volume, vol_id, kind='volume',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for volume %s deletion", vol_id)
 
     def _wait_for_volume_status(self, vol_id, target,
                                 timeout=VOLUME_BUILD_TIMEOUT,
-                                interval=VOLUME_BUILD_INTERVAL):
+                                interval=None):
         """Poll until the volume reaches the target status."""
-        deadline = time.time() + timeout
-        last = None
-        while time.time() < deadline:
-            v = self.vols.show_volume(vol_id)['volume']
-            status = (v.get('status') or '').lower()
-            last = status
-            if status == target:
-                return v
-            if status in ('error', 'error_restoring', 'error_extending',
-                          'error_managing'):
-                self.fail(
-                    "Volume %s entered error state: %s" % (vol_id, status))
-            time.sleep(interval)
-        self.fail("Timeout waiting for volume %s to reach '%s'; "
-                  "last='%s'" % (vol_id, target, last))
+        try:
+            return dell_waiters.wait_for_status(
+                self.vols.show_volume, vol_id, target,
+                kind='volume', response_key='volume',
+                error_states=('error', 'error_restoring',
+                              'error_extending', 'error_managing'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     # ------------------------------------------------------------------
     # Unmanage / Manage helpers
@@ -324,7 +344,7 @@ class PowerStoreVolumeManageUnmanageBase(object):
         new_vol = self.vol_manage.manage_volume(**body)['volume']
         LOG.info("Manage request submitted: id=%s, ref=%s",
                  new_vol['id'], ref)
-        self.addCleanup(self._delete_volume_safe, new_vol['id'])
+        self._cleanup_volume(new_vol['id'])
         waiters.wait_for_volume_resource_status(
             self.vols, new_vol['id'], 'available')
         managed = self.vols.show_volume(new_vol['id'])['volume']
@@ -354,20 +374,20 @@ class PowerStoreVolumeManageUnmanageBase(object):
             LOG.info("Manage correctly rejected by API: %s", e)
             return None
 
-        self.addCleanup(self._delete_volume_safe, new_vol['id'])
-        # Wait for the manage operation to settle
-        deadline = time.time() + VOLUME_BUILD_TIMEOUT
-        while time.time() < deadline:
-            v = self.vols.show_volume(new_vol['id'])['volume']
-            status = (v.get('status') or '').lower()
-            if status in ('error', 'error_managing'):
-                LOG.info("Manage correctly failed with status=%s", status)
-                return v
-            if status == 'available':
-                # Manage unexpectedly succeeded
-                return v
-            time.sleep(VOLUME_BUILD_INTERVAL)
-        return self.vols.show_volume(new_vol['id'])['volume']
+        self._cleanup_volume(new_vol['id'])
+        # Wait for the manage operation to settle; 'available' means the
+        # manage unexpectedly succeeded and is left to the caller to assert.
+        try:
+            v = dell_waiters.wait_for_status(
+                self.vols.show_volume, new_vol['id'],
+                ('error', 'error_managing', 'available'),
+                kind='volume', response_key='volume', error_states=(),
+                timeout=VOLUME_BUILD_TIMEOUT)
+        except dell_waiters.WaitTimeout:
+            return self.vols.show_volume(new_vol['id'])['volume']
+        if v['status'].lower() != 'available':
+            LOG.info("Manage correctly failed with status=%s", v['status'])
+        return v
 
     # ------------------------------------------------------------------
     # Extend helper
@@ -387,38 +407,25 @@ class PowerStoreVolumeManageUnmanageBase(object):
     def _get_powerstore_volume_id_by_name(self, backend_name):
         """Query the PowerStore REST API to get a volume UUID by name.
 
-        Reads PowerStore credentials from cinder.conf [powerstore] section.
+        Reads PowerStore credentials from the cinder.conf [powerstore]
+        section, or else any PowerStore backend.
         Returns the PowerStore volume UUID string, or None if not found.
         """
-        try:
-            conf = configparser.ConfigParser()
-            conf.read('/etc/cinder/cinder.conf')
-            ps_ip = conf.get('powerstore', 'san_ip')
-            ps_user = conf.get('powerstore', 'san_login')
-            ps_pass = conf.get('powerstore', 'san_password')
-        except Exception as e:
-            LOG.warning("Cannot read PowerStore creds from cinder.conf: %s", e)
+        backend = dell_backends.cinder().find('powerstore',
+                                              names=['powerstore'])
+        if backend is None:
+            LOG.warning("No PowerStore backend found in cinder.conf")
             return None
 
-        url = 'https://%s/api/rest/volume' % ps_ip
-        params = {
-            'name': 'eq.%s' % backend_name,
-            'select': 'id,name',
-        }
+        client = powerstore_client.get_client(
+            backend.host, backend.user, backend.password)
         try:
-            resp = requests.get(
-                url, params=params,
-                auth=(ps_user, ps_pass),
-                verify=False, timeout=30)
-            if resp.status_code == 200:
-                data = resp.json()
-                if data:
-                    ps_id = data[0]['id']
-                    LOG.info("PowerStore volume '%s' has id '%s'",
-                             backend_name, ps_id)
-                    return ps_id
-            LOG.warning("PowerStore lookup for '%s' returned %s",
-                        backend_name, resp.status_code)
+            vol = client.find_volume(backend_name, select='id,name')
+            if vol:
+                LOG.info("PowerStore volume '%s' has id '%s'",
+                         backend_name, vol['id'])
+                return vol['id']
+            LOG.warning("PowerStore volume '%s' not found", backend_name)
         except Exception as e:
             LOG.warning("PowerStore REST query failed: %s", e)
         return None
@@ -48,7 +48,6 @@ Patch reference: Gerrit 971952 (Dell Powerstore driver-assisted migration)
 """
 
 import json
-import time
 
 from oslo_log import log as logging
 from tempest.api.volume import base as volume_base
@@ -58,19 +57,25 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import admin_clients
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import inventory as dell_inventory
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin.common import warm_pool as dell_pools
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 VOLUME_BUILD_TIMEOUT = 600
-VOLUME_BUILD_INTERVAL = 5
 MIGRATION_TIMEOUT = 1800   # seconds – driver-assisted migration can be slow
-MIGRATION_POLL_INTERVAL = 10
 
 
 # ======================================================================
 # Base mixin — helpers only, no test methods
 # ======================================================================
-class PowerStoreVolumeMigrateBase(object):
+class PowerStoreVolumeMigrateBase(dell_inventory.LeakCheckMixin):
     """Mixin providing helpers for PowerStore volume migration tests.
 
     Handles volume-type creation, volume creation, migration via the
@@ -129,6 +134,7 @@ class PowerStoreVolumeMigrateBase(object):
     # ------------------------------------------------------------------
     def setUp(self):
         super(PowerStoreVolumeMigrateBase, self).setUp()
+        dell_budget.start_test_budget(self)
         self.vols = self._get_admin_volumes_client()
         self.vtypes = self._get_admin_volume_types_client()
         self.sched = self._get_admin_scheduler_stats_client()
@@ -236,8 +242,16 @@ class PowerStoreVolumeMigrateBase(object):
         applies the BackendFilter; if ``volume_backend_name`` is pinned
         to a single backend the scheduler will reject migration to any
         other backend with ``NoValidBackend``.
+
+        The type is shared by every test of the worker asking for the
+        same extra specs (see ``type_registry``).
         """
-        name = data_utils.rand_name(
+        return dell_types.acquire(
+            self, 'volume_type', extra_specs,
+            lambda name: self._new_volume_type(extra_specs, name))
+
+    def _new_volume_type(self, extra_specs, name=None):
+        name = name or data_utils.rand_name(
             prefix=CONF.resource_name_prefix,
             name='ps-migrate-type')
         kwargs = {'name': name}
@@ -245,32 +259,21 @@ class PowerStoreVolumeMigrateBase(object):
             kwargs['extra_specs'] = extra_specs
         vt = self.vtypes.create_volume_type(**kwargs)['volume_type']
         LOG.info("Created volume type '%s' (id=%s)", vt['name'], vt['id'])
-        self.addCleanup(self._delete_volume_type_safe, vt['id'])
         return vt
 
-    def _delete_volume_type_safe(self, type_id, timeout=300, interval=5):
-        """Try to delete a volume type; retry if still in use."""
-        end = time.time() + timeout
-        while time.time() < end:
-            try:
-                self.vtypes.delete_volume_type(type_id)
-                return
-            except lib_exc.BadRequest:
-                LOG.info("Volume type %s still in use; retrying...", type_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        try:
-            self.vtypes.delete_volume_type(type_id)
-        except Exception as e:
-            LOG.warning("Final delete of volume type %s failed: %s",
-                        type_id, e)
-
     # ------------------------------------------------------------------
     # Volume helpers
     # ------------------------------------------------------------------
     def _create_volume(self, vt_name, size=1):
-        """Create a volume on PowerStore and wait until available."""
+        """Create a volume on PowerStore and wait until available.
+
+        With warm pools enabled, a pre-created volume is leased instead.
+        """
+        pool = self._volume_pool(vt_name, size)
+        vol = pool.lease() if pool else None
+        if vol is not None:
+            self.addCleanup(pool.recycle, vol['id'])
+            return vol
         vol = self.vols.create_volume(
             name=data_utils.rand_name(
                 prefix=CONF.resource_name_prefix,
@@ -278,7 +281,7 @@ class PowerStoreVolumeMigrateBase(object):
             size=size,
             volume_type=vt_name,
         )['volume']
-        self.addCleanup(self._delete_volume_safe, vol['id'])
+        self._cleanup_volume(vol['id'])
         waiters.wait_for_volume_resource_status(
             self.vols, vol['id'], 'available')
         vol_info = self.vols.show_volume(vol['id'])['volume']
@@ -287,52 +290,58 @@ class PowerStoreVolumeMigrateBase(object):
                  vol_info.get('os-vol-host-attr:host'))
         return vol_info
 
-    def _delete_volume_safe(self, vol_id):
-        """Delete a volume; ignore NotFound."""
-        try:
-            self.vols.delete_volume(vol_id)
-        except lib_exc.NotFound:
-            return
-        except Exception as e:
-            LOG.debug("delete_volume(%s) raised: %s", vol_id, e)
-        try:
-            self.vols.wait_for_resource_deletion(vol_id)
-        except lib_exc.NotFound:
-            pass
-        except Exception:
-            self._wait_for_volume_deletion(vol_id)
-
-    def _wait_for_volume_deletion(self, vol_id,
-                                  timeout=VOLUME_BUILD_TIMEOUT,
-                                  interval=VOLUME_BUILD_INTERVAL):
-        """Poll until a volume is gone."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.vols.show_volume(vol_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for volume %s deletion", vol_id)
+    def _volume_pool(self, vt_name, size):
+        """Return the warm pool of *size* GB volumes of *vt_name*.
+
+        The pool outlives the class, so its volumes are created and
+        deleted with the static admin clients, not ``self.vols``.
+        """
+        vols = admin_clients.volumes_client()
+        if vols is None:
+            return None
+        return dell_pools.get_pool(
+            ('volume', vt_name, size), 'volume',
+            create=lambda: vols.create_volume(
+                name=data_utils.rand_name(
+                    prefix=CONF.resource_name_prefix,
+                    name='ps-migrate-vol'),
+                size=size,
+                volume_type=vt_name,
+            )['volume'],
+            ready=lambda vid: dell_waiters.wait_for_status(
+                vols.show_volume, vid, 'available', kind='volume',
+                response_key='volume', error_states=('error',)),
+            delete=vols.delete_volume,
+            waiter=lambda vid: dell_waiters.deletion_waiter(
+                vols.show_volume, vid, kind='volume', response_key='volume',
+                error_states=('error_deleting',)))
+
+    def _cleanup_volume(self, vol_id):
+        """Register a volume with the test's cleanup executor.
+
+        Volumes are deleted concurrently and awaited in one batch before
+        their volume types are removed.
+        """
+        dell_cleanup.get_executor(self).add(
+            'volume', vol_id, self.vols.delete_volume,
+            waiter=lambda vid: dell_waiters.deletion_waiter(
+                self.vols.show_volume, vid, kind='volume',
+                response_key='volume', error_states=('error_deleting',),
+                timeout=VOLUME_BUILD_TIMEOUT))
 
     def _wait_for_volume_status(self, vol_id, target,
                                 timeout=VOLUME_BUILD_TIMEOUT,
-                                interval=VOLUME_BUILD_INTERVAL):
+                                interval=None):
         """Poll until the volume reaches the target status."""
-        deadline = time.time() + timeout
-        last = None
-        while time.time() < deadline:
-            v = self.vols.show_volume(vol_id)['volume']
-            status = (v.get('status') or '').lower()
-            last = status
-            if status == target:
-                return v
-            if status in ('error', 'error_restoring', 'error_extending'):
-                self.fail(
-                    "Volume %s entered error state: %s" % (vol_id, status))
-            time.sleep(interval)
-        self.fail("Timeout waiting for volume %s to reach '%s'; "
-                  "last='%s'" % (vol_id, target, last))
+        try:
+            return dell_waiters.wait_for_status(
+                self.vols.show_volume, vol_id, target,
+                kind='volume', response_key='volume',
+                error_states=('error', 'error_restoring',
+                              'error_extending'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     # ------------------------------------------------------------------
     # Migration helpers
@@ -371,30 +380,53 @@ class PowerStoreVolumeMigrateBase(object):
 
     def _wait_for_migration(self, vol_id, dest_host,
                             timeout=MIGRATION_TIMEOUT,
-                            interval=MIGRATION_POLL_INTERVAL):
+                            interval=None):
         """Poll until migration completes (host matches or status=success).
 
         Returns the final volume dict.
         """
-        deadline = time.time() + timeout
-        last_mstatus = None
-        while time.time() < deadline:
-            vol = self.vols.show_volume(vol_id)['volume']
-            host = vol.get('os-vol-host-attr:host') or vol.get('host', '')
+        return self._wait_for_migrations({vol_id: dest_host},
+                                         timeout=timeout,
+                                         interval=interval)[vol_id]
+
+    def _wait_for_migrations(self, dest_hosts, timeout=MIGRATION_TIMEOUT,
+                             interval=None):
+        """Wait for several migrations over one incremental list stream.
+
+        :param dest_hosts: Dict mapping volume ID to destination host.
+        :returns: Dict mapping volume ID to its final volume dict.
+        """
+        def _migrated_to(dest_host):
+            def _migrated(vol):
+                host = (vol.get('os-vol-host-attr:host')
+                        or vol.get('host', ''))
+                mstatus = (vol.get('migration_status') or '').lower()
+                return host == dest_host or mstatus == 'success'
+            return _migrated
+
+        def _failed(vol):
             mstatus = (vol.get('migration_status') or '').lower()
-            last_mstatus = mstatus
-            LOG.info("Polling vol=%s host='%s' migration_status='%s'",
-                     vol_id, host, mstatus)
-            if host == dest_host or mstatus == 'success':
-                LOG.info("Migration succeeded for vol=%s: host='%s' "
-                         "migration_status='%s'", vol_id, host, mstatus)
-                return vol
-            if mstatus in ('error', 'failed'):
-                self.fail("Migration failed for vol=%s with "
-                          "migration_status=%s" % (vol_id, mstatus))
-            time.sleep(interval)
-        self.fail("Migration timed out for vol=%s; last "
-                  "migration_status=%s" % (vol_id, last_mstatus))
+            return mstatus in ('error', 'failed')
+
+        poller = dell_waiters.volume_changes_poller(
+            self.vols, kind='migration', status_key='migration_status',
+            timeout=timeout, max_interval=interval)
+        for vol_id, dest_host in dest_hosts.items():
+            poller.watch(vol_id, _migrated_to(dest_host), is_error=_failed,
+                         target="host '%s'" % dest_host)
+        vol_ids = ', '.join(dest_hosts)
+        try:
+            vols = poller.wait()
+        except dell_waiters.ResourceErrorState as e:
+            self.fail("Migration failed for vol=%s: %s" % (vol_ids, e))
+        except dell_waiters.WaitTimeout as e:
+            self.fail("Migration timed out for vol=%s: %s" % (vol_ids, e))
+        for vol_id, vol in vols.items():
+            LOG.info("Migration succeeded for vol=%s: host='%s' "
+                     "migration_status='%s'", vol_id,
+                     vol.get('os-vol-host-attr:host') or vol.get('host', ''),
+                     vol.get('migration_status'))
+        return vols
 
     def _migrate_and_wait(self, vol_id, dest_host, force_host_copy=None):
         """Convenience: trigger migration and wait for completion.
@@ -756,26 +788,35 @@ class _PowerStoreVolumeMigrateNegativeTests(object):
             return
 
         # If accepted, wait for the migration to fail
-        deadline = time.time() + VOLUME_BUILD_TIMEOUT
-        while time.time() < deadline:
-            vol_after = self.vols.show_volume(vol_id)['volume']
+        def _outcome(vol):
+            status = (vol.get('status') or '').lower()
+            mig_status = (vol.get('migration_status') or '').lower()
+            return (mig_status in ('error', 'failed') or
+                    status == 'error' or
+                    (status == 'available' and
+                     mig_status in ('success', 'none', '')))
+
+        try:
+            vol_after = dell_waiters.wait_for_condition(
+                self.vols.show_volume, vol_id, _outcome, kind='volume',
+                target='migration outcome', response_key='volume',
+                timeout=VOLUME_BUILD_TIMEOUT)
+        except dell_waiters.WaitTimeout:
+            vol_after = None
+        if vol_after is not None:
             status = (vol_after.get('status') or '').lower()
             mig_status = (vol_after.get('migration_status') or '').lower()
             if mig_status in ('error', 'failed'):
                 LOG.info("Migration correctly failed: migration_status=%s",
                          mig_status)
-                return
-            if status == 'available' and mig_status in ('success', 'none',
-                                                         ''):
+            elif status == 'error':
+                LOG.info("Volume entered error state as expected")
+            else:
                 # Cinder might have silently rejected the migration
                 # (returned False, None) and left the volume available
                 LOG.info("Migration silently rejected (volume still "
                          "available, no error)")
-                return
-            if status == 'error':
-                LOG.info("Volume entered error state as expected")
-                return
-            time.sleep(VOLUME_BUILD_INTERVAL)
+            return
 
         # Timeout — check final state
         vol_final = self.vols.show_volume(vol_id)['volume']
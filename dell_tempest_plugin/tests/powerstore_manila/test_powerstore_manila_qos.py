@@ -51,9 +51,7 @@ Driver methods tested:
   - _cleanup_qos_on_delete
 """
 
-import json
 import os
-import time
 
 # Ensure TEMPEST_CONFIG_DIR is set so tempest can find tempest.conf
 # when running with plain pytest outside of the tempest test runner.
@@ -71,6 +69,14 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import bulk as dell_bulk
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import inventory as dell_inventory
+from dell_tempest_plugin.common import manila_clients as dell_manila
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import waiters as dell_waiters
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
@@ -85,19 +91,15 @@ except cfg.DuplicateOptError:
     pass
 
 SHARE_BUILD_TIMEOUT = 600
-SHARE_BUILD_INTERVAL = 5
 # Shorter timeout for negative tests
 NEGATIVE_TEST_TIMEOUT = 60
 
-# Minimum Manila API microversion that supports QoS types
-QOS_TYPE_MIN_API_VERSION = '2.94'
-
 # PowerStore max_bw constraints (from manila driver)
 QOS_MAX_BW_MIN = 1       # MB/s
 QOS_MAX_BW_MAX = 1000000  # MB/s
 
 
-class PowerStoreQoSShareTest(object):
+class PowerStoreQoSShareTest(dell_inventory.LeakCheckMixin):
     """Mixin with helpers for PowerStore Manila QoS share tests.
 
     Provides utility methods for creating QoS types, share types with
@@ -118,111 +120,60 @@ class PowerStoreQoSShareTest(object):
         cls.shares_v2_client = cls._get_manila_client(cls.admin_manager)
         cls.share_types_client = cls._get_manila_share_types_client(
             cls.admin_manager)
+        cls.qos_types_client = dell_manila.qos_types_client(
+            cls.admin_manager)
+
+    def setUp(self):
+        super(PowerStoreQoSShareTest, self).setUp()
+        dell_budget.start_test_budget(self)
 
     @staticmethod
     def _get_manila_client(manager):
         """Resolve Manila shares client from the manager."""
-        for attr in ('shares_v2_client', 'shares_client',
-                     'share_v2_client', 'share_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        try:
-            from manila_tempest_tests.services.share.v2.json import (
-                shares_client as manila_shares_client)
-            service_type = getattr(CONF, 'share', None)
-            configured_type = getattr(service_type, 'catalog_type',
-                                      None) if service_type else None
-            region = (getattr(service_type, 'region', None)
-                      if service_type else None) or CONF.identity.region
-            endpoint_type = (getattr(service_type, 'endpoint_type', 'public')
-                             if service_type else 'public')
-            catalog_type = configured_type
-            if not catalog_type or catalog_type == 'share':
-                try:
-                    auth_data = manager.auth_provider.get_auth()
-                    catalog = auth_data[1].get('catalog', [])
-                    for entry in catalog:
-                        if entry.get('type') in (
-                                'shared-file-system', 'share'):
-                            catalog_type = entry['type']
-                            break
-                except Exception:
-                    pass
-            catalog_type = catalog_type or 'shared-file-system'
-            return manila_shares_client.SharesV2Client(
-                auth_provider=manager.auth_provider,
-                service=catalog_type,
-                region=region,
-                endpoint_type=endpoint_type,
-            )
-        except ImportError:
-            pass
-        return None
+        return dell_manila.shares_client(manager)
 
     @classmethod
     def _get_manila_share_types_client(cls, manager):
         """Resolve Manila share types client from the manager."""
-        for attr in ('share_types_v2_client', 'share_types_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        return cls._get_manila_client(manager)
+        return dell_manila.share_types_client(manager)
 
     # ------------------------------------------------------------------
-    # QoS type helpers (raw HTTP via shares_v2_client)
+    # QoS type helpers (raw HTTP via qos_types_client)
     # ------------------------------------------------------------------
     def _qos_type_request(self, method, url_suffix='', body=None):
         """Make a raw Manila API request for QoS type operations.
 
         The Manila QoS type API requires microversion >= 2.94.
         """
-        url = 'qos-types'
-        if url_suffix:
-            url = f'{url}/{url_suffix}'
-        headers = {'Content-Type': 'application/json'}
-        client = self.shares_v2_client
-        if method == 'POST':
-            resp, resp_body = client.post(
-                url, json.dumps(body), version=QOS_TYPE_MIN_API_VERSION)
-        elif method == 'GET':
-            resp, resp_body = client.get(
-                url, version=QOS_TYPE_MIN_API_VERSION)
-        elif method == 'DELETE':
-            resp, resp_body = client.delete(
-                url, version=QOS_TYPE_MIN_API_VERSION)
-        else:
-            raise ValueError(f"Unsupported method: {method}")
-        return resp, json.loads(resp_body) if resp_body else {}
+        return self.qos_types_client.qos_type_request(
+            method, url_suffix=url_suffix, body=body)
 
     def _qos_type_specs_request(self, method, qos_type_id,
                                 key=None, body=None):
         """Make a raw Manila API request for QoS type specs operations."""
-        url = f'qos-types/{qos_type_id}/specs'
-        if key:
-            url = f'{url}/{key}'
-        client = self.shares_v2_client
-        if method == 'POST':
-            resp, resp_body = client.post(
-                url, json.dumps(body), version=QOS_TYPE_MIN_API_VERSION)
-        elif method == 'GET':
-            resp, resp_body = client.get(
-                url, version=QOS_TYPE_MIN_API_VERSION)
-        elif method == 'DELETE':
-            resp, resp_body = client.delete(
-                url, version=QOS_TYPE_MIN_API_VERSION)
-        else:
-            raise ValueError(f"Unsupported method: {method}")
-        return resp, json.loads(resp_body) if resp_body else {}
+        return self.qos_types_client.qos_type_specs_request(
+            method, qos_type_id, key=key, body=body)
 
     def create_qos_type(self, name=None, specs=None):
         """Create a Manila QoS type with given specs.
 
+        Without *name*, the worker's shared QoS type with the same specs
+        is returned (see ``type_registry``).
+
         :param name: Optional name; auto-generated if None.
         :param specs: Dict of QoS specs (e.g. max_bw).
         :returns: Created QoS type dict.
         """
-        name = name or data_utils.rand_name('ps-manila-qos-type')
+        if name is None:
+            return dell_types.acquire(
+                self, 'qos_type', specs,
+                lambda name: self._new_qos_type(
+                    name or data_utils.rand_name('ps-manila-qos-type'), specs))
+        qt = self._new_qos_type(name, specs)
+        self._cleanup_qos_type(qt['id'])
+        return qt
+
+    def _new_qos_type(self, name, specs):
         body = {
             'qos_type': {
                 'name': name,
@@ -233,18 +184,15 @@ class PowerStoreQoSShareTest(object):
         qt = resp_body.get('qos_type', resp_body)
         LOG.info("Created QoS type '%s' (id=%s) with specs=%s",
                  qt.get('name'), qt.get('id'), specs)
-        self.addCleanup(self._delete_qos_type_safe, qt['id'])
         return qt
 
-    def _delete_qos_type_safe(self, qos_type_id):
-        """Delete QoS type, ignoring NotFound."""
-        try:
-            self._qos_type_request('DELETE', url_suffix=str(qos_type_id))
-            LOG.info("Deleted QoS type %s", qos_type_id)
-        except lib_exc.NotFound:
-            LOG.debug("QoS type %s already gone", qos_type_id)
-        except Exception as e:
-            LOG.warning("Failed to delete QoS type %s: %s", qos_type_id, e)
+    def _delete_qos_type(self, qos_type_id):
+        self._qos_type_request('DELETE', url_suffix=str(qos_type_id))
+
+    def _cleanup_qos_type(self, qos_type_id):
+        """Register a QoS type with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'qos_type', qos_type_id, self._delete_qos_type)
 
     # ------------------------------------------------------------------
     # Share type helpers
@@ -253,13 +201,15 @@ class PowerStoreQoSShareTest(object):
                               extra_specs=None, backend_name=None):
         """Create a share type with default_qos_type pointing to a QoS type.
 
+        Without *name*, the worker's shared share type with the same
+        extra specs is returned (see ``type_registry``).
+
         :param qos_type_name: Name of the QoS type to link.
         :param name: Optional share type name.
         :param extra_specs: Additional extra-specs dict to merge.
         :param backend_name: Optional backend name for share_backend_name extra_spec.
         :returns: Created share type dict.
         """
-        name = name or data_utils.rand_name('ps-manila-qos-share-type')
         specs = {
             'driver_handles_share_servers': str(CONF.share.multitenancy_enabled),
             'default_qos_type': qos_type_name,
@@ -269,6 +219,17 @@ class PowerStoreQoSShareTest(object):
         if extra_specs:
             specs.update(extra_specs)
 
+        if name is None:
+            return dell_types.acquire(
+                self, 'share_type', specs,
+                lambda name: self._new_share_type(
+                    name or data_utils.rand_name('ps-manila-qos-share-type'),
+                    specs))
+        st = self._new_share_type(name, specs)
+        self._cleanup_share_type(st['id'])
+        return st
+
+    def _new_share_type(self, name, specs):
         share_type = self.share_types_client.create_share_type(
             name=name,
             extra_specs=specs,
@@ -276,7 +237,6 @@ class PowerStoreQoSShareTest(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) with specs=%s",
                  st['name'], st['id'], specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
         return st
 
     def create_plain_share_type(self, name=None, extra_specs=None, backend_name=None):
@@ -301,19 +261,14 @@ class PowerStoreQoSShareTest(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) without QoS", st['name'],
                  st['id'])
-        self.addCleanup(self._delete_share_type_safe, st['id'])
+        self._cleanup_share_type(st['id'])
         return st
 
-    def _delete_share_type_safe(self, share_type_id):
-        """Delete share type, ignoring NotFound."""
-        try:
-            self.share_types_client.delete_share_type(share_type_id)
-            LOG.info("Deleted share type %s", share_type_id)
-        except lib_exc.NotFound:
-            LOG.debug("Share type %s already gone", share_type_id)
-        except Exception as e:
-            LOG.warning("Failed to delete share type %s: %s",
-                        share_type_id, e)
+    def _cleanup_share_type(self, share_type_id):
+        """Register a share type with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_type', share_type_id,
+            self.share_types_client.delete_share_type)
 
     # ------------------------------------------------------------------
     # Share helpers
@@ -340,11 +295,47 @@ class PowerStoreQoSShareTest(object):
         sh = share.get('share', share)
         LOG.info("Created share '%s' (id=%s, protocol=%s, type=%s)",
                  sh['name'], sh['id'], protocol, share_type_name)
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         return self.shares_v2_client.get_share(sh['id']).get(
             'share', self.shares_v2_client.get_share(sh['id']))
 
+    def create_shares(self, protocol, share_type_name, count, size=None,
+                      name_prefix=None):
+        """Create several Manila shares and wait for them together.
+
+        The create requests are submitted concurrently; the shares are
+        then awaited with one ``list_shares_with_detail`` call per poll.
+
+        :param protocol: 'NFS' or 'CIFS'
+        :param share_type_name: Name of the share type to use.
+        :param count: Number of shares to create.
+        :param size: Share size in GB. If None, uses CONF.share.share_size.
+        :param name_prefix: Optional share name prefix.
+        :returns: List of share dicts, in creation order.
+        """
+        if size is None:
+            size = getattr(CONF.share, 'share_size', 3)
+        name_prefix = name_prefix or f'ps-manila-qos-{protocol.lower()}'
+        batch_tag = data_utils.rand_name('ps-manila-qos-batch')
+
+        def _register(sh):
+            LOG.info("Created share '%s' (id=%s, protocol=%s, type=%s)",
+                     sh['name'], sh['id'], protocol, share_type_name)
+            self._cleanup_share(sh['id'], sh.get('share_type'))
+
+        return dell_bulk.create_shares_bulk(
+            self.shares_v2_client,
+            [{'share_protocol': protocol,
+              'size': size,
+              'name': data_utils.rand_name(f'{name_prefix}-{i}'),
+              'share_type_id': share_type_name,
+              'metadata': {dell_waiters.BATCH_METADATA_KEY: batch_tag}}
+             for i in range(count)],
+            register=_register,
+            wait=lambda ids: self._wait_for_shares_status(
+                ids, 'available', batch_tag=batch_tag))
+
     def _delete_share_safe(self, share_id):
         """Delete a share and wait for it to be removed.
 
@@ -375,46 +366,91 @@ class PowerStoreQoSShareTest(object):
             return
         self._wait_for_share_deletion(share_id)
 
+    def _cleanup_share(self, share_id, share_type_id=None,
+                       snapshot_id=None):
+        """Register a share with the test's cleanup executor.
+
+        Shares of one test are deleted together and their deletions
+        awaited in one batch before any share type is removed; a share
+        created from *snapshot_id* goes before that snapshot.
+        """
+        dell_cleanup.get_executor(self).add(
+            'share', share_id, self.shares_v2_client.delete_share,
+            waiter=self._share_deletion_waiter,
+            depends_on=[('share_type', share_type_id),
+                        ('share_snapshot', snapshot_id)])
+
+    def _share_deletion_waiter(self, share_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_share, share_id, kind='share',
+            error_states=('error_deleting',), timeout=SHARE_BUILD_TIMEOUT)
+
     def _wait_for_share_status(self, share_id, target_status,
                                timeout=SHARE_BUILD_TIMEOUT,
-                               interval=SHARE_BUILD_INTERVAL):
+                               interval=None):
         """Poll share status until it reaches target or errors out."""
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, target_status,
+                kind='share',
+                response_key='share',
+                error_states=('error', 'error_deleting'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
+
+    def _wait_for_shares_status(self, share_ids, target_status,
+                                batch_tag=None,
+                                timeout=SHARE_BUILD_TIMEOUT,
+                                interval=None):
+        """Poll several shares with one list call per poll.
+
+        :returns: Dict mapping share ID to its share dict.
+        """
+        params = dell_waiters.batch_params(batch_tag) if batch_tag else None
+        try:
+            return dell_waiters.wait_for_shares_status(
+                self.shares_v2_client, share_ids, target_status,
+                params=params,
+                error_states=('error', 'error_deleting'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
+
+    def _wait_for_share_outcome(self, share_id,
+                                outcomes=('error', 'available'),
+                                timeout=NEGATIVE_TEST_TIMEOUT):
+        """Wait for a share to reach one of *outcomes*; return its status.
+
+        Returns the last observed status if none is reached in time.
+        """
+        try:
+            share = dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, outcomes,
+                kind='share', response_key='share', error_states=(),
+                timeout=timeout)
+        except dell_waiters.WaitTimeout:
             share = self.shares_v2_client.get_share(share_id)
-            sh = share.get('share', share)
-            status = sh.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'error_deleting'):
-                self.fail(
-                    f"Share {share_id} entered error state: {status}")
-            time.sleep(interval)
-        self.fail(
-            f"Timeout waiting for share {share_id} to reach "
-            f"'{target_status}'; last status='{last_status}'")
+            share = share.get('share', share)
+        return share.get('status', '').lower()
 
     def _wait_for_share_deletion(self, share_id,
                                  timeout=SHARE_BUILD_TIMEOUT,
-                                 interval=SHARE_BUILD_INTERVAL):
+                                 interval=None):
         """Poll until share is gone (NotFound) or reaches a terminal error."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                result = self.shares_v2_client.get_share(share_id)
-                sh = result.get('share', result)
-                status = sh.get('status', '').lower()
-                if status == 'error_deleting':
-                    LOG.warning("Share %s is stuck in error_deleting state",
-                                share_id)
-                    return
-            except lib_exc.NotFound:
-                LOG.info("Share %s deletion confirmed", share_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for share %s deletion", share_id)
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_share, share_id, kind='share',
+                response_key='share', error_states=('error_deleting',),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.ResourceErrorState:
+            LOG.warning("Share %s is stuck in error_deleting state",
+                        share_id)
+            return
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for share %s deletion", share_id)
+            return
+        LOG.info("Share %s deletion confirmed", share_id)
 
     # ------------------------------------------------------------------
     # Snapshot helpers
@@ -434,57 +470,36 @@ class PowerStoreQoSShareTest(object):
         snap = snapshot.get('snapshot', snapshot)
         LOG.info("Created snapshot '%s' (id=%s) for share %s",
                  snap['name'], snap['id'], share_id)
-        self.addCleanup(self._delete_snapshot_safe, snap['id'])
+        self._cleanup_snapshot(snap['id'], share_id)
         self._wait_for_snapshot_status(snap['id'], 'available')
         return snap
 
-    def _delete_snapshot_safe(self, snapshot_id):
-        """Delete a snapshot, ignoring NotFound."""
-        try:
-            self.shares_v2_client.delete_snapshot(snapshot_id)
-            LOG.info("Requested deletion of snapshot %s", snapshot_id)
-        except lib_exc.NotFound:
-            LOG.debug("Snapshot %s already gone", snapshot_id)
-            return
-        except Exception as e:
-            LOG.warning("Failed to delete snapshot %s: %s", snapshot_id, e)
-            return
-        self._wait_for_snapshot_deletion(snapshot_id)
+    def _cleanup_snapshot(self, snapshot_id, share_id=None):
+        """Register a snapshot with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_snapshot', snapshot_id,
+            self.shares_v2_client.delete_snapshot,
+            waiter=self._snapshot_deletion_waiter,
+            depends_on=[('share', share_id)])
+
+    def _snapshot_deletion_waiter(self, snapshot_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_snapshot, snapshot_id,
+            kind='share_snapshot', error_states=('error_deleting',),
+            timeout=SHARE_BUILD_TIMEOUT)
 
     def _wait_for_snapshot_status(self, snapshot_id, target_status,
                                   timeout=SHARE_BUILD_TIMEOUT,
-                                  interval=SHARE_BUILD_INTERVAL):
+                                  interval=None):
         """Poll snapshot status until it reaches target or errors out."""
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            snapshot = self.shares_v2_client.get_snapshot(snapshot_id)
-            snap = snapshot.get('snapshot', snapshot)
-            status = snap.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'error_deleting'):
-                self.fail(
-                    f"Snapshot {snapshot_id} entered error state: {status}")
-            time.sleep(interval)
-        self.fail(
-            f"Timeout waiting for snapshot {snapshot_id} to reach "
-            f"'{target_status}'; last status='{last_status}'")
-
-    def _wait_for_snapshot_deletion(self, snapshot_id,
-                                    timeout=SHARE_BUILD_TIMEOUT,
-                                    interval=SHARE_BUILD_INTERVAL):
-        """Poll until snapshot is gone (NotFound)."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_snapshot(snapshot_id)
-            except lib_exc.NotFound:
-                LOG.info("Snapshot %s deletion confirmed", snapshot_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for snapshot %s deletion", snapshot_id)
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_snapshot, snapshot_id, target_status,
+                kind='share_snapshot', response_key='snapshot',
+                error_states=('error', 'error_deleting'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     # ------------------------------------------------------------------
     # Resize helpers
@@ -779,15 +794,14 @@ class _NFSQoSTests(object):
             qos_type_name=qos_type['name'],
             backend_name=backend_name)
 
-        shares = []
-        for i in range(2):
-            share = self.create_share(
-                protocol='NFS',
-                share_type_name=share_type['name'],
-                name=data_utils.rand_name(f'ps-manila-qos-multi-{i}'),
-            )
+        shares = self.create_shares(
+            protocol='NFS',
+            share_type_name=share_type['name'],
+            count=2,
+            name_prefix='ps-manila-qos-multi',
+        )
+        for share in shares:
             self.assertEqual(share['status'], 'available')
-            shares.append(share)
 
         LOG.info("Created %d QoS NFS shares with shared policy",
                  len(shares))
@@ -929,7 +943,8 @@ class _NFSQoSTests(object):
             snapshot_id=snapshot['id'],
         )
         cl = clone.get('share', clone)
-        self.addCleanup(self._delete_share_safe, cl['id'])
+        self._cleanup_share(cl['id'], share_type['id'],
+                            snapshot_id=snapshot['id'])
         self._wait_for_share_status(cl['id'], 'available')
 
         cloned = self.shares_v2_client.get_share(cl['id'])
@@ -968,18 +983,10 @@ class _NFSQoSTests(object):
             share_id = sh['id']
 
             # Register cleanup for the share - this will run even if manual deletion fails
-            self.addCleanup(self._delete_share_safe, sh['id'])
+            self._cleanup_share(sh['id'])
 
             # Wait for share to reach error or available status
-            status = None
-            deadline = time.time() + NEGATIVE_TEST_TIMEOUT
-            while time.time() < deadline:
-                result = self.shares_v2_client.get_share(share_id)
-                result_sh = result.get('share', result)
-                status = result_sh.get('status', '').lower()
-                if status in ('error', 'available'):
-                    break
-                time.sleep(SHARE_BUILD_INTERVAL)
+            status = self._wait_for_share_outcome(share_id)
 
             if status != 'error':
                 self.fail(
@@ -1033,8 +1040,8 @@ class _NFSQoSTests(object):
         st = share_type.get('share_type', share_type)
 
         # Register cleanup for share type and QoS type
-        self.addCleanup(self._delete_share_type_safe, st['id'])
-        self.addCleanup(self._delete_qos_type_safe, qos_type['id'])
+        self._cleanup_share_type(st['id'])
+        self._cleanup_qos_type(qos_type['id'])
 
         name = data_utils.rand_name('ps-manila-qos-invalid-str')
         share_id = None
@@ -1048,17 +1055,9 @@ class _NFSQoSTests(object):
             share_id = sh['id']
 
             # Register cleanup for the share - this will run even if manual deletion fails
-            self.addCleanup(self._delete_share_safe, sh['id'])
+            self._cleanup_share(sh['id'])
 
-            status = None
-            deadline = time.time() + NEGATIVE_TEST_TIMEOUT
-            while time.time() < deadline:
-                result = self.shares_v2_client.get_share(share_id)
-                result_sh = result.get('share', result)
-                status = result_sh.get('status', '').lower()
-                if status in ('error', 'available'):
-                    break
-                time.sleep(SHARE_BUILD_INTERVAL)
+            status = self._wait_for_share_outcome(share_id)
 
             if status != 'error':
                 self.fail(
@@ -1107,18 +1106,10 @@ class _NFSQoSTests(object):
             share_id = sh['id']
 
             # Register cleanup for the share - this will run even if manual deletion fails
-            self.addCleanup(self._delete_share_safe, sh['id'])
+            self._cleanup_share(sh['id'])
 
             # Wait for share to reach error or available status
-            status = None
-            deadline = time.time() + NEGATIVE_TEST_TIMEOUT
-            while time.time() < deadline:
-                result = self.shares_v2_client.get_share(share_id)
-                result_sh = result.get('share', result)
-                status = result_sh.get('status', '').lower()
-                if status in ('error', 'available'):
-                    break
-                time.sleep(SHARE_BUILD_INTERVAL)
+            status = self._wait_for_share_outcome(share_id)
 
             if status != 'error':
                 self.fail(
@@ -1327,7 +1318,9 @@ class _QoSShareTypeTests(object):
         """Create a QoS type with max_bw and verify specs are stored."""
         LOG.info("=== test_create_qos_type_with_max_bw_spec ===")
 
-        qos_type = self.create_qos_type(specs={'max_bw': '1000'})
+        qos_type = self.create_qos_type(
+            name=data_utils.rand_name('ps-manila-qos-type'),
+            specs={'max_bw': '1000'})
 
         self.assertIsNotNone(qos_type.get('id'))
         specs = qos_type.get('specs', {})
@@ -1346,7 +1339,8 @@ class _QoSShareTypeTests(object):
 
         qos_type = self.create_qos_type(specs={'max_bw': '500'})
         share_type = self.create_qos_share_type(
-            qos_type_name=qos_type['name'])
+            qos_type_name=qos_type['name'],
+            name=data_utils.rand_name('ps-manila-qos-share-type'))
 
         specs = share_type.get('extra_specs', {})
         self.assertIn('default_qos_type', specs)
@@ -1379,9 +1373,11 @@ class _QoSShareTypeTests(object):
         """Create QoS type with minimum max_bw (1)."""
         LOG.info("=== test_create_qos_type_with_min_max_bw ===")
 
-        qos_type = self.create_qos_type(specs={
-            'max_bw': str(QOS_MAX_BW_MIN),
-        })
+        qos_type = self.create_qos_type(
+            name=data_utils.rand_name('ps-manila-qos-type'),
+            specs={
+                'max_bw': str(QOS_MAX_BW_MIN),
+            })
 
         specs = qos_type.get('specs', {})
         self.assertEqual(specs.get('max_bw'), str(QOS_MAX_BW_MIN))
@@ -1397,9 +1393,11 @@ class _QoSShareTypeTests(object):
         """Create QoS type with maximum max_bw (1000000)."""
         LOG.info("=== test_create_qos_type_with_max_max_bw ===")
 
-        qos_type = self.create_qos_type(specs={
-            'max_bw': str(QOS_MAX_BW_MAX),
-        })
+        qos_type = self.create_qos_type(
+            name=data_utils.rand_name('ps-manila-qos-type'),
+            specs={
+                'max_bw': str(QOS_MAX_BW_MAX),
+            })
 
         specs = qos_type.get('specs', {})
         self.assertEqual(specs.get('max_bw'), str(QOS_MAX_BW_MAX))
@@ -1419,8 +1417,12 @@ class _QoSShareTypeTests(object):
         """
         LOG.info("=== test_two_qos_types_different_bw ===")
 
-        qt1 = self.create_qos_type(specs={'max_bw': '100'})
-        qt2 = self.create_qos_type(specs={'max_bw': '200'})
+        qt1 = self.create_qos_type(
+            name=data_utils.rand_name('ps-manila-qos-type'),
+            specs={'max_bw': '100'})
+        qt2 = self.create_qos_type(
+            name=data_utils.rand_name('ps-manila-qos-type'),
+            specs={'max_bw': '200'})
 
         self.assertNotEqual(qt1['id'], qt2['id'])
         self.assertNotEqual(qt1['name'], qt2['name'])
@@ -36,10 +36,6 @@ NFS and CIFS are tested independently because _get_backend_share_name()
 uses different path-parsing logic for each protocol.
 """
 
-import configparser
-import time
-
-import requests
 from oslo_config import cfg
 from oslo_log import log as logging
 from tempest import clients
@@ -49,11 +45,19 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import backend_config as dell_backends
+from dell_tempest_plugin.common import backend_fixtures as dell_fixtures
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import inventory as dell_inventory
+from dell_tempest_plugin.common import manila_clients as dell_manila
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin.services import powerstore_client
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 SHARE_BUILD_TIMEOUT = 600
-SHARE_BUILD_INTERVAL = 5
 
 # Minimum share size (GiB) used by tests
 PS_MIN_SIZE = 10
@@ -62,9 +66,13 @@ PS_MIN_SIZE = 10
 # ======================================================================
 # Base mixin — helpers only, no test methods
 # ======================================================================
-class PowerStoreShareManageUnmanageBase(object):
+class PowerStoreShareManageUnmanageBase(dell_inventory.LeakCheckMixin):
     """Mixin providing Manila + PowerStore REST helpers."""
 
+    # Backend shares per protocol and size that ``create_backend_share``
+    # keeps building ahead of the next test; 0 builds one per call.
+    backend_share_prefetch = 0
+
     # ------------------------------------------------------------------
     # Client resolution
     # ------------------------------------------------------------------
@@ -78,55 +86,26 @@ class PowerStoreShareManageUnmanageBase(object):
         cls.share_types_client = cls._get_manila_share_types_client(
             cls.admin_manager)
 
+    def setUp(self):
+        super(PowerStoreShareManageUnmanageBase, self).setUp()
+        dell_budget.start_test_budget(self)
+
+    @classmethod
+    def resource_cleanup(cls):
+        builders = cls.__dict__.get('_backend_share_builders') or {}
+        for builder in builders.values():
+            builder.teardown()
+        super(PowerStoreShareManageUnmanageBase, cls).resource_cleanup()
+
     @staticmethod
     def _get_manila_client(manager):
         """Resolve Manila shares client from the manager."""
-        for attr in ('shares_v2_client', 'shares_client',
-                     'share_v2_client', 'share_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        try:
-            from manila_tempest_tests.services.share.v2.json import (
-                shares_client as manila_shares_client)
-            service_type = getattr(CONF, 'share', None)
-            configured_type = getattr(service_type, 'catalog_type',
-                                      None) if service_type else None
-            region = (getattr(service_type, 'region', None)
-                      if service_type else None) or CONF.identity.region
-            endpoint_type = (getattr(service_type, 'endpoint_type', 'public')
-                             if service_type else 'public')
-            catalog_type = configured_type
-            if not catalog_type or catalog_type == 'share':
-                try:
-                    auth_data = manager.auth_provider.get_auth()
-                    catalog = auth_data[1].get('catalog', [])
-                    for entry in catalog:
-                        if entry.get('type') in (
-                                'shared-file-system', 'share'):
-                            catalog_type = entry['type']
-                            break
-                except Exception:
-                    pass
-            catalog_type = catalog_type or 'shared-file-system'
-            return manila_shares_client.SharesV2Client(
-                auth_provider=manager.auth_provider,
-                service=catalog_type,
-                region=region,
-                endpoint_type=endpoint_type,
-            )
-        except ImportError:
-            pass
-        return None
+        return dell_manila.shares_client(manager)
 
     @classmethod
     def _get_manila_share_types_client(cls, manager):
         """Resolve Manila share types client from the manager."""
-        for attr in ('share_types_v2_client', 'share_types_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        return cls._get_manila_client(manager)
+        return dell_manila.share_types_client(manager)
 
     # ------------------------------------------------------------------
     # PowerStore REST API helpers
@@ -136,21 +115,14 @@ class PowerStoreShareManageUnmanageBase(object):
         """Read PowerStore credentials from manila.conf."""
         if hasattr(cls, '_ps_config_loaded'):
             return
-        conf = configparser.ConfigParser()
-        conf.read('/etc/manila/manila.conf')
-        backend = None
-        for section in conf.sections():
-            if conf.has_option(section, 'dell_nas_backend_host'):
-                backend = section
-                break
-        if not backend:
+        backend = dell_backends.manila().find('powerstore')
+        if backend is None or not backend.nas_server:
             raise Exception(
                 "No PowerStore backend section found in manila.conf")
-        cls._ps_ip = conf.get(backend, 'dell_nas_backend_host')
-        cls._ps_user = conf.get(backend, 'dell_nas_login')
-        cls._ps_pass = conf.get(backend, 'dell_nas_password')
-        cls._ps_nas_server = conf.get(backend, 'dell_nas_server')
-        cls._ps_base_url = 'https://%s/api/rest' % cls._ps_ip
+        cls._ps_ip = backend.host
+        cls._ps_user = backend.user
+        cls._ps_pass = backend.password
+        cls._ps_nas_server = backend.nas_server
         cls._ps_config_loaded = True
         LOG.info("PowerStore config: ip=%s nas_server=%s",
                  cls._ps_ip, cls._ps_nas_server)
@@ -158,17 +130,10 @@ class PowerStoreShareManageUnmanageBase(object):
     def _ps_request(self, method, path, payload=None, params=None):
         """Send a request to PowerStore REST API."""
         self._load_ps_config()
-        url = self._ps_base_url + path
-        kwargs = {
-            'auth': (self._ps_user, self._ps_pass),
-            'verify': False,
-            'timeout': 30,
-        }
-        if params:
-            kwargs['params'] = params
-        if payload and method != 'GET':
-            kwargs['json'] = payload
-        resp = requests.request(method, url, **kwargs)
+        client = powerstore_client.get_client(
+            self._ps_ip, self._ps_user, self._ps_pass)
+        resp = client.request(method, path, payload=payload or None,
+                              params=params or None)
         try:
             data = resp.json()
         except ValueError:
@@ -274,9 +239,40 @@ class PowerStoreShareManageUnmanageBase(object):
         """Create a complete share on PowerStore backend via REST API.
 
         Returns (filesystem_id, export_path) tuple.
-        Registers cleanup so the filesystem is removed if manage fails.
+        Without *name*, the share comes from the class's fixture builder
+        when ``backend_share_prefetch`` is set and one was built ahead;
+        it is removed at class teardown.  Otherwise a cleanup is
+        registered so the filesystem is removed if manage fails.
         """
+        if name is None and self.backend_share_prefetch:
+            fixture = self._backend_share_builder(protocol, size_gb).take()
+            if fixture is not None:
+                return fixture
         name = name or data_utils.rand_name('ps-backend')
+        fs_id, export_path = self._build_backend_share(protocol, name,
+                                                       size_gb)
+        self.addCleanup(self._ps_cleanup_filesystem, fs_id)
+        return fs_id, export_path
+
+    def _backend_share_builder(self, protocol, size_gb):
+        """Return the class's builder of *protocol* backend shares."""
+        cls = type(self)
+        builders = cls.__dict__.get('_backend_share_builders')
+        if builders is None:
+            builders = {}
+            cls._backend_share_builders = builders
+        key = (protocol.upper(), size_gb)
+        if key not in builders:
+            builders[key] = dell_fixtures.FixtureBuilder(
+                build=lambda: self._build_backend_share(
+                    protocol, data_utils.rand_name('ps-backend'), size_gb),
+                destroy=lambda fixture: self._ps_cleanup_filesystem(
+                    fixture[0]),
+                prefetch=self.backend_share_prefetch)
+        return builders[key]
+
+    def _build_backend_share(self, protocol, name, size_gb):
+        """Create filesystem plus NFS export or SMB share; no cleanup."""
         fs_id, nas_server_id = self._ps_create_filesystem(name, size_gb)
         interfaces = self._ps_get_nas_server_interfaces(nas_server_id)
         if not interfaces:
@@ -301,7 +297,6 @@ class PowerStoreShareManageUnmanageBase(object):
 
         LOG.info("Backend share: protocol=%s export_path=%s fs_id=%s",
                  protocol, export_path, fs_id)
-        self.addCleanup(self._ps_cleanup_filesystem, fs_id)
         return fs_id, export_path
 
     # ------------------------------------------------------------------
@@ -321,17 +316,14 @@ class PowerStoreShareManageUnmanageBase(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) with specs=%s",
                  st['name'], st['id'], specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
+        self._cleanup_share_type(st['id'])
         return st
 
-    def _delete_share_type_safe(self, share_type_id):
-        try:
-            self.share_types_client.delete_share_type(share_type_id)
-        except lib_exc.NotFound:
-            pass
-        except Exception as e:
-            LOG.warning("Failed to delete share type %s: %s",
-                        share_type_id, e)
+    def _cleanup_share_type(self, share_type_id):
+        """Register a share type with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_type', share_type_id,
+            self.share_types_client.delete_share_type)
 
     # ------------------------------------------------------------------
     # Manila share helpers
@@ -349,7 +341,7 @@ class PowerStoreShareManageUnmanageBase(object):
         )
         sh = share.get('share', share)
         LOG.info("Manage request: id=%s export=%s", sh['id'], export_path)
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         result = self.shares_v2_client.get_share(sh['id'])
         return result.get('share', result)
@@ -373,20 +365,19 @@ class PowerStoreShareManageUnmanageBase(object):
             return None
 
         sh = share.get('share', share)
-        self.addCleanup(self._delete_share_safe, sh['id'])
-        deadline = time.time() + SHARE_BUILD_TIMEOUT
-        while time.time() < deadline:
-            s = self.shares_v2_client.get_share(sh['id'])
-            s = s.get('share', s)
-            status = s.get('status', '').lower()
-            if status in ('error', 'manage_error'):
-                LOG.info("Manage correctly failed with status=%s", status)
-                return s
-            if status == 'available':
-                return s
-            time.sleep(SHARE_BUILD_INTERVAL)
-        result = self.shares_v2_client.get_share(sh['id'])
-        return result.get('share', result)
+        self._cleanup_share(sh['id'], sh.get('share_type'))
+        try:
+            s = dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, sh['id'],
+                ('error', 'manage_error', 'available'),
+                kind='share', response_key='share', error_states=(),
+                timeout=SHARE_BUILD_TIMEOUT)
+        except dell_waiters.WaitTimeout:
+            result = self.shares_v2_client.get_share(sh['id'])
+            return result.get('share', result)
+        if s['status'].lower() != 'available':
+            LOG.info("Manage correctly failed with status=%s", s['status'])
+        return s
 
     def unmanage_share(self, share_id):
         """Unmanage a share (removes from Manila, keeps on backend)."""
@@ -410,50 +401,49 @@ class PowerStoreShareManageUnmanageBase(object):
         result = self.shares_v2_client.get_share(share_id)
         return result.get('share', result)
 
-    def _delete_share_safe(self, share_id):
-        try:
-            self.shares_v2_client.delete_share(share_id)
-        except lib_exc.NotFound:
-            return
-        except Exception as e:
-            LOG.warning("Failed to delete share %s: %s", share_id, e)
-            return
-        self._wait_for_share_deletion(share_id)
+    def _cleanup_share(self, share_id, share_type_id=None):
+        """Register a share with the test's cleanup executor.
+
+        Shares of one test are deleted together and their deletions
+        awaited in one batch before any share type is removed.
+        """
+        dell_cleanup.get_executor(self).add(
+            'share', share_id, self.shares_v2_client.delete_share,
+            waiter=self._share_deletion_waiter,
+            depends_on=[('share_type', share_type_id)])
+
+    def _share_deletion_waiter(self, share_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_share, share_id, kind='share',
+            response_key='share', error_states=('error_deleting',),
+            timeout=SHARE_BUILD_TIMEOUT)
 
     def _wait_for_share_status(self, share_id, target_status,
                                timeout=SHARE_BUILD_TIMEOUT,
-                               interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            share = self.shares_v2_client.get_share(share_id)
-            sh = share.get('share', share)
-            status = sh.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'error_deleting',
-                          'manage_error', 'shrinking_error',
-                          'extending_error'):
-                self.fail(
-                    "Share %s entered error state: %s" % (share_id, status))
-            time.sleep(interval)
-        self.fail(
-            "Timeout waiting for share %s to reach '%s'; last='%s'"
-            % (share_id, target_status, last_status))
+                               interval=None):
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, target_status,
+                kind='share',
+                response_key='share',
+                error_states=('error', 'error_deleting',
+                              'manage_error', 'shrinking_error',
+                              'extending_error'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     def _wait_for_share_deletion(self, share_id,
                                  timeout=SHARE_BUILD_TIMEOUT,
-                                 interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_share(share_id)
-            except lib_exc.NotFound:
-                LOG.info("Share %s deletion confirmed", share_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for share %s deletion", share_id)
+                                 interval=None):
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_share, share_id, kind='share',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for share %s deletion", share_id)
+            return
+        LOG.info("Share %s deletion confirmed", share_id)
 
     def _get_export_locations(self, share_id):
         el = self.shares_v2_client.list_share_export_locations(share_id)
@@ -491,72 +481,77 @@ class PowerStoreShareManageUnmanageBase(object):
     # ------------------------------------------------------------------
     def _wait_for_snapshot_status(self, snapshot_id, target,
                                   timeout=SHARE_BUILD_TIMEOUT,
-                                  interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            snap = self.shares_v2_client.get_snapshot(snapshot_id)
-            snap = snap.get('snapshot', snap)
-            status = snap.get('status', '').lower()
-            if status == target:
-                return
-            if 'error' in status:
-                self.fail("Snapshot %s error: %s" % (snapshot_id, status))
-            time.sleep(interval)
-        self.fail("Timeout waiting for snapshot %s status '%s'"
-                  % (snapshot_id, target))
+                                  interval=None):
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_snapshot, snapshot_id, target,
+                kind='share_snapshot', response_key='snapshot',
+                error_states=dell_waiters.ANY_ERROR,
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     def _wait_for_snapshot_deletion(self, snapshot_id,
                                     timeout=SHARE_BUILD_TIMEOUT,
-                                    interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_snapshot(snapshot_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for snapshot %s deletion", snapshot_id)
-
-    def _delete_snapshot_safe(self, snapshot_id):
+                                    interval=None):
         try:
-            self.shares_v2_client.delete_snapshot(snapshot_id)
-        except lib_exc.NotFound:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_snapshot, snapshot_id,
+                kind='share_snapshot',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for snapshot %s deletion", snapshot_id)
             return
-        except Exception:
-            pass
-        self._wait_for_snapshot_deletion(snapshot_id)
+
+    def _cleanup_snapshot(self, snapshot_id, share_id=None):
+        """Register a snapshot with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_snapshot', snapshot_id,
+            self.shares_v2_client.delete_snapshot,
+            waiter=self._snapshot_deletion_waiter,
+            depends_on=[('share', share_id)])
+
+    def _snapshot_deletion_waiter(self, snapshot_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_snapshot, snapshot_id,
+            kind='share_snapshot', response_key='snapshot',
+            error_states=('error_deleting',), timeout=SHARE_BUILD_TIMEOUT)
 
     # ------------------------------------------------------------------
     # Access rule helpers
     # ------------------------------------------------------------------
+    def _get_access_rule(self, share_id, rule_id):
+        """Return the access rule with its state copied to ``status``."""
+        rules_resp = self.shares_v2_client.list_access_rules(share_id)
+        rules = (rules_resp.get('access_list') or
+                 rules_resp.get('share_access_rules') or
+                 rules_resp)
+        if isinstance(rules, list):
+            for r in rules:
+                if r['id'] == rule_id:
+                    return dict(r, status=r.get(
+                        'state', r.get('access_state', '')))
+        return {}
+
     def _wait_for_access_rule_status(self, share_id, rule_id, target,
                                       timeout=SHARE_BUILD_TIMEOUT,
-                                      interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            rules_resp = self.shares_v2_client.list_access_rules(share_id)
-            rules = (rules_resp.get('access_list') or
-                     rules_resp.get('share_access_rules') or
-                     rules_resp)
-            if isinstance(rules, list):
-                for r in rules:
-                    if r['id'] == rule_id:
-                        state = r.get('state', r.get('access_state', ''))
-                        if state.lower() == target:
-                            return
-                        if 'error' in state.lower():
-                            self.fail("Access rule %s error: %s"
-                                      % (rule_id, state))
-                        break
-            time.sleep(interval)
-        self.fail("Timeout waiting for access rule %s status '%s'"
-                  % (rule_id, target))
-
-    def _delete_access_rule_safe(self, share_id, rule_id):
+                                      interval=None):
         try:
-            self.shares_v2_client.delete_access_rule(share_id, rule_id)
-        except (lib_exc.NotFound, Exception):
-            pass
+            dell_waiters.wait_for_status(
+                lambda rid: self._get_access_rule(share_id, rid), rule_id,
+                target, kind='access_rule',
+                error_states=dell_waiters.ANY_ERROR,
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
+
+    def _cleanup_access_rule(self, share_id, rule_id):
+        """Register an access rule with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'access_rule', rule_id,
+            lambda rid: self.shares_v2_client.delete_access_rule(
+                share_id, rid),
+            depends_on=[('share', share_id)])
 
 
 # ======================================================================
@@ -574,6 +569,9 @@ class _ManageUnmanageTests(object):
 
     protocol = None
 
+    # Build the next test's backend share while the current one runs.
+    backend_share_prefetch = 1
+
     @classmethod
     def skip_checks(cls):
         super(_ManageUnmanageTests, cls).skip_checks()
@@ -752,7 +750,7 @@ class _ManageUnmanageTests(object):
         snapshot = self.shares_v2_client.create_snapshot(
             managed['id'], name=snap_name)
         snap = snapshot.get('snapshot', snapshot)
-        self.addCleanup(self._delete_snapshot_safe, snap['id'])
+        self._cleanup_snapshot(snap['id'], managed['id'])
         self._wait_for_snapshot_status(snap['id'], 'available')
 
         snap_detail = self.shares_v2_client.get_snapshot(snap['id'])
@@ -799,7 +797,7 @@ class _ManageUnmanageTests(object):
         snapshot = self.shares_v2_client.create_snapshot(
             managed['id'], name=snap_name)
         snap = snapshot.get('snapshot', snapshot)
-        self.addCleanup(self._delete_snapshot_safe, snap['id'])
+        self._cleanup_snapshot(snap['id'], managed['id'])
         self._wait_for_snapshot_status(snap['id'], 'available')
 
         self.shares_v2_client.revert_to_snapshot(
@@ -863,26 +861,16 @@ class _ManageUnmanageTests(object):
             access_level='rw',
         )
         rule = rule.get('access', rule)
-        self.addCleanup(
-            self._delete_access_rule_safe, managed['id'], rule['id'])
-
-        deadline = time.time() + SHARE_BUILD_TIMEOUT
-        final_state = None
-        while time.time() < deadline:
-            rules_resp = self.shares_v2_client.list_access_rules(
-                managed['id'])
-            rules = (rules_resp.get('access_list') or
-                     rules_resp.get('share_access_rules') or
-                     rules_resp)
-            if isinstance(rules, list):
-                for r in rules:
-                    if r['id'] == rule['id']:
-                        final_state = r.get(
-                            'state', r.get('access_state', ''))
-                        break
-            if final_state and final_state.lower() in ('active', 'error'):
-                break
-            time.sleep(SHARE_BUILD_INTERVAL)
+        self._cleanup_access_rule(managed['id'], rule['id'])
+
+        try:
+            rule_after = dell_waiters.wait_for_status(
+                lambda rid: self._get_access_rule(managed['id'], rid),
+                rule['id'], ('active', 'error'), kind='access_rule',
+                error_states=(), timeout=SHARE_BUILD_TIMEOUT)
+            final_state = rule_after['status']
+        except dell_waiters.WaitTimeout as e:
+            self.fail(str(e))
 
         if final_state and final_state.lower() == 'active':
             LOG.info("%s access rule active on managed share %s",
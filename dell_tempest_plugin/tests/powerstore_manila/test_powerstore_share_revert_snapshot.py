@@ -49,10 +49,8 @@ PowerStore driver path (Manila):
   - client.py: POST /api/rest/file_system_snapshot/{snapshot_id}/restore
 """
 
-import configparser
 import time
 
-import requests
 from oslo_log import log as logging
 from tempest import clients
 from tempest import config
@@ -62,18 +60,28 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import admin_clients
+from dell_tempest_plugin.common import backend_config as dell_backends
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import inventory as dell_inventory
+from dell_tempest_plugin.common import manila_clients as dell_manila
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin.common import warm_pool as dell_pools
+from dell_tempest_plugin.services import powerstore_client
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 SHARE_BUILD_TIMEOUT = 600
-SHARE_BUILD_INTERVAL = 5
 SHARE_MIN_SIZE = 3
 
 
 # ======================================================================
 # Base mixin — helpers only, no test methods
 # ======================================================================
-class PowerStoreShareRevertSnapshotTest(object):
+class PowerStoreShareRevertSnapshotTest(dell_inventory.LeakCheckMixin):
     """Mixin with helpers for PowerStore share revert-to-snapshot tests.
 
     Provides utility methods for creating share types (with
@@ -99,55 +107,19 @@ class PowerStoreShareRevertSnapshotTest(object):
         if cls.share_types_client is None:
             cls.skipTest("Manila share types client not available")
 
+    def setUp(self):
+        super(PowerStoreShareRevertSnapshotTest, self).setUp()
+        dell_budget.start_test_budget(self)
+
     @staticmethod
     def _get_manila_client(manager):
         """Resolve Manila shares client from the manager."""
-        for attr in ('shares_v2_client', 'shares_client',
-                     'share_v2_client', 'share_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        try:
-            from manila_tempest_tests.services.share.v2.json import (
-                shares_client as manila_shares_client)
-            service_type = getattr(CONF, 'share', None)
-            configured_type = getattr(service_type, 'catalog_type',
-                                      None) if service_type else None
-            region = (getattr(service_type, 'region', None)
-                      if service_type else None) or CONF.identity.region
-            endpoint_type = (getattr(service_type, 'endpoint_type', 'public')
-                             if service_type else 'public')
-            catalog_type = configured_type
-            if not catalog_type or catalog_type == 'share':
-                try:
-                    auth_data = manager.auth_provider.get_auth()
-                    catalog = auth_data[1].get('catalog', [])
-                    for entry in catalog:
-                        if entry.get('type') in ('shared-file-system', 'share'):
-                            catalog_type = entry['type']
-                            break
-                except Exception:
-                    pass
-            catalog_type = catalog_type or 'shared-file-system'
-            return manila_shares_client.SharesV2Client(
-                auth_provider=manager.auth_provider,
-                service=catalog_type,
-                region=region,
-                endpoint_type=endpoint_type,
-            )
-        except ImportError:
-            return None
+        return dell_manila.shares_client(manager)
 
     @classmethod
     def _get_manila_share_types_client(cls, manager):
         """Resolve Manila share types client from the manager."""
-        for attr in ('share_types_client', 'share_types_v2_client',
-                     'share_type_client', 'share_type_v2_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        # Fall back to using the shares client's share_types endpoint
-        return cls._get_manila_client(manager)
+        return dell_manila.share_types_client(manager)
 
     @classmethod
     def skip_checks(cls):
@@ -161,26 +133,39 @@ class PowerStoreShareRevertSnapshotTest(object):
     # Share type helpers
     # ------------------------------------------------------------------
     def create_revert_share_type(self):
-        """Create a share type with revert_to_snapshot_support enabled."""
-        name = data_utils.rand_name(
-            prefix=CONF.resource_name_prefix,
-            name='ps-revert-type')
+        """Return a share type with revert_to_snapshot_support enabled.
+
+        The type is shared by every test of the worker (see
+        ``type_registry``) and deleted at worker teardown.
+        """
         extra_specs = {
             'driver_handles_share_servers': 'False',
             'snapshot_support': 'True',
             'revert_to_snapshot_support': 'True',
         }
+        return dell_types.acquire(
+            self, 'share_type', extra_specs,
+            lambda name: self._new_revert_share_type(extra_specs, name))
+
+    def _new_revert_share_type(self, extra_specs, name=None):
+        name = name or data_utils.rand_name(
+            prefix=CONF.resource_name_prefix,
+            name='ps-revert-type')
         st = self.share_types_client.create_share_type(
             name=name,
             extra_specs=extra_specs)['share_type']
         LOG.info("Created share type '%s' (id=%s) with extra_specs=%s",
                  st['name'], st['id'], extra_specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
         return st
 
+    def _cleanup_share_type(self, share_type_id):
+        """Register a share type; deletion retries while it is in use."""
+        dell_cleanup.get_executor(self).add(
+            'share_type', share_type_id, self._delete_share_type_safe)
+
     def _delete_share_type_safe(self, type_id, timeout=300, interval=5):
         """Try to delete a share type; retry if still in use."""
-        end = time.time() + timeout
+        end = time.time() + dell_budget.cap(timeout)
         while time.time() < end:
             try:
                 self.share_types_client.delete_share_type(type_id)
@@ -201,7 +186,15 @@ class PowerStoreShareRevertSnapshotTest(object):
     # ------------------------------------------------------------------
     def create_share(self, protocol='NFS', share_type_name=None,
                     size=SHARE_MIN_SIZE):
-        """Create a share and wait until available."""
+        """Create a share and wait until available.
+
+        With warm pools enabled, a pre-created share is leased instead.
+        """
+        pool = self._share_pool(protocol, share_type_name, size)
+        share = pool.lease() if pool else None
+        if share is not None:
+            self.addCleanup(pool.recycle, share['id'])
+            return share
         name = data_utils.rand_name(
             prefix=CONF.resource_name_prefix,
             name='ps-revert-share')
@@ -213,37 +206,68 @@ class PowerStoreShareRevertSnapshotTest(object):
         )['share']
         LOG.info("Created share '%s' (id=%s) with protocol=%s, size=%d",
                  share['name'], share['id'], protocol, size)
-        self.addCleanup(self._delete_share_safe, share['id'])
+        self._cleanup_share(share['id'], share.get('share_type'))
         self._wait_for_share_status(share['id'], 'available')
         return self.shares_v2_client.get_share(share['id'])['share']
 
-    def _delete_share_safe(self, share_id):
-        """Delete a share; ignore NotFound."""
-        try:
-            self.shares_v2_client.delete_share(share_id)
-        except lib_exc.NotFound:
-            return
-        except Exception as e:
-            LOG.debug("delete_share(%s) raised: %s", share_id, e)
-        try:
-            self.shares_v2_client.wait_for_resource_deletion(share_id=share_id)
-        except lib_exc.NotFound:
-            pass
-        except Exception:
-            self._wait_for_share_deletion(share_id)
+    def _share_pool(self, protocol, share_type_name, size):
+        """Return the warm pool of shares with these parameters.
+
+        The pool outlives the class, so its shares are created and
+        deleted with the static admin clients, not the class's.
+        """
+        shares = admin_clients.shares_client()
+        if shares is None:
+            return None
+        return dell_pools.get_pool(
+            ('share', share_type_name, size, protocol), 'share',
+            create=lambda: shares.create_share(
+                name=data_utils.rand_name(
+                    prefix=CONF.resource_name_prefix,
+                    name='ps-revert-share'),
+                share_protocol=protocol,
+                share_type_id=share_type_name,
+                size=size,
+            )['share'],
+            ready=lambda sid: dell_waiters.wait_for_status(
+                shares.get_share, sid, 'available', kind='share',
+                response_key='share', error_states=('error',)),
+            delete=shares.delete_share,
+            waiter=lambda sid: dell_waiters.deletion_waiter(
+                shares.get_share, sid, kind='share', response_key='share',
+                error_states=('error_deleting',)))
+
+    def _cleanup_share(self, share_id, share_type_id=None,
+                       snapshot_id=None):
+        """Register a share with the test's cleanup executor.
+
+        Shares of one test are deleted together and their deletions
+        awaited in one batch before any share type is removed; a share
+        created from *snapshot_id* goes before that snapshot.
+        """
+        dell_cleanup.get_executor(self).add(
+            'share', share_id, self.shares_v2_client.delete_share,
+            waiter=self._share_deletion_waiter,
+            depends_on=[('share_type', share_type_id),
+                        ('share_snapshot', snapshot_id)])
+
+    def _share_deletion_waiter(self, share_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_share, share_id, kind='share',
+            response_key='share', error_states=('error_deleting',),
+            timeout=SHARE_BUILD_TIMEOUT)
 
     def _wait_for_share_deletion(self, share_id,
                                 timeout=SHARE_BUILD_TIMEOUT,
-                                interval=SHARE_BUILD_INTERVAL):
+                                interval=None):
         """Poll until a share is gone."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_share(share_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for share %s deletion", share_id)
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_share, share_id, kind='share',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for share %s deletion", share_id)
+            return
 
     def _get_export_locations(self, share_id):
         """Retrieve export locations for a share via dedicated API.
@@ -261,22 +285,16 @@ class PowerStoreShareRevertSnapshotTest(object):
 
     def _wait_for_share_status(self, share_id, target,
                               timeout=SHARE_BUILD_TIMEOUT,
-                              interval=SHARE_BUILD_INTERVAL):
+                              interval=None):
         """Poll until the share reaches the target status."""
-        deadline = time.time() + timeout
-        last = None
-        while time.time() < deadline:
-            s = self.shares_v2_client.get_share(share_id)['share']
-            status = (s.get('status') or '').lower()
-            last = status
-            if status == target:
-                return s
-            if status in ('error', 'error_reverting'):
-                self.fail(
-                    "Share %s entered error state: %s" % (share_id, status))
-            time.sleep(interval)
-        self.fail("Timeout waiting for share %s to reach '%s'; "
-                  "last='%s'" % (share_id, target, last))
+        try:
+            return dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, target,
+                kind='share', response_key='share',
+                error_states=('error', 'error_reverting'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     # ------------------------------------------------------------------
     # Snapshot helpers
@@ -293,56 +311,49 @@ class PowerStoreShareRevertSnapshotTest(object):
         )['snapshot']
         LOG.info("Created snapshot '%s' (id=%s) for share %s",
                  snap['name'], snap['id'], share_id)
-        self.addCleanup(self._delete_snapshot_safe, snap['id'])
+        self._cleanup_snapshot(snap['id'], share_id)
         self._wait_for_snapshot_status(snap['id'], 'available')
         return self.shares_v2_client.get_snapshot(snap['id'])['snapshot']
 
-    def _delete_snapshot_safe(self, snap_id):
-        """Delete a snapshot; ignore NotFound."""
-        try:
-            self.shares_v2_client.delete_snapshot(snap_id)
-        except lib_exc.NotFound:
-            return
-        except Exception as e:
-            LOG.debug("delete_snapshot(%s) raised: %s", snap_id, e)
-        try:
-            self.shares_v2_client.wait_for_resource_deletion(snapshot_id=snap_id)
-        except lib_exc.NotFound:
-            pass
-        except Exception:
-            self._wait_for_snapshot_deletion(snap_id)
+    def _cleanup_snapshot(self, snapshot_id, share_id=None):
+        """Register a snapshot with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_snapshot', snapshot_id,
+            self.shares_v2_client.delete_snapshot,
+            waiter=self._snapshot_deletion_waiter,
+            depends_on=[('share', share_id)])
+
+    def _snapshot_deletion_waiter(self, snapshot_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_snapshot, snapshot_id,
+            kind='share_snapshot', response_key='snapshot',
+            error_states=('error_deleting',), timeout=SHARE_BUILD_TIMEOUT)
 
     def _wait_for_snapshot_deletion(self, snap_id,
                                     timeout=SHARE_BUILD_TIMEOUT,
-                                    interval=SHARE_BUILD_INTERVAL):
+                                    interval=None):
         """Poll until a snapshot is gone."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_snapshot(snap_id)
-            except lib_exc.NotFound:
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for snapshot %s deletion", snap_id)
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_snapshot, snap_id,
+                kind='share_snapshot',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for snapshot %s deletion", snap_id)
+            return
 
     def _wait_for_snapshot_status(self, snap_id, target,
                                   timeout=SHARE_BUILD_TIMEOUT,
-                                  interval=SHARE_BUILD_INTERVAL):
+                                  interval=None):
         """Poll until the snapshot reaches the target status."""
-        deadline = time.time() + timeout
-        last = None
-        while time.time() < deadline:
-            s = self.shares_v2_client.get_snapshot(snap_id)['snapshot']
-            status = (s.get('status') or '').lower()
-            last = status
-            if status == target:
-                return s
-            if status in ('error', 'error_deleting'):
-                self.fail(
-                    "Snapshot %s entered error state: %s" % (snap_id, status))
-            time.sleep(interval)
-        self.fail("Timeout waiting for snapshot %s to reach '%s'; "
-                  "last='%s'" % (snap_id, target, last))
+        try:
+            return dell_waiters.wait_for_status(
+                self.shares_v2_client.get_snapshot, snap_id, target,
+                kind='share_snapshot', response_key='snapshot',
+                error_states=('error', 'error_deleting'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     # ------------------------------------------------------------------
     # Revert-to-snapshot helper
@@ -374,7 +385,8 @@ class PowerStoreShareRevertSnapshotTest(object):
     def _get_powerstore_snapshot_details(self, snapshot_id):
         """Query the PowerStore REST API to get snapshot details.
 
-        Reads PowerStore credentials from manila.conf [powerstore] section.
+        Reads PowerStore credentials from the manila.conf [powerstore]
+        section, or else any PowerStore backend.
         Returns the snapshot details dict, or None if not found.
 
         This is used for backend verification to ensure the PowerStore
@@ -384,38 +396,25 @@ class PowerStoreShareRevertSnapshotTest(object):
                            snapshot name or ID).
         :returns: Snapshot details dict from PowerStore API, or None.
         """
-        try:
-            conf = configparser.ConfigParser()
-            conf.read('/etc/manila/manila.conf')
-            ps_ip = conf.get('powerstore', 'san_ip')
-            ps_user = conf.get('powerstore', 'san_login')
-            ps_pass = conf.get('powerstore', 'san_password')
-        except Exception as e:
-            LOG.warning("Cannot read PowerStore creds from manila.conf: %s", e)
+        backend = dell_backends.manila().find('powerstore',
+                                              names=['powerstore'])
+        if backend is None:
+            LOG.warning("No PowerStore backend found in manila.conf")
             return None
 
         # PowerStore uses snapshot name as the identifier in Manila
         # Try both by ID and by name
-        url = 'https://%s/api/rest/file_system_snapshot' % ps_ip
-        params = {
-            'name': 'eq.%s' % snapshot_id,
-            'select': 'id,name,file_system_id',
-        }
+        client = powerstore_client.get_client(
+            backend.host, backend.user, backend.password)
         try:
-            resp = requests.get(
-                url, params=params,
-                auth=(ps_user, ps_pass),
-                verify=False, timeout=30)
-            if resp.status_code == 200:
-                data = resp.json()
-                if data:
-                    snap_details = data[0]
-                    LOG.info("PowerStore snapshot '%s' found: id=%s, fs_id=%s",
-                             snapshot_id, snap_details.get('id'),
-                             snap_details.get('file_system_id'))
-                    return snap_details
-            LOG.warning("PowerStore snapshot lookup for '%s' returned %s",
-                        snapshot_id, resp.status_code)
+            snap_details = client.find_file_system_snapshot(
+                snapshot_id, select='id,name,file_system_id')
+            if snap_details:
+                LOG.info("PowerStore snapshot '%s' found: id=%s, fs_id=%s",
+                         snapshot_id, snap_details.get('id'),
+                         snap_details.get('file_system_id'))
+                return snap_details
+            LOG.warning("PowerStore snapshot '%s' not found", snapshot_id)
         except Exception as e:
             LOG.warning("PowerStore REST query failed: %s", e)
         return None
@@ -652,10 +651,11 @@ class _NegativeRevertSnapshotTests(object):
         try:
             self.shares_v2_client.revert_to_snapshot(
                 share2['id'], snapshot['id'])
-            # If API accepted, wait and check for error state
-            time.sleep(5)
-            share2_after = self.shares_v2_client.get_share(
-                share2['id'])['share']
+            # If API accepted, wait for the revert to settle
+            share2_after = dell_waiters.settle_share(
+                self.shares_v2_client, share2['id'],
+                ('error', 'error_reverting'),
+                timeout=SHARE_BUILD_TIMEOUT)
             self.assertIn(
                 share2_after['status'],
                 ('error', 'error_reverting', 'available'),
@@ -694,10 +694,11 @@ class _NegativeRevertSnapshotTests(object):
         try:
             self.shares_v2_client.revert_to_snapshot(
                 share['id'], fake_snap_id)
-            # If API accepted, wait and check for error state
-            time.sleep(5)
-            share_after = self.shares_v2_client.get_share(
-                share['id'])['share']
+            # If API accepted, wait for the revert to settle
+            share_after = dell_waiters.settle_share(
+                self.shares_v2_client, share['id'],
+                ('error', 'error_reverting'),
+                timeout=SHARE_BUILD_TIMEOUT)
             self.assertIn(
                 share_after['status'],
                 ('error', 'error_reverting', 'available'),
@@ -778,7 +779,7 @@ class _ShareTypeRevertTests(object):
             extra_specs=extra_specs)['share_type']
         LOG.info("Created share type '%s' (id=%s) with extra_specs=%s",
                  st['name'], st['id'], extra_specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
+        self._cleanup_share_type(st['id'])
 
         specs = st.get('extra_specs', {})
         self.assertNotIn('revert_to_snapshot_support', specs)
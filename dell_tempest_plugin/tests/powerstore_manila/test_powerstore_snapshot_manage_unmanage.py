@@ -39,10 +39,6 @@ identically to a snapshot created natively by Manila:
 NFS and CIFS are tested independently for full protocol coverage.
 """
 
-import configparser
-import time
-
-import requests
 from oslo_config import cfg
 from oslo_log import log as logging
 from tempest import clients
@@ -52,11 +48,19 @@ from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.common.utils import data_utils
 
+from dell_tempest_plugin.common import backend_config as dell_backends
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import inventory as dell_inventory
+from dell_tempest_plugin.common import manila_clients as dell_manila
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin.services import powerstore_client
+
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 SHARE_BUILD_TIMEOUT = 600
-SHARE_BUILD_INTERVAL = 5
+RESET_STATE_TIMEOUT = 30
 
 # Minimum share/snapshot size (GiB)
 PS_MIN_SIZE = 10
@@ -65,7 +69,7 @@ PS_MIN_SIZE = 10
 # ======================================================================
 # Base mixin — helpers only, no test methods
 # ======================================================================
-class PowerStoreSnapshotManageUnmanageBase(object):
+class PowerStoreSnapshotManageUnmanageBase(dell_inventory.LeakCheckMixin):
     """Mixin providing Manila + PowerStore REST helpers for snapshot tests."""
 
     # ------------------------------------------------------------------
@@ -81,55 +85,19 @@ class PowerStoreSnapshotManageUnmanageBase(object):
         cls.share_types_client = cls._get_manila_share_types_client(
             cls.admin_manager)
 
+    def setUp(self):
+        super(PowerStoreSnapshotManageUnmanageBase, self).setUp()
+        dell_budget.start_test_budget(self)
+
     @staticmethod
     def _get_manila_client(manager):
         """Resolve Manila shares client from the manager."""
-        for attr in ('shares_v2_client', 'shares_client',
-                     'share_v2_client', 'share_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        try:
-            from manila_tempest_tests.services.share.v2.json import (
-                shares_client as manila_shares_client)
-            service_type = getattr(CONF, 'share', None)
-            configured_type = getattr(service_type, 'catalog_type',
-                                      None) if service_type else None
-            region = (getattr(service_type, 'region', None)
-                      if service_type else None) or CONF.identity.region
-            endpoint_type = (getattr(service_type, 'endpoint_type', 'public')
-                             if service_type else 'public')
-            catalog_type = configured_type
-            if not catalog_type or catalog_type == 'share':
-                try:
-                    auth_data = manager.auth_provider.get_auth()
-                    catalog = auth_data[1].get('catalog', [])
-                    for entry in catalog:
-                        if entry.get('type') in (
-                                'shared-file-system', 'share'):
-                            catalog_type = entry['type']
-                            break
-                except Exception:
-                    pass
-            catalog_type = catalog_type or 'shared-file-system'
-            return manila_shares_client.SharesV2Client(
-                auth_provider=manager.auth_provider,
-                service=catalog_type,
-                region=region,
-                endpoint_type=endpoint_type,
-            )
-        except ImportError:
-            pass
-        return None
+        return dell_manila.shares_client(manager)
 
     @classmethod
     def _get_manila_share_types_client(cls, manager):
         """Resolve Manila share types client from the manager."""
-        for attr in ('share_types_v2_client', 'share_types_client'):
-            client = getattr(manager, attr, None)
-            if client is not None:
-                return client
-        return cls._get_manila_client(manager)
+        return dell_manila.share_types_client(manager)
 
     # ------------------------------------------------------------------
     # PowerStore REST API helpers
@@ -139,21 +107,14 @@ class PowerStoreSnapshotManageUnmanageBase(object):
         """Read PowerStore credentials from manila.conf."""
         if hasattr(cls, '_ps_config_loaded'):
             return
-        conf = configparser.ConfigParser()
-        conf.read('/etc/manila/manila.conf')
-        backend = None
-        for section in conf.sections():
-            if conf.has_option(section, 'dell_nas_backend_host'):
-                backend = section
-                break
-        if not backend:
+        backend = dell_backends.manila().find('powerstore')
+        if backend is None or not backend.nas_server:
             raise Exception(
                 "No PowerStore backend section found in manila.conf")
-        cls._ps_ip = conf.get(backend, 'dell_nas_backend_host')
-        cls._ps_user = conf.get(backend, 'dell_nas_login')
-        cls._ps_pass = conf.get(backend, 'dell_nas_password')
-        cls._ps_nas_server = conf.get(backend, 'dell_nas_server')
-        cls._ps_base_url = 'https://%s/api/rest' % cls._ps_ip
+        cls._ps_ip = backend.host
+        cls._ps_user = backend.user
+        cls._ps_pass = backend.password
+        cls._ps_nas_server = backend.nas_server
         cls._ps_config_loaded = True
         LOG.info("PowerStore config: ip=%s nas_server=%s",
                  cls._ps_ip, cls._ps_nas_server)
@@ -161,17 +122,10 @@ class PowerStoreSnapshotManageUnmanageBase(object):
     def _ps_request(self, method, path, payload=None, params=None):
         """Send a request to PowerStore REST API."""
         self._load_ps_config()
-        url = self._ps_base_url + path
-        kwargs = {
-            'auth': (self._ps_user, self._ps_pass),
-            'verify': False,
-            'timeout': 30,
-        }
-        if params:
-            kwargs['params'] = params
-        if payload and method != 'GET':
-            kwargs['json'] = payload
-        resp = requests.request(method, url, **kwargs)
+        client = powerstore_client.get_client(
+            self._ps_ip, self._ps_user, self._ps_pass)
+        resp = client.request(method, path, payload=payload or None,
+                              params=params or None)
         try:
             data = resp.json()
         except ValueError:
@@ -370,17 +324,14 @@ class PowerStoreSnapshotManageUnmanageBase(object):
         st = share_type.get('share_type', share_type)
         LOG.info("Created share type '%s' (id=%s) with specs=%s",
                  st['name'], st['id'], specs)
-        self.addCleanup(self._delete_share_type_safe, st['id'])
+        self._cleanup_share_type(st['id'])
         return st
 
-    def _delete_share_type_safe(self, share_type_id):
-        try:
-            self.share_types_client.delete_share_type(share_type_id)
-        except lib_exc.NotFound:
-            pass
-        except Exception as e:
-            LOG.warning("Failed to delete share type %s: %s",
-                        share_type_id, e)
+    def _cleanup_share_type(self, share_type_id):
+        """Register a share type with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_type', share_type_id,
+            self.share_types_client.delete_share_type)
 
     # ------------------------------------------------------------------
     # Manila share helpers
@@ -399,7 +350,7 @@ class PowerStoreSnapshotManageUnmanageBase(object):
         sh = share.get('share', share)
         LOG.info("Manage share request: id=%s export=%s", sh['id'],
                  export_path)
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         result = self.shares_v2_client.get_share(sh['id'])
         return result.get('share', result)
@@ -416,65 +367,74 @@ class PowerStoreSnapshotManageUnmanageBase(object):
         )
         sh = share.get('share', share)
         LOG.info("Create Manila share: id=%s name=%s", sh['id'], name)
-        self.addCleanup(self._delete_share_safe, sh['id'])
+        self._cleanup_share(sh['id'], sh.get('share_type'))
         self._wait_for_share_status(sh['id'], 'available')
         result = self.shares_v2_client.get_share(sh['id'])
         return result.get('share', result)
 
-    def _delete_share_safe(self, share_id):
-        try:
-            sh = self.shares_v2_client.get_share(share_id)
-            sh = sh.get('share', sh)
-            status = sh.get('status', '').lower()
-            if 'error' in status:
-                try:
-                    self.shares_v2_client.reset_state(
-                        share_id, status='available', s_type='shares')
-                    time.sleep(2)
-                except Exception:
-                    pass
-            self.shares_v2_client.delete_share(share_id)
-        except lib_exc.NotFound:
-            return
-        except Exception as e:
-            LOG.warning("Failed to delete share %s: %s", share_id, e)
-            return
-        self._wait_for_share_deletion(share_id)
+    def _cleanup_share(self, share_id, share_type_id=None,
+                       snapshot_id=None):
+        """Register a share with the test's cleanup executor.
+
+        Shares of one test are deleted together and their deletions
+        awaited in one batch before any share type is removed; a share
+        created from *snapshot_id* goes before that snapshot.
+        """
+        dell_cleanup.get_executor(self).add(
+            'share', share_id, self._delete_share,
+            waiter=self._share_deletion_waiter,
+            depends_on=[('share_type', share_type_id),
+                        ('share_snapshot', snapshot_id)])
+
+    def _share_deletion_waiter(self, share_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_share, share_id, kind='share',
+            response_key='share', error_states=('error_deleting',),
+            timeout=SHARE_BUILD_TIMEOUT)
+
+    def _delete_share(self, share_id):
+        """Delete a share, first resetting an errored one to available."""
+        sh = self.shares_v2_client.get_share(share_id)
+        sh = sh.get('share', sh)
+        status = sh.get('status', '').lower()
+        if 'error' in status:
+            try:
+                self.shares_v2_client.reset_state(
+                    share_id, status='available', s_type='shares')
+                dell_waiters.wait_for_status(
+                    self.shares_v2_client.get_share, share_id,
+                    'available', kind='share', response_key='share',
+                    error_states=(), timeout=RESET_STATE_TIMEOUT)
+            except Exception:
+                pass
+        self.shares_v2_client.delete_share(share_id)
 
     def _wait_for_share_status(self, share_id, target_status,
                                timeout=SHARE_BUILD_TIMEOUT,
-                               interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            share = self.shares_v2_client.get_share(share_id)
-            sh = share.get('share', share)
-            status = sh.get('status', '').lower()
-            last_status = status
-            if status == target_status:
-                return
-            if status in ('error', 'error_deleting',
-                          'manage_error', 'shrinking_error',
-                          'extending_error'):
-                self.fail(
-                    "Share %s entered error state: %s" % (share_id, status))
-            time.sleep(interval)
-        self.fail(
-            "Timeout waiting for share %s to reach '%s'; last='%s'"
-            % (share_id, target_status, last_status))
+                               interval=None):
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_share, share_id, target_status,
+                kind='share',
+                response_key='share',
+                error_states=('error', 'error_deleting',
+                              'manage_error', 'shrinking_error',
+                              'extending_error'),
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     def _wait_for_share_deletion(self, share_id,
                                  timeout=SHARE_BUILD_TIMEOUT,
-                                 interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_share(share_id)
-            except lib_exc.NotFound:
-                LOG.info("Share %s deletion confirmed", share_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for share %s deletion", share_id)
+                                 interval=None):
+        try:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_share, share_id, kind='share',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for share %s deletion", share_id)
+            return
+        LOG.info("Share %s deletion confirmed", share_id)
 
     def _get_export_locations(self, share_id):
         el = self.shares_v2_client.list_share_export_locations(share_id)
@@ -524,7 +484,7 @@ class PowerStoreSnapshotManageUnmanageBase(object):
         snap = snapshot.get('snapshot', snapshot)
         LOG.info("Manage snapshot request: id=%s provider_location=%s",
                  snap['id'], provider_location)
-        self.addCleanup(self._delete_snapshot_safe, snap['id'])
+        self._cleanup_snapshot(snap['id'], share_id)
         return snap
 
     def manage_snapshot_expect_error(self, share_id, provider_location,
@@ -545,71 +505,78 @@ class PowerStoreSnapshotManageUnmanageBase(object):
             return None
 
         snap = snapshot.get('snapshot', snapshot)
-        self.addCleanup(self._delete_snapshot_safe, snap['id'])
-        deadline = time.time() + SHARE_BUILD_TIMEOUT
-        while time.time() < deadline:
-            s = self.shares_v2_client.get_snapshot(snap['id'])
-            s = s.get('snapshot', s)
-            status = s.get('status', '').lower()
-            if status in ('error', 'manage_error'):
-                LOG.info("Manage snapshot correctly failed: status=%s",
-                         status)
-                return s
-            if status == 'available':
-                return s
-            time.sleep(SHARE_BUILD_INTERVAL)
-        result = self.shares_v2_client.get_snapshot(snap['id'])
-        return result.get('snapshot', result)
+        self._cleanup_snapshot(snap['id'], share_id)
+        try:
+            s = dell_waiters.wait_for_status(
+                self.shares_v2_client.get_snapshot, snap['id'],
+                ('error', 'manage_error', 'available'),
+                kind='share_snapshot', response_key='snapshot',
+                error_states=(), timeout=SHARE_BUILD_TIMEOUT)
+        except dell_waiters.WaitTimeout:
+            result = self.shares_v2_client.get_snapshot(snap['id'])
+            return result.get('snapshot', result)
+        if s['status'].lower() != 'available':
+            LOG.info("Manage snapshot correctly failed: status=%s",
+                     s['status'])
+        return s
 
     def _wait_for_snapshot_status(self, snapshot_id, target,
                                   timeout=SHARE_BUILD_TIMEOUT,
-                                  interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        last_status = None
-        while time.time() < deadline:
-            snap = self.shares_v2_client.get_snapshot(snapshot_id)
-            snap = snap.get('snapshot', snap)
-            status = snap.get('status', '').lower()
-            last_status = status
-            if status == target:
-                return
-            if 'error' in status and target != 'manage_error':
-                self.fail("Snapshot %s error: %s" % (snapshot_id, status))
-            time.sleep(interval)
-        self.fail("Timeout waiting for snapshot %s status '%s'; last='%s'"
-                  % (snapshot_id, target, last_status))
+                                  interval=None):
+        error_states = (() if target == 'manage_error'
+                        else dell_waiters.ANY_ERROR)
+        try:
+            dell_waiters.wait_for_status(
+                self.shares_v2_client.get_snapshot, snapshot_id, target,
+                kind='share_snapshot', response_key='snapshot',
+                error_states=error_states,
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitError as e:
+            self.fail(str(e))
 
     def _wait_for_snapshot_deletion(self, snapshot_id,
                                     timeout=SHARE_BUILD_TIMEOUT,
-                                    interval=SHARE_BUILD_INTERVAL):
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                self.shares_v2_client.get_snapshot(snapshot_id)
-            except lib_exc.NotFound:
-                LOG.info("Snapshot %s deletion confirmed", snapshot_id)
-                return
-            time.sleep(interval)
-        LOG.warning("Timeout waiting for snapshot %s deletion", snapshot_id)
-
-    def _delete_snapshot_safe(self, snapshot_id):
+                                    interval=None):
         try:
-            snap = self.shares_v2_client.get_snapshot(snapshot_id)
-            snap = snap.get('snapshot', snap)
-            status = snap.get('status', '').lower()
-            if 'error' in status:
-                try:
-                    self.shares_v2_client.snapshot_reset_state(
-                        snapshot_id, status='available')
-                    time.sleep(2)
-                except Exception:
-                    pass
-            self.shares_v2_client.delete_snapshot(snapshot_id)
-        except lib_exc.NotFound:
+            dell_waiters.wait_for_deletion(
+                self.shares_v2_client.get_snapshot, snapshot_id,
+                kind='share_snapshot',
+                timeout=timeout, max_interval=interval)
+        except dell_waiters.WaitTimeout:
+            LOG.warning("Timeout waiting for snapshot %s deletion", snapshot_id)
             return
-        except Exception:
-            pass
-        self._wait_for_snapshot_deletion(snapshot_id)
+        LOG.info("Snapshot %s deletion confirmed", snapshot_id)
+
+    def _cleanup_snapshot(self, snapshot_id, share_id=None):
+        """Register a snapshot with the test's cleanup executor."""
+        dell_cleanup.get_executor(self).add(
+            'share_snapshot', snapshot_id, self._delete_snapshot,
+            waiter=self._snapshot_deletion_waiter,
+            depends_on=[('share', share_id)])
+
+    def _snapshot_deletion_waiter(self, snapshot_id):
+        return dell_waiters.deletion_waiter(
+            self.shares_v2_client.get_snapshot, snapshot_id,
+            kind='share_snapshot', response_key='snapshot',
+            error_states=('error_deleting',), timeout=SHARE_BUILD_TIMEOUT)
+
+    def _delete_snapshot(self, snapshot_id):
+        """Delete a snapshot, first resetting an errored one to available."""
+        snap = self.shares_v2_client.get_snapshot(snapshot_id)
+        snap = snap.get('snapshot', snap)
+        status = snap.get('status', '').lower()
+        if 'error' in status:
+            try:
+                self.shares_v2_client.snapshot_reset_state(
+                    snapshot_id, status='available')
+                dell_waiters.wait_for_status(
+                    self.shares_v2_client.get_snapshot, snapshot_id,
+                    'available', kind='share_snapshot',
+                    response_key='snapshot', error_states=(),
+                    timeout=RESET_STATE_TIMEOUT)
+            except Exception:
+                pass
+        self.shares_v2_client.delete_snapshot(snapshot_id)
 
     # ------------------------------------------------------------------
     # Backend name resolution
@@ -850,7 +817,8 @@ class _SnapshotManageUnmanageTests(object):
             share_type_id=share_type['id'],
         )
         ns = new_share.get('share', new_share)
-        self.addCleanup(self._delete_share_safe, ns['id'])
+        self._cleanup_share(ns['id'], share_type['id'],
+                            snapshot_id=managed['id'])
         self._wait_for_share_status(ns['id'], 'available')
 
         new_detail = self.shares_v2_client.get_share(ns['id'])
@@ -948,7 +916,7 @@ class _SnapshotManageUnmanageTests(object):
         snapshot = self.shares_v2_client.create_snapshot(
             share_id=share['id'], name=snap_name)
         snap = snapshot.get('snapshot', snapshot)
-        self.addCleanup(self._delete_snapshot_safe, snap['id'])
+        self._cleanup_snapshot(snap['id'], share['id'])
         self._wait_for_snapshot_status(snap['id'], 'available')
 
         # CRITICAL: Verify provider_location is set after create_snapshot
@@ -0,0 +1,86 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+import threading
+
+import testtools
+
+from dell_tempest_plugin.common import backend_fixtures as dell_fixtures
+
+
+class _FakeArray(object):
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.built = []
+        self.destroyed = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def build(self):
+        if self.fail:
+            raise ValueError("array is full")
+        with self._lock:
+            fixture = 'fs-%d' % next(self._ids)
+            self.built.append(fixture)
+        return fixture
+
+    def destroy(self, fixture):
+        with self._lock:
+            self.destroyed.append(fixture)
+
+
+class FixtureBuilderTest(testtools.TestCase):
+
+    def _builder(self, array):
+        return dell_fixtures.FixtureBuilder(array.build, array.destroy,
+                                            prefetch=1)
+
+    def test_single_request_builds_nothing(self):
+        array = _FakeArray()
+        builder = self._builder(array)
+        self.assertIsNone(builder.take())
+        builder.teardown()
+        self.assertEqual([], array.built)
+
+    def test_builds_ahead_from_the_second_request(self):
+        array = _FakeArray()
+        builder = self._builder(array)
+        taken = [builder.take() for _ in range(5)]
+        builder.teardown()
+        self.assertEqual([None, None], taken[:2])
+        self.assertEqual(['fs-1', 'fs-2', 'fs-3'], taken[2:])
+        # At most the one fixture building for a sixth request is spare;
+        # teardown cancels it if it has not started yet.
+        self.assertIn(len(array.built), (3, 4))
+        self.assertEqual(sorted(array.built), sorted(array.destroyed))
+
+    def test_failed_build_falls_back_to_the_caller(self):
+        array = _FakeArray(fail=True)
+        builder = self._builder(array)
+        taken = [builder.take() for _ in range(3)]
+        builder.teardown()
+        self.assertEqual([None, None, None], taken)
+        self.assertEqual([], array.destroyed)
+
+    def test_no_fixture_after_teardown(self):
+        array = _FakeArray()
+        builder = self._builder(array)
+        builder.take()
+        builder.take()
+        builder.teardown()
+        self.assertIsNone(builder.take())
+        self.assertEqual(array.built, array.destroyed)
@@ -0,0 +1,99 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import testtools
+
+from dell_tempest_plugin.common import budget as dell_budget
+from dell_tempest_plugin.common import singleflight as dell_singleflight
+from dell_tempest_plugin.common import waiters as dell_waiters
+from dell_tempest_plugin import config
+
+# The suites' own per-wait timeout.
+VOLUME_BUILD_TIMEOUT = 600
+
+
+class _Clock(object):
+    """Simulated wall clock that ``sleep`` advances instantly."""
+
+    def __init__(self):
+        self.now = 1000000.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class _StuckVolumes(object):
+    """Volumes client whose volume never leaves ``creating``."""
+
+    def show_volume(self, volume_id):
+        return {'volume': {'id': volume_id, 'status': 'creating'}}
+
+
+class TestBudgetTest(testtools.TestCase):
+
+    def setUp(self):
+        super(TestBudgetTest, self).setUp()
+        self.clock = _Clock()
+        for patcher in (
+                mock.patch('time.time', self.clock.time),
+                mock.patch('time.sleep', self.clock.sleep),
+                mock.patch.object(dell_singleflight, '_group',
+                                  dell_singleflight.SingleFlight(0))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(config.CONF.clear_override, 'test_budget',
+                        group='dell_driver')
+
+    def test_default_is_a_multiple_of_build_timeout(self):
+        with mock.patch.object(dell_budget, '_build_timeout',
+                               return_value=500):
+            self.assertEqual(1500, dell_budget.get_test_budget())
+        self.assertEqual(
+            dell_budget.BUILD_TIMEOUT_FACTOR *
+            dell_budget.DEFAULT_BUILD_TIMEOUT,
+            dell_budget.get_test_budget())
+
+    def test_configured_budget_wins(self):
+        config.CONF.set_override('test_budget', 120, group='dell_driver')
+        self.assertEqual(120, dell_budget.get_test_budget())
+
+    def test_default_cuts_off_a_chain_of_waits(self):
+        budget = dell_budget.start_test_budget(self)
+        vols = _StuckVolumes()
+        start = self.clock.now
+        errors = []
+        for n in range(4):
+            try:
+                dell_waiters.wait_for_status(
+                    vols.show_volume, 'vol-%d' % n, 'available',
+                    kind='volume', response_key='volume',
+                    timeout=VOLUME_BUILD_TIMEOUT)
+            except dell_waiters.WaitTimeout as e:
+                errors.append(e)
+        elapsed = self.clock.now - start
+        # The first wait uses its full timeout, the second only what is
+        # left, and the rest fail without polling.
+        self.assertEqual(4, len(errors))
+        self.assertNotIsInstance(errors[0], dell_waiters.BudgetExhausted)
+        for error in errors[1:]:
+            self.assertIsInstance(error, dell_waiters.BudgetExhausted)
+        self.assertLessEqual(elapsed, dell_budget.get_test_budget())
+        self.assertLess(elapsed, 4 * VOLUME_BUILD_TIMEOUT)
+        self.assertTrue(budget.exhausted)
@@ -0,0 +1,97 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import testtools
+
+from dell_tempest_plugin.common import cleanup as dell_cleanup
+from dell_tempest_plugin.common import inventory as dell_inventory
+from dell_tempest_plugin.common import type_registry as dell_types
+from dell_tempest_plugin.common import warm_pool as dell_pools
+
+
+class _Base(object):
+
+    @classmethod
+    def resource_setup(cls):
+        pass
+
+    @classmethod
+    def resource_cleanup(cls):
+        pass
+
+
+class _Checked(dell_inventory.LeakCheckMixin, _Base):
+    pass
+
+
+class _FakeInventory(object):
+    """Array on which a new volume appears between the two inventories."""
+
+    def __init__(self):
+        self.taken = 0
+
+    def take(self):
+        self.taken += 1
+        ids = set(['vol-1'])
+        if self.taken > 1:
+            ids.add('vol-2')
+        return dell_inventory.Inventory(
+            {'volume': frozenset(ids)},
+            {'vol-1': 'volume-1', 'vol-2': 'volume-2'})
+
+
+class LeakCheckMixinTest(testtools.TestCase):
+
+    def setUp(self):
+        super(LeakCheckMixinTest, self).setUp()
+        self.array = _FakeInventory()
+        self.pool_size = 0
+        self.keep_warm = False
+        for patcher in (
+                mock.patch.object(dell_inventory, 'is_enabled',
+                                  return_value=True),
+                mock.patch.object(dell_cleanup, 'is_deferred',
+                                  return_value=False),
+                mock.patch.object(dell_pools, 'get_size',
+                                  side_effect=lambda: self.pool_size),
+                mock.patch.object(dell_types, 'is_keep_warm',
+                                  side_effect=lambda: self.keep_warm),
+                mock.patch.object(dell_inventory.PowerStoreInventory,
+                                  'from_config', return_value=self.array)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run_class(self):
+        with mock.patch.object(dell_inventory.LOG, 'warning') as warning:
+            _Checked.resource_setup()
+            _Checked.resource_cleanup()
+        return [call for call in warning.call_args_list
+                if 'behind' in call[0][0]]
+
+    def test_new_object_is_reported(self):
+        self.assertEqual(1, len(self._run_class()))
+        self.assertEqual(2, self.array.taken)
+
+    def test_skipped_with_warm_pools(self):
+        self.pool_size = 2
+        self.assertEqual([], self._run_class())
+        self.assertEqual(0, self.array.taken)
+
+    def test_skipped_with_keep_warm(self):
+        self.keep_warm = True
+        self.assertEqual([], self._run_class())
+        self.assertEqual(0, self.array.taken)
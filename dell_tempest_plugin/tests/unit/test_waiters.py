@@ -0,0 +1,96 @@
+# Copyright 2026 Dell Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+from unittest import mock
+
+import testtools
+
+from dell_tempest_plugin.common import singleflight as dell_singleflight
+from dell_tempest_plugin.common import waiters as dell_waiters
+
+
+class _FakeVolumes(object):
+    """Volumes client whose every show returns a new, numbered body."""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def show_volume(self, volume_id):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            return {'volume': {'id': volume_id, 'status': 'creating',
+                               'seq': self.calls}}
+
+
+class SingleFlightWaiterTest(testtools.TestCase):
+
+    def setUp(self):
+        super(SingleFlightWaiterTest, self).setUp()
+        profile = dell_waiters.WaitProfile(
+            timeout=30, initial_interval=0.01, max_interval=0.01, jitter=0)
+        # The window outlasts every wait, so only the freshness cutoff
+        # keeps a waiter from being handed its own response.
+        group = dell_singleflight.SingleFlight(window=30)
+        for patcher in (mock.patch.dict(dell_waiters.PROFILES,
+                                        {'volume': profile}),
+                        mock.patch.object(dell_singleflight, '_group',
+                                          group)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _wait(self, vols, polls):
+        seen = []
+
+        def is_done(volume):
+            seen.append(volume)
+            return len(seen) == polls
+
+        dell_waiters.StatusWaiter(
+            vols.show_volume, 'vol-1', 'volume', is_done=is_done,
+            response_key='volume').wait()
+        return seen
+
+    def _assert_all_new(self, seen):
+        for previous, current in zip(seen, seen[1:]):
+            self.assertIsNot(previous, current)
+            self.assertGreater(current['seq'], previous['seq'])
+
+    def test_consecutive_polls_never_repeat_a_response(self):
+        vols = _FakeVolumes()
+        seen = self._wait(vols, 5)
+        self._assert_all_new(seen)
+        self.assertEqual(5, vols.calls)
+
+    def test_concurrent_waiters_never_repeat_a_response(self):
+        vols = _FakeVolumes(delay=0.005)
+        results = [None] * 4
+
+        def run(index):
+            results[index] = self._wait(vols, 6)
+
+        threads = [threading.Thread(target=run, args=(i,))
+                   for i in range(len(results))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for seen in results:
+            self.assertEqual(6, len(seen))
+            self._assert_all_new(seen)
@@ -10,6 +10,11 @@ setup(
     entry_points={
         'tempest.test_plugins': [
             'dell-tempest-plugin = dell_tempest_plugin.plugin:DellTempestPlugin'
+        ],
+        'console_scripts': [
+            'dell-tempest-deferred-report = '
+            'dell_tempest_plugin.cmd.deferred_report:main',
+            'dell-tempest-reaper = dell_tempest_plugin.cmd.reaper:main'
         ]
     }
 )